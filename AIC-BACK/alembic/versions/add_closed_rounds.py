@@ -0,0 +1,92 @@
+"""add closed rounds and round snapshots
+
+Revision ID: add_closed_rounds
+Revises: add_final_results
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_closed_rounds'
+down_revision = 'add_final_results'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'closed_rounds',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.Float(), nullable=True),
+        sa.Column('round', sa.String(), nullable=False),
+        sa.Column('team_count', sa.Integer(), nullable=True),
+        sa.Column('member_count', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_closed_rounds_round'), 'closed_rounds', ['round'], unique=True)
+    op.create_table(
+        'round_team_snapshots',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.Float(), nullable=True),
+        sa.Column('round', sa.String(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=True),
+        sa.Column('avg_creativity', sa.Numeric(), nullable=True),
+        sa.Column('avg_feasibility', sa.Numeric(), nullable=True),
+        sa.Column('avg_ai_effectiveness', sa.Numeric(), nullable=True),
+        sa.Column('avg_presentation', sa.Numeric(), nullable=True),
+        sa.Column('avg_social_impact', sa.Numeric(), nullable=True),
+        sa.Column('avg_total_score', sa.Numeric(), nullable=True),
+        sa.Column('judge_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['round'], ['closed_rounds.round'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('round', 'team_id', name='uq_round_team_snapshots_round_team'),
+    )
+    op.create_index(
+        'ix_round_team_snapshots_round_rank', 'round_team_snapshots', ['round', 'rank'], unique=False
+    )
+    op.create_table(
+        'round_member_snapshots',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.Float(), nullable=True),
+        sa.Column('round', sa.String(), nullable=False),
+        sa.Column('team_member_id', sa.Integer(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('student_batch', sa.String(), nullable=True),
+        sa.Column('class_code', sa.String(), nullable=True),
+        sa.Column('rank', sa.Integer(), nullable=True),
+        sa.Column('dense_rank', sa.Integer(), nullable=True),
+        sa.Column('batch_rank', sa.Integer(), nullable=True),
+        sa.Column('class_rank', sa.Integer(), nullable=True),
+        sa.Column('avg_skills_learning', sa.Numeric(), nullable=True),
+        sa.Column('avg_inspiration', sa.Numeric(), nullable=True),
+        sa.Column('avg_total_score', sa.Numeric(), nullable=True),
+        sa.Column('judge_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['round'], ['closed_rounds.round'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['team_member_id'], ['team_members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('round', 'team_member_id', name='uq_round_member_snapshots_round_member'),
+    )
+    op.create_index(
+        'ix_round_member_snapshots_round_rank',
+        'round_member_snapshots',
+        ['round', 'rank', 'team_member_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_round_member_snapshots_round_rank', table_name='round_member_snapshots')
+    op.drop_table('round_member_snapshots')
+    op.drop_index('ix_round_team_snapshots_round_rank', table_name='round_team_snapshots')
+    op.drop_table('round_team_snapshots')
+    op.drop_index(op.f('ix_closed_rounds_round'), table_name='closed_rounds')
+    op.drop_table('closed_rounds')
@@ -0,0 +1,60 @@
+"""add final results
+
+Revision ID: add_final_results
+Revises: add_unique_constraints
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_final_results'
+down_revision = 'add_unique_constraints'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'final_result_versions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.Float(), nullable=True),
+        sa.Column('round_weights', postgresql.JSONB(), nullable=False),
+        sa.Column('member_weight', sa.Numeric(5, 4), nullable=False),
+        sa.Column('team_count', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'final_results',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.Float(), nullable=True),
+        sa.Column('version_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('team_name', sa.String(), nullable=True),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('final_score', sa.Numeric(8, 4), nullable=False),
+        sa.Column('team_score', sa.Numeric(8, 4), nullable=False),
+        sa.Column('member_score', sa.Numeric(8, 4), nullable=False),
+        sa.Column('round_scores', postgresql.JSONB(), nullable=False),
+        sa.ForeignKeyConstraint(['version_id'], ['final_result_versions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('version_id', 'team_id', name='uq_final_results_version_team'),
+    )
+    op.create_index(
+        'ix_final_results_version_rank',
+        'final_results',
+        ['version_id', 'rank'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_final_results_version_rank', table_name='final_results')
+    op.drop_table('final_results')
+    op.drop_table('final_result_versions')
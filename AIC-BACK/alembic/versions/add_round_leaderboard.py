@@ -0,0 +1,58 @@
+"""add round leaderboard
+
+Revision ID: add_round_leaderboard
+Revises: update_submitted_at
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_round_leaderboard'
+down_revision = 'update_submitted_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'round_leaderboard',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.Float(), nullable=True),
+        sa.Column('round', sa.String(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Numeric(12, 2), nullable=False),
+        sa.Column('score_count', sa.Integer(), nullable=False),
+        sa.Column('avg_score', sa.Numeric(), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('round', 'team_id', name='uq_round_leaderboard_round_team'),
+    )
+    op.create_index(
+        'ix_round_leaderboard_round_avg_score',
+        'round_leaderboard',
+        ['round', 'avg_score'],
+        unique=False,
+    )
+
+    # Backfill from the scores already recorded
+    conn = op.get_bind()
+    conn.execute(text("""
+        INSERT INTO round_leaderboard
+            (created_at, updated_at, round, team_id, score_sum, score_count, avg_score)
+        SELECT
+            extract(epoch FROM now()), extract(epoch FROM now()),
+            round, team_id, sum(total_score), count(total_score), avg(total_score)
+        FROM team_scores
+        WHERE round IS NOT NULL AND team_id IS NOT NULL AND total_score IS NOT NULL
+        GROUP BY round, team_id
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_round_leaderboard_round_avg_score', table_name='round_leaderboard')
+    op.drop_table('round_leaderboard')
@@ -0,0 +1,71 @@
+"""add schedule duration, time range and exclusion constraint
+
+Revision ID: add_schedule_time_range
+Revises: add_closed_rounds
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_schedule_time_range'
+down_revision = 'add_closed_rounds'
+branch_labels = None
+depends_on = None
+
+
+def _check_overlaps(conn) -> None:
+    """Fail with the overlapping schedules rather than a bare exclusion violation"""
+    rows = conn.execute(text(
+        'SELECT a.location, a.id, b.id FROM schedules a JOIN schedules b '
+        'ON a.location = b.location AND a.id < b.id AND a.time_range && b.time_range '
+        'ORDER BY a.location, a.id, b.id LIMIT 10'
+    )).all()
+    if rows:
+        raise RuntimeError(
+            'Move overlapping schedules before adding the exclusion constraint:\n'
+            + '\n'.join(f'{location}: schedules {a} and {b}' for location, a, b in rows)
+        )
+
+
+def upgrade() -> None:
+    # "=" on location inside a GiST index needs the btree_gist operator classes
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    # Existing schedules keep the 30 minute slot they were checked against
+    op.add_column(
+        'schedules',
+        sa.Column('duration', sa.Integer(), server_default='1800', nullable=False),
+    )
+    op.add_column(
+        'schedules',
+        sa.Column(
+            'time_range',
+            postgresql.TSTZRANGE(),
+            sa.Computed(
+                'CASE WHEN date_time IS NOT NULL '
+                'THEN tstzrange(to_timestamp(date_time), to_timestamp(date_time + duration)) END',
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    _check_overlaps(op.get_bind())
+    op.create_exclude_constraint(
+        'ex_schedules_location_time_range',
+        'schedules',
+        ('location', '='),
+        ('time_range', '&&'),
+        using='gist',
+        deferrable=True,
+        initially='IMMEDIATE',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ex_schedules_location_time_range', 'schedules')
+    op.drop_column('schedules', 'time_range')
+    op.drop_column('schedules', 'duration')
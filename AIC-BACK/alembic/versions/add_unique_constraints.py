@@ -0,0 +1,92 @@
+"""add unique constraints
+
+Revision ID: add_unique_constraints
+Revises: add_round_leaderboard
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_unique_constraints'
+down_revision = 'add_round_leaderboard'
+branch_labels = None
+depends_on = None
+
+
+# (table, columns, condition) that must not have duplicates before upgrading
+_UNIQUE_KEYS = (
+    ('team_scores', ('team_id', 'judge_id', 'round'), None),
+    ('member_scores', ('team_member_id', 'judge_id', 'round'), None),
+    ('judge_assignments', ('team_id', 'judge_id', 'round'), None),
+    ('team_members', ('student_code',), None),
+    ('team_members', ('email',), None),
+    ('team_members', ('team_id',), 'is_leader'),
+    ('judges', ('email',), None),
+)
+
+
+def _check_duplicates(conn) -> None:
+    """Fail with the offending keys rather than a bare unique violation"""
+    problems = []
+    for table, columns, condition in _UNIQUE_KEYS:
+        key = ', '.join(columns)
+        where = ' AND '.join([f'{column} IS NOT NULL' for column in columns] + ([condition] if condition else []))
+        rows = conn.execute(text(
+            f'SELECT {key}, count(*) FROM {table} WHERE {where} '
+            f'GROUP BY {key} HAVING count(*) > 1 LIMIT 5'
+        )).all()
+        for row in rows:
+            problems.append(f'{table}({key}) = {tuple(row[:-1])} x{row[-1]}')
+    if problems:
+        raise RuntimeError(
+            'Remove duplicate rows before adding unique constraints:\n' + '\n'.join(problems)
+        )
+
+
+def upgrade() -> None:
+    _check_duplicates(op.get_bind())
+
+    op.create_unique_constraint(
+        'uq_team_scores_team_judge_round', 'team_scores', ['team_id', 'judge_id', 'round']
+    )
+    op.create_unique_constraint(
+        'uq_member_scores_member_judge_round', 'member_scores', ['team_member_id', 'judge_id', 'round']
+    )
+    op.create_unique_constraint(
+        'uq_judge_assignments_team_judge_round', 'judge_assignments', ['team_id', 'judge_id', 'round']
+    )
+
+    # Turn the plain lookup indexes into unique ones
+    op.drop_index(op.f('ix_team_members_student_code'), table_name='team_members')
+    op.create_index(op.f('ix_team_members_student_code'), 'team_members', ['student_code'], unique=True)
+    op.drop_index(op.f('ix_team_members_email'), table_name='team_members')
+    op.create_index(op.f('ix_team_members_email'), 'team_members', ['email'], unique=True)
+    op.drop_index(op.f('ix_judges_email'), table_name='judges')
+    op.create_index(op.f('ix_judges_email'), 'judges', ['email'], unique=True)
+
+    op.create_index(
+        'ux_team_members_team_leader',
+        'team_members',
+        ['team_id'],
+        unique=True,
+        postgresql_where=sa.text('is_leader'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_team_members_team_leader', table_name='team_members')
+
+    op.drop_index(op.f('ix_judges_email'), table_name='judges')
+    op.create_index(op.f('ix_judges_email'), 'judges', ['email'], unique=False)
+    op.drop_index(op.f('ix_team_members_email'), table_name='team_members')
+    op.create_index(op.f('ix_team_members_email'), 'team_members', ['email'], unique=False)
+    op.drop_index(op.f('ix_team_members_student_code'), table_name='team_members')
+    op.create_index(op.f('ix_team_members_student_code'), 'team_members', ['student_code'], unique=False)
+
+    op.drop_constraint('uq_judge_assignments_team_judge_round', 'judge_assignments', type_='unique')
+    op.drop_constraint('uq_member_scores_member_judge_round', 'member_scores', type_='unique')
+    op.drop_constraint('uq_team_scores_team_judge_round', 'team_scores', type_='unique')
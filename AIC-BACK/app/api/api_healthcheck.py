@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
-from app.schemas.sche_response import BaseResponse
+from app.schemas.sche_response import BaseResponse, DataResponse
+from app.services.srv_base import entity_cache, result_cache
 
 router = APIRouter(prefix=f"/health-check")
 
@@ -8,3 +9,8 @@ router = APIRouter(prefix=f"/health-check")
 @router.get("", response_model=BaseResponse)
 async def get():
     return BaseResponse(http_code=200, message="OK")
+
+
+@router.get("/cache", response_model=DataResponse[dict])
+async def get_cache_stats():
+    return DataResponse(http_code=200, data={"entity": entity_cache.stats(), "result": result_cache.stats()})
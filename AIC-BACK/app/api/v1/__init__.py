@@ -11,6 +11,8 @@ from app.api.v1 import (
     api_member_scores,
     api_judge_assignments,
     api_schedules,
+    api_final_results,
+    api_closed_rounds,
 )
 
 router = APIRouter()
@@ -24,3 +26,5 @@ router.include_router(api_team_scores.router, tags=["team scores"])
 router.include_router(api_member_scores.router, tags=["member scores"])
 router.include_router(api_judge_assignments.router, tags=["judge assignments"])
 router.include_router(api_schedules.router, tags=["schedules"])
+router.include_router(api_final_results.router, tags=["final results"])
+router.include_router(api_closed_rounds.router, tags=["closed rounds"])
@@ -0,0 +1,69 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, status
+from app.utils.exception_handler import CustomException
+from app.schemas.sche_response import DataResponse
+from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_closed_rounds import ClosedRounds
+from app.services.srv_closed_rounds import ClosedRoundsService
+
+router = APIRouter(prefix="/closed-rounds")
+
+closed_rounds_service: ClosedRoundsService = ClosedRoundsService()
+
+
+@router.get(
+    "",
+    response_model=DataResponse[List[ClosedRounds]],
+    status_code=status.HTTP_200_OK,
+)
+def get_closed_rounds(
+    sort_params: SortParams = Depends(),
+    pagination_params: PaginationParams = Depends(),
+) -> Any:
+    try:
+        data, metadata = closed_rounds_service.get_closed_rounds(
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/{round}",
+    response_model=DataResponse[ClosedRounds],
+    status_code=status.HTTP_200_OK,
+)
+def get_closed_round(round: str) -> Any:
+    try:
+        closed_round = closed_rounds_service.get_closed_round(round)
+        return DataResponse(http_code=status.HTTP_200_OK, data=closed_round)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.post(
+    "/{round}",
+    response_model=DataResponse[ClosedRounds],
+    status_code=status.HTTP_201_CREATED,
+)
+def close_round(round: str) -> Any:
+    """Admin action: snapshot the round's rankings and reject further score writes"""
+    try:
+        closed_round = closed_rounds_service.close_round(round)
+        return DataResponse(http_code=status.HTTP_201_CREATED, data=closed_round)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.delete(
+    "/{round}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+def reopen_round(round: str) -> None:
+    """Admin action: drop the round's snapshots and accept score writes again"""
+    try:
+        closed_rounds_service.reopen_round(round)
+    except Exception as e:
+        raise CustomException(exception=e)
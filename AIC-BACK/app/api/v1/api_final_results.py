@@ -0,0 +1,62 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, status, Query
+from app.utils.exception_handler import CustomException
+from app.schemas.sche_response import DataResponse
+from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_final_results import FinalResults, FinalResultVersions, FinalResultsConfig
+from app.services.srv_final_results import FinalResultsService
+
+router = APIRouter(prefix="/final-results")
+
+final_results_service: FinalResultsService = FinalResultsService()
+
+
+@router.get(
+    "",
+    response_model=DataResponse[List[FinalResults]],
+    status_code=status.HTTP_200_OK,
+)
+def get_final_results(
+    version_id: Optional[int] = Query(None, description="Snapshot version, the latest by default"),
+    pagination_params: PaginationParams = Depends(),
+) -> Any:
+    try:
+        data, metadata = final_results_service.get_final_results(
+            version_id=version_id,
+            pagination_params=pagination_params,
+        )
+        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/versions",
+    response_model=DataResponse[List[FinalResultVersions]],
+    status_code=status.HTTP_200_OK,
+)
+def get_final_result_versions(
+    sort_params: SortParams = Depends(),
+    pagination_params: PaginationParams = Depends(),
+) -> Any:
+    try:
+        data, metadata = final_results_service.get_versions(
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.post(
+    "",
+    response_model=DataResponse[FinalResultVersions],
+    status_code=status.HTTP_201_CREATED,
+)
+def compute_final_results(config: FinalResultsConfig) -> Any:
+    try:
+        version = final_results_service.compute_final_results(obj_in=config)
+        return DataResponse(http_code=status.HTTP_201_CREATED, data=version)
+    except Exception as e:
+        raise CustomException(exception=e)
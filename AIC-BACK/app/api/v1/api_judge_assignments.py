@@ -2,11 +2,12 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, status, Query
 from app.utils.exception_handler import CustomException
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_judge_assignments import (
     JudgeAssignments,
     JudgeAssignmentsCreate,
     JudgeAssignmentsUpdate,
+    JudgeAssignmentsBulkRequest,
 )
 from app.services.srv_judge_assignments import JudgeAssignmentsService
 
@@ -87,14 +88,32 @@ def get_round_assignments(
     response_model=DataResponse[JudgeAssignments],
     status_code=status.HTTP_201_CREATED,
 )
-def create_assignment(assignment_data: JudgeAssignmentsCreate) -> Any:
+def create_assignment(
+    assignment_data: JudgeAssignmentsCreate,
+    upsert: bool = Query(False, description="Return the existing assignment instead of failing"),
+) -> Any:
     try:
-        new_assignment = judge_assignments_service.create_assignment(obj_in=assignment_data)
+        new_assignment = judge_assignments_service.create_assignment(obj_in=assignment_data, upsert=upsert)
         return DataResponse(http_code=status.HTTP_201_CREATED, data=new_assignment)
     except Exception as e:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/bulk",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def bulk_assignments(
+    bulk_data: JudgeAssignmentsBulkRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = judge_assignments_service.bulk_assignments(obj_in=bulk_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
 @router.get(
     "/{assignment_id}",
     response_model=DataResponse[JudgeAssignments],
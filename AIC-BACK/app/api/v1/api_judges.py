@@ -1,12 +1,17 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from app.utils.exception_handler import CustomException
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.utils.export import export_response, ExportFormat
+from app.utils.fields import parse_fields, parse_include, expand, sparse
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_judges import (
     Judges,
+    JudgesWithRelations,
     JudgesCreate,
     JudgesUpdate,
+    JudgesBulkRequest,
 )
 from app.services.srv_judges import JudgesService
 
@@ -17,7 +22,7 @@ judges_service: JudgesService = JudgesService()
 
 @router.get(
     "",
-    response_model=DataResponse[List[Judges]],
+    response_model=DataResponse[List[sparse(JudgesWithRelations)]],
     status_code=status.HTTP_200_OK,
 )
 def search_judges(
@@ -25,15 +30,25 @@ def search_judges(
     role: Optional[str] = Query(None, description="Filter by role (admin or judge)"),
     sort_params: SortParams = Depends(),
     pagination_params: PaginationParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,full_name"),
+    include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. team_scores,judge_assignments"),
 ) -> Any:
     try:
+        fields = parse_fields(Judges, fields)
+        include = parse_include(JudgesWithRelations, include)
         data, metadata = judges_service.search_judges(
             search_term=search_term,
             role=role,
             pagination_params=pagination_params, 
-            sort_params=sort_params
+            sort_params=sort_params,
+            fields=fields,
+            include=include,
+        )
+        return DataResponse(
+            http_code=status.HTTP_200_OK,
+            data=expand(data, JudgesWithRelations, include, fields),
+            metadata=metadata,
         )
-        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
     except Exception as e:
         raise CustomException(exception=e)
 
@@ -77,6 +92,44 @@ def create_judge(judge_data: JudgesCreate) -> Any:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/bulk",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def bulk_judges(
+    bulk_data: JudgesBulkRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = judges_service.bulk_judges(obj_in=bulk_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_judges(
+    search_term: Optional[str] = Query(None, description="Search term for name, email, phone, username"),
+    role: Optional[str] = Query(None, description="Filter by role (admin or judge)"),
+    export_format: ExportFormat = Query("csv", alias="format", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, all by default"),
+) -> Any:
+    try:
+        fields = parse_fields(Judges, fields) or list(Judges.model_fields)
+        statement = judges_service.export_judges(
+            search_term=search_term,
+            role=role,
+            fields=fields,
+        )
+        return export_response(statement, export_format, "judges")
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{judge_id}",
     response_model=DataResponse[Judges],
@@ -1,18 +1,25 @@
 from typing import Any, List, Optional, Dict
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request
+from fastapi.responses import StreamingResponse
 from app.utils.exception_handler import CustomException
+from app.utils.etag import etag_response
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.utils.fields import parse_fields
+from app.utils.export import export_response, ExportFormat
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_member_scores import (
     MemberScores,
     MemberScoresCreate,
     MemberScoresUpdate,
+    MemberScoresBatchRequest,
 )
 from app.services.srv_member_scores import MemberScoresService
+from app.services.srv_closed_rounds import ClosedRoundsService
 
 router = APIRouter(prefix="/member-scores")
 
 member_scores_service: MemberScoresService = MemberScoresService()
+closed_rounds_service: ClosedRoundsService = ClosedRoundsService()
 
 
 @router.get(
@@ -74,18 +81,58 @@ def get_member_average_scores(team_member_id: int, round: str) -> Any:
         raise CustomException(exception=e)
 
 
+@router.get(
+    "/averages/{round}",
+    response_model=DataResponse[List[Dict]],
+    status_code=status.HTTP_200_OK,
+)
+def get_round_average_scores(
+    request: Request,
+    round: str,
+    sort_params: SortParams = Depends(),
+    pagination_params: PaginationParams = Depends(),
+) -> Any:
+    try:
+        data, metadata = member_scores_service.get_round_average_scores(
+            round=round,
+            pagination_params=pagination_params,
+            sort_params=sort_params
+        )
+        response = DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        if closed_rounds_service.is_closed(round):
+            # A closed round is served from its snapshot, which never changes
+            return etag_response(request, response)
+        return response
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/rankings/{round}",
     response_model=DataResponse[List[Dict]],
     status_code=status.HTTP_200_OK,
 )
 def get_member_rankings(
+    request: Request,
     round: str,
-    limit: int = Query(10, description="Number of top members to return")
+    limit: int = Query(10, ge=1, le=500, description="Number of members per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    student_batch: Optional[str] = Query(None, description="Only members of this batch (D23/D24/D25)"),
+    class_code: Optional[str] = Query(None, description="Only members of this class"),
 ) -> Any:
     try:
-        data = member_scores_service.get_team_member_rankings(round=round, limit=limit)
-        return DataResponse(http_code=status.HTTP_200_OK, data=data)
+        data, metadata = member_scores_service.get_team_member_rankings(
+            round=round,
+            limit=limit,
+            cursor=cursor,
+            student_batch=student_batch,
+            class_code=class_code,
+        )
+        response = DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        if closed_rounds_service.is_closed(round):
+            # A closed round is served from its snapshot, which never changes
+            return etag_response(request, response)
+        return response
     except Exception as e:
         raise CustomException(exception=e)
 
@@ -95,14 +142,58 @@ def get_member_rankings(
     response_model=DataResponse[MemberScores],
     status_code=status.HTTP_201_CREATED,
 )
-def create_member_score(score_data: MemberScoresCreate) -> Any:
+def create_member_score(
+    score_data: MemberScoresCreate,
+    upsert: bool = Query(False, description="Replace this judge's existing score for the member in the round"),
+) -> Any:
     try:
-        new_score = member_scores_service.create_member_score(obj_in=score_data)
+        new_score = member_scores_service.create_member_score(obj_in=score_data, upsert=upsert)
         return DataResponse(http_code=status.HTTP_201_CREATED, data=new_score)
     except Exception as e:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/batch",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def batch_member_scores(
+    batch_data: MemberScoresBatchRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = member_scores_service.batch_member_scores(obj_in=batch_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_member_scores(
+    team_member_id: Optional[int] = Query(None, description="Filter by team member ID"),
+    judge_id: Optional[int] = Query(None, description="Filter by judge ID"),
+    round: Optional[str] = Query(None, description="Filter by round"),
+    export_format: ExportFormat = Query("csv", alias="format", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, all by default"),
+) -> Any:
+    try:
+        fields = parse_fields(MemberScores, fields) or list(MemberScores.model_fields)
+        statement = member_scores_service.export_scores(
+            team_member_id=team_member_id,
+            judge_id=judge_id,
+            round=round,
+            fields=fields,
+        )
+        return export_response(statement, export_format, "member_scores")
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{score_id}",
     response_model=DataResponse[MemberScores],
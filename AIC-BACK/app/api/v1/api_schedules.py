@@ -1,12 +1,19 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from app.utils.exception_handler import CustomException
+from app.utils.etag import etag_response
+from app.utils.ical import CALENDAR_MEDIA_TYPE
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.utils.fields import parse_fields, project, sparse
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_schedules import (
     Schedules,
     SchedulesCreate,
     SchedulesUpdate,
+    SchedulesBulkRequest,
+    SchedulesGenerateRequest,
+    SchedulesImportRequest,
+    SchedulesTimeline,
 )
 from app.services.srv_schedules import SchedulesService
 
@@ -17,19 +24,83 @@ schedules_service: SchedulesService = SchedulesService()
 
 @router.get(
     "",
-    response_model=DataResponse[List[Schedules]],
+    response_model=DataResponse[List[sparse(Schedules)]],
     status_code=status.HTTP_200_OK,
 )
 def get_all_schedules(
     sort_params: SortParams = Depends(),
     pagination_params: PaginationParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,team_id,date_time"),
 ) -> Any:
     try:
+        fields = parse_fields(Schedules, fields)
         data, metadata = schedules_service.get_by_filter(
             pagination_params=pagination_params, 
-            sort_params=sort_params
+            sort_params=sort_params,
+            fields=fields,
         )
-        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        return DataResponse(http_code=status.HTTP_200_OK, data=project(data, fields), metadata=metadata)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/timeline",
+    response_model=DataResponse[SchedulesTimeline],
+    status_code=status.HTTP_200_OK,
+)
+def get_schedules_timeline(
+    start: float = Query(..., alias="from", description="Window start (epoch seconds)"),
+    end: float = Query(..., alias="to", description="Window end (epoch seconds)"),
+) -> Any:
+    """Busy and free intervals with utilization of every location in [from, to)"""
+    try:
+        data = schedules_service.get_timeline(start=start, end=end)
+        return DataResponse(http_code=status.HTTP_200_OK, data=data)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/team/{team_id}.ics",
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+)
+def get_team_calendar(request: Request, team_id: int) -> Any:
+    """iCalendar feed of a team's schedules and the general events"""
+    try:
+        # Rendered once per schedule/team write of any worker; revalidation
+        # is answered from the cache
+        calendar = schedules_service.get_team_calendar(team_id=team_id)
+        return etag_response(request, calendar, media_type=CALENDAR_MEDIA_TYPE)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/location/{location}.ics",
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+)
+def get_location_calendar(request: Request, location: str) -> Any:
+    """iCalendar feed of a location's schedules"""
+    try:
+        calendar = schedules_service.get_location_calendar(location=location)
+        return etag_response(request, calendar, media_type=CALENDAR_MEDIA_TYPE)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/round/{round}.ics",
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+)
+def get_round_calendar(request: Request, round: str) -> Any:
+    """iCalendar feed of a round's schedules, general events included"""
+    try:
+        calendar = schedules_service.get_round_calendar(round=round)
+        return etag_response(request, calendar, media_type=CALENDAR_MEDIA_TYPE)
     except Exception as e:
         raise CustomException(exception=e)
 
@@ -131,6 +202,48 @@ def create_schedule(schedule_data: SchedulesCreate) -> Any:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/bulk",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def bulk_schedules(
+    bulk_data: SchedulesBulkRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = schedules_service.bulk_schedules(obj_in=bulk_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+@router.post(
+    "/import",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def import_schedules(import_data: SchedulesImportRequest) -> Any:
+    """Create every row of a schedule sheet, or report all conflicts and write nothing"""
+    try:
+        results = schedules_service.import_schedules(obj_in=import_data)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.post(
+    "/generate/{round}",
+    response_model=DataResponse[List[Schedules]],
+    status_code=status.HTTP_201_CREATED,
+)
+def generate_schedules(round: str, generate_data: SchedulesGenerateRequest) -> Any:
+    try:
+        schedules = schedules_service.generate_schedules(round=round, obj_in=generate_data)
+        return DataResponse(http_code=status.HTTP_201_CREATED, data=schedules)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{schedule_id}",
     response_model=DataResponse[Schedules],
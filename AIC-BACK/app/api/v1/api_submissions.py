@@ -1,23 +1,27 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, status, Query, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from app.utils.exception_handler import CustomException
 from app.schemas.sche_response import DataResponse
+from app.utils.export import export_response, ExportFormat
+from app.utils.fields import parse_fields, project, sparse
 from app.schemas.sche_base import PaginationParams, SortParams
 from app.schemas.sche_submissions import (
     Submissions,
     SubmissionsCreate,
     SubmissionsUpdate,
 )
-from app.services.srv_submissions import SubmissionsService
+from app.services.srv_submissions import SubmissionsService, AsyncSubmissionsService
 
 router = APIRouter(prefix="/submissions")
 
 submissions_service: SubmissionsService = SubmissionsService()
+async_submissions_service: AsyncSubmissionsService = AsyncSubmissionsService()
 
 
 @router.get(
     "",
-    response_model=DataResponse[List[Submissions]],
+    response_model=DataResponse[List[sparse(Submissions)]],
     status_code=status.HTTP_200_OK,
 )
 def search_submissions(
@@ -27,16 +31,19 @@ def search_submissions(
     status_submission: Optional[str] = Query(None, description="Filter by status"),
     sort_params: SortParams = Depends(),
     pagination_params: PaginationParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,team_id,project_title"),
 ) -> Any:
     try:
+        fields = parse_fields(Submissions, fields)
         data, metadata = submissions_service.search_submissions(
             search_term=search_term,
             team_id=team_id,
             status_submission=status_submission,
             pagination_params=pagination_params, 
-            sort_params=sort_params
+            sort_params=sort_params,
+            fields=fields,
         )
-        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        return DataResponse(http_code=status.HTTP_200_OK, data=project(data, fields), metadata=metadata)
     except Exception as e:
         raise e
 
@@ -81,7 +88,7 @@ async def create_submission(
     source_code_url: Optional[str] = Form(None),
 ) -> Any:
     try:
-        new_submission = await submissions_service.create_submission_with_files(
+        new_submission = await async_submissions_service.create_submission_with_files(
             team_id=team_id,
             project_title=project_title,
             description=description,
@@ -97,6 +104,31 @@ async def create_submission(
         raise e
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_submissions(
+    search_term: Optional[str] = Query(None, description="Search term for submission files and status"),
+    team_id: Optional[int] = Query(None, description="Filter by team ID"),
+    status_submission: Optional[str] = Query(None, description="Filter by status"),
+    export_format: ExportFormat = Query("csv", alias="format", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, all by default"),
+) -> Any:
+    try:
+        fields = parse_fields(Submissions, fields) or list(Submissions.model_fields)
+        statement = submissions_service.export_submissions(
+            search_term=search_term,
+            team_id=team_id,
+            status_submission=status_submission,
+            fields=fields,
+        )
+        return export_response(statement, export_format, "submissions")
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{submission_id}",
     response_model=DataResponse[Submissions],
@@ -127,7 +159,7 @@ async def update_submission(
     source_code_url: Optional[str] = Form(None),
 ) -> Any:
     try:
-        updated_submission = await submissions_service.update_submission_with_files(
+        updated_submission = await async_submissions_service.update_submission_with_files(
             submission_id=submission_id,
             project_title=project_title,
             description=description,
@@ -1,12 +1,16 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from app.utils.exception_handler import CustomException
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.utils.export import export_response, ExportFormat
+from app.utils.fields import parse_fields, project, sparse
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_team_members import (
     TeamMembers,
     TeamMembersCreate,
     TeamMembersUpdate,
+    TeamMembersBulkRequest,
 )
 from app.services.srv_team_members import TeamMembersService
 
@@ -17,7 +21,7 @@ team_members_service: TeamMembersService = TeamMembersService()
 
 @router.get(
     "",
-    response_model=DataResponse[List[TeamMembers]],
+    response_model=DataResponse[List[sparse(TeamMembers)]],
     status_code=status.HTTP_200_OK,
 )
 def search_members(
@@ -25,15 +29,18 @@ def search_members(
     team_id: Optional[int] = Query(None, description="Filter by team ID"),
     sort_params: SortParams = Depends(),
     pagination_params: PaginationParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,full_name,team_id"),
 ) -> Any:
     try:
+        fields = parse_fields(TeamMembers, fields)
         data, metadata = team_members_service.search_members(
             search_term=search_term,
             team_id=team_id,
             pagination_params=pagination_params, 
-            sort_params=sort_params
+            sort_params=sort_params,
+            fields=fields,
         )
-        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        return DataResponse(http_code=status.HTTP_200_OK, data=project(data, fields), metadata=metadata)
     except Exception as e:
         raise CustomException(exception=e)
 
@@ -64,14 +71,55 @@ def get_team_members(
     response_model=DataResponse[TeamMembers],
     status_code=status.HTTP_201_CREATED,
 )
-def create_team_member(member_data: TeamMembersCreate) -> Any:
+def create_team_member(
+    member_data: TeamMembersCreate,
+    upsert: bool = Query(False, description="Update the member with this student code if it exists"),
+) -> Any:
     try:
-        new_member = team_members_service.create_team_member(obj_in=member_data)
+        new_member = team_members_service.create_team_member(obj_in=member_data, upsert=upsert)
         return DataResponse(http_code=status.HTTP_201_CREATED, data=new_member)
     except Exception as e:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/bulk",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def bulk_team_members(
+    bulk_data: TeamMembersBulkRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = team_members_service.bulk_team_members(obj_in=bulk_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_team_members(
+    search_term: Optional[str] = Query(None, description="Search term for name, student code, email, etc."),
+    team_id: Optional[int] = Query(None, description="Filter by team ID"),
+    export_format: ExportFormat = Query("csv", alias="format", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, all by default"),
+) -> Any:
+    try:
+        fields = parse_fields(TeamMembers, fields) or list(TeamMembers.model_fields)
+        statement = team_members_service.export_members(
+            search_term=search_term,
+            team_id=team_id,
+            fields=fields,
+        )
+        return export_response(statement, export_format, "team_members")
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{member_id}",
     response_model=DataResponse[TeamMembers],
@@ -1,18 +1,27 @@
 from typing import Any, List, Optional, Dict
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request
+from fastapi.responses import StreamingResponse
 from app.utils.exception_handler import CustomException
+from app.utils.etag import etag_response
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.utils.fields import parse_fields
+from app.utils.export import export_response, ExportFormat
+from app.utils.normalization import NormalizationMethod
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_team_scores import (
     TeamScores,
     TeamScoresCreate,
     TeamScoresUpdate,
+    TeamScoresBatchRequest,
 )
 from app.services.srv_team_scores import TeamScoresService
+from app.services.srv_closed_rounds import ClosedRoundsService
+from app.services.srv_live_leaderboard import live_leaderboard
 
 router = APIRouter(prefix="/team-scores")
 
 team_scores_service: TeamScoresService = TeamScoresService()
+closed_rounds_service: ClosedRoundsService = ClosedRoundsService()
 
 
 @router.get(
@@ -74,35 +83,145 @@ def get_team_average_scores(team_id: int, round: str) -> Any:
         raise CustomException(exception=e)
 
 
+@router.get(
+    "/averages/{round}",
+    response_model=DataResponse[List[Dict]],
+    status_code=status.HTTP_200_OK,
+)
+def get_round_average_scores(
+    request: Request,
+    round: str,
+    sort_params: SortParams = Depends(),
+    pagination_params: PaginationParams = Depends(),
+) -> Any:
+    try:
+        data, metadata = team_scores_service.get_round_average_scores(
+            round=round,
+            pagination_params=pagination_params,
+            sort_params=sort_params
+        )
+        response = DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        if closed_rounds_service.is_closed(round):
+            # A closed round is served from its snapshot, which never changes
+            return etag_response(request, response)
+        return response
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/rankings/{round}",
     response_model=DataResponse[List[Dict]],
     status_code=status.HTTP_200_OK,
 )
 def get_round_rankings(
+    request: Request,
+    round: str,
+    limit: int = Query(10, description="Number of top teams to return"),
+    method: NormalizationMethod = Query(
+        "raw", description="raw average, or judge-bias corrected zscore, minmax or trimmed"
+    ),
+    trim: float = Query(0.1, ge=0, lt=0.5, description="Fraction cut at each end for method=trimmed"),
+) -> Any:
+    try:
+        data = team_scores_service.get_round_rankings(
+            round=round, limit=limit, method=method, trim=trim
+        )
+        response = DataResponse(http_code=status.HTTP_200_OK, data=data)
+        if closed_rounds_service.is_closed(round):
+            # A closed round is served from its snapshot, which never changes
+            return etag_response(request, response)
+        return response
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/stats/{round}",
+    response_model=DataResponse[Dict],
+    status_code=status.HTTP_200_OK,
+)
+def get_round_statistics(
     round: str,
-    limit: int = Query(10, description="Number of top teams to return")
+    bins: int = Query(10, ge=1, le=100, description="Number of total score histogram buckets"),
 ) -> Any:
     try:
-        data = team_scores_service.get_round_rankings(round=round, limit=limit)
+        data = team_scores_service.get_round_statistics(round=round, bins=bins)
         return DataResponse(http_code=status.HTTP_200_OK, data=data)
     except Exception as e:
         raise CustomException(exception=e)
 
 
+@router.get(
+    "/rankings/{round}/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def stream_round_rankings(round: str) -> Any:
+    return StreamingResponse(
+        live_leaderboard.stream(round),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "",
     response_model=DataResponse[TeamScores],
     status_code=status.HTTP_201_CREATED,
 )
-def create_team_score(score_data: TeamScoresCreate) -> Any:
+def create_team_score(
+    score_data: TeamScoresCreate,
+    upsert: bool = Query(False, description="Replace this judge's existing score for the team in the round"),
+) -> Any:
     try:
-        new_score = team_scores_service.create_team_score(obj_in=score_data)
+        new_score = team_scores_service.create_team_score(obj_in=score_data, upsert=upsert)
         return DataResponse(http_code=status.HTTP_201_CREATED, data=new_score)
     except Exception as e:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/batch",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def batch_team_scores(
+    batch_data: TeamScoresBatchRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = team_scores_service.batch_team_scores(obj_in=batch_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_team_scores(
+    team_id: Optional[int] = Query(None, description="Filter by team ID"),
+    judge_id: Optional[int] = Query(None, description="Filter by judge ID"),
+    round: Optional[str] = Query(None, description="Filter by round"),
+    export_format: ExportFormat = Query("csv", alias="format", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, all by default"),
+) -> Any:
+    try:
+        fields = parse_fields(TeamScores, fields) or list(TeamScores.model_fields)
+        statement = team_scores_service.export_scores(
+            team_id=team_id,
+            judge_id=judge_id,
+            round=round,
+            fields=fields,
+        )
+        return export_response(statement, export_format, "team_scores")
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{score_id}",
     response_model=DataResponse[TeamScores],
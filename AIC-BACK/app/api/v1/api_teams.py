@@ -1,13 +1,18 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.utils.exception_handler import CustomException, ExceptionType
 from app.schemas.sche_response import DataResponse
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.utils.export import export_response, ExportFormat
+from app.utils.fields import parse_fields, parse_include, expand, sparse
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_teams import (
     Teams,
+    TeamsWithRelations,
     TeamsCreate,
     TeamsUpdate,
+    TeamsBulkRequest,
 )
 from app.services.srv_teams import TeamsService
 
@@ -23,21 +28,31 @@ class LoginRequest(BaseModel):
 
 @router.get(
     "",
-    response_model=DataResponse[List[Teams]],
+    response_model=DataResponse[List[sparse(TeamsWithRelations)]],
     status_code=status.HTTP_200_OK,
 )
 def get_teams(
     search_term: Optional[str] = Query(None, description="Search term for team name, slogan, or username"),
     sort_params: SortParams = Depends(),
     pagination_params: PaginationParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,team_name"),
+    include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. members,submissions"),
 ) -> Any:
     try:
+        fields = parse_fields(Teams, fields)
+        include = parse_include(TeamsWithRelations, include)
         data, metadata = teams_service.search_teams(
             search_term=search_term,
             pagination_params=pagination_params, 
-            sort_params=sort_params
+            sort_params=sort_params,
+            fields=fields,
+            include=include,
+        )
+        return DataResponse(
+            http_code=status.HTTP_200_OK,
+            data=expand(data, TeamsWithRelations, include, fields),
+            metadata=metadata,
         )
-        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
     except Exception as e:
         raise CustomException(exception=e)
 
@@ -55,6 +70,42 @@ def create_team(team_data: TeamsCreate) -> Any:
         raise CustomException(exception=e)
 
 
+@router.post(
+    "/bulk",
+    response_model=DataResponse[List[BulkRowResult]],
+    status_code=status.HTTP_200_OK,
+)
+def bulk_teams(
+    bulk_data: TeamsBulkRequest,
+    atomic: bool = Query(False, description="Write nothing if any row is invalid"),
+) -> Any:
+    try:
+        results = teams_service.bulk_teams(obj_in=bulk_data, atomic=atomic)
+        return DataResponse(http_code=status.HTTP_200_OK, data=results)
+    except Exception as e:
+        raise CustomException(exception=e)
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_teams(
+    search_term: Optional[str] = Query(None, description="Search term for team name, slogan, or username"),
+    export_format: ExportFormat = Query("csv", alias="format", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, all by default"),
+) -> Any:
+    try:
+        fields = parse_fields(Teams, fields) or list(Teams.model_fields)
+        statement = teams_service.export_teams(
+            search_term=search_term,
+            fields=fields,
+        )
+        return export_response(statement, export_format, "teams")
+    except Exception as e:
+        raise CustomException(exception=e)
+
+
 @router.get(
     "/{team_id}",
     response_model=DataResponse[Teams],
@@ -1,7 +1,8 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, status, Query
 from app.utils.exception_handler import CustomException
 from app.schemas.sche_response import DataResponse
+from app.utils.fields import parse_fields, project, sparse
 from app.schemas.sche_base import PaginationParams, SortParams
 from app.schemas.sche_user import (
     UserCreateRequest,
@@ -30,18 +31,20 @@ def get_all() -> Any:
 
 @router.get(
     "",
-    response_model=DataResponse[List[UserBaseResponse]],
+    response_model=DataResponse[List[sparse(UserBaseResponse)]],
     status_code=status.HTTP_200_OK,
 )
 def get_by_filter(
     sort_params: SortParams = Depends(),
     pagination_params: PaginationParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,full_name,email"),
 ) -> Any:
     try:
+        fields = parse_fields(UserBaseResponse, fields)
         data, metadata = user_service.get_by_filter(
-            pagination_params=pagination_params, sort_params=sort_params
+            pagination_params=pagination_params, sort_params=sort_params, fields=fields
         )
-        return DataResponse(http_code=status.HTTP_200_OK, data=data, metadata=metadata)
+        return DataResponse(http_code=status.HTTP_200_OK, data=project(data, fields), metadata=metadata)
     except Exception as e:
         return CustomException(exception=e)
 
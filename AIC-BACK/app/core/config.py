@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     DATABASE_URL: str = (
         f"postgresql+psycopg2://{os.environ.get('POSTGRES_USER')}:{os.environ.get('POSTGRES_PASSWORD')}@{os.environ.get('POSTGRES_HOST')}:{os.environ.get('POSTGRES_PORT')}/{os.environ.get('POSTGRES_DB')}?options=-c%20timezone%3DAsia%2FHo_Chi_Minh"
     )
+    ASYNC_DATABASE_URL: str = (
+        f"postgresql+asyncpg://{os.environ.get('POSTGRES_USER')}:{os.environ.get('POSTGRES_PASSWORD')}@{os.environ.get('POSTGRES_HOST')}:{os.environ.get('POSTGRES_PORT')}/{os.environ.get('POSTGRES_DB')}"
+    )
     ACCESS_TOKEN_EXPIRE_SECONDS: int = 60 * 60 * 24 * 7  # Token expired after 7 days
     SECURITY_ALGORITHM: str = "HS256"
     LOGGING_CONFIG_FILE: str = os.path.join(BASE_DIR, "logging.ini")
@@ -26,6 +29,24 @@ class Settings(BaseSettings):
     KEYCLOAK_CLIENT_ID: Optional[str] = os.environ.get("KEYCLOAK_CLIENT_ID", None)
     KEYCLOAK_CLIENT_SECRET: Optional[str] = os.environ.get("KEYCLOAK_CLIENT_SECRET", None)
     KEYCLOAK_VERIFY: Optional[bool] = os.environ.get("KEYCLOAK_VERIFY", "False").lower() == "true"
+    PAGINATION_COUNT_CACHE_TTL: int = int(os.environ.get("PAGINATION_COUNT_CACHE_TTL", 10))
+    PAGINATION_ESTIMATE_THRESHOLD: int = int(os.environ.get("PAGINATION_ESTIMATE_THRESHOLD", 10000))
+    ENTITY_CACHE_MAXSIZE: int = int(os.environ.get("ENTITY_CACHE_MAXSIZE", 10000))
+    ENTITY_CACHE_TTL: int = int(os.environ.get("ENTITY_CACHE_TTL", 30))
+    ENTITY_CACHE_MAX_TAGS: int = int(os.environ.get("ENTITY_CACHE_MAX_TAGS", 10000))
+    RESULT_CACHE_MAXSIZE: int = int(os.environ.get("RESULT_CACHE_MAXSIZE", 1024))
+    RESULT_CACHE_TTL: int = int(os.environ.get("RESULT_CACHE_TTL", 60))
+    RESULT_CACHE_MAX_TAGS: int = int(os.environ.get("RESULT_CACHE_MAX_TAGS", 10000))
+    RESULT_CACHE_CHANNEL: str = os.environ.get("RESULT_CACHE_CHANNEL", "result_cache")
+    EXPORT_BATCH_SIZE: int = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+    LEADERBOARD_CHANNEL: str = os.environ.get("LEADERBOARD_CHANNEL", "leaderboard")
+    LIVE_LEADERBOARD_SIZE: int = int(os.environ.get("LIVE_LEADERBOARD_SIZE", 100))
+    LIVE_LEADERBOARD_DEBOUNCE_MS: int = int(os.environ.get("LIVE_LEADERBOARD_DEBOUNCE_MS", 500))
+    LIVE_LEADERBOARD_KEEPALIVE: int = int(os.environ.get("LIVE_LEADERBOARD_KEEPALIVE", 15))
+    # JSON object of round -> weight for the final results, e.g. {"round1": 0.4, "round2": 0.6};
+    # empty weighs every scored round equally
+    FINAL_ROUND_WEIGHTS: str = os.environ.get("FINAL_ROUND_WEIGHTS", "{}")
+    FINAL_MEMBER_WEIGHT: float = float(os.environ.get("FINAL_MEMBER_WEIGHT", 0.2))
     GOOGLE_CLIENT_ID: Optional[str] = os.environ.get("GOOGLE_CLIENT_ID", None)
 
 
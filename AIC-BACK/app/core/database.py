@@ -1,11 +1,24 @@
-from typing import Generator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Generator, AsyncGenerator, Optional
 from app.core.config import settings
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.middleware.base import BaseHTTPMiddleware
 
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    connect_args={"server_settings": {"timezone": "Asia/Ho_Chi_Minh"}},
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db() -> Generator:
     try:
@@ -13,3 +26,45 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+_async_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "_async_session", default=None
+)
+
+
+class AsyncDBState:
+    """Request-scoped AsyncSession, the async counterpart of fastapi_sqlalchemy's `db`"""
+
+    @property
+    def session(self) -> AsyncSession:
+        session = _async_session.get()
+        if session is None:
+            raise RuntimeError(
+                "No async session in context, use AsyncDBSessionMiddleware or `async with async_db():`"
+            )
+        return session
+
+    @asynccontextmanager
+    async def __call__(self):
+        session = AsyncSessionLocal()
+        token = _async_session.set(session)
+        try:
+            yield session
+        finally:
+            await session.close()
+            _async_session.reset(token)
+
+
+async_db = AsyncDBState()
+
+
+class AsyncDBSessionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        async with async_db():
+            return await call_next(request)
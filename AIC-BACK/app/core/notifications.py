@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+from app.core.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+_RECONNECT_DELAY = 5
+
+
+class PgListener:
+    """One LISTEN connection per process, dispatching NOTIFY payloads by channel.
+
+    Handlers are subscribed at import time and called in the event loop with
+    the payload. `on_connect` callbacks run after every (re)connection, since
+    notifications sent while no connection was listening are lost.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._on_connect: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+        if on_connect is not None:
+            self._on_connect.append(on_connect)
+
+    def start(self) -> None:
+        """Start listening in the running event loop, if not already"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("NOTIFY handler failed on channel %s", channel)
+
+    async def _listen(self) -> None:
+        """Hold a LISTEN connection open, reconnecting after failures"""
+        while True:
+            try:
+                async with async_engine.connect() as connection:
+                    raw = await connection.get_raw_connection()
+                    driver = raw.driver_connection
+                    channels = list(self._handlers)
+                    for channel in channels:
+                        await driver.add_listener(channel, self._dispatch)
+                    self.connected = True
+                    try:
+                        for callback in self._on_connect:
+                            callback()
+                        while not driver.is_closed():
+                            await asyncio.sleep(_RECONNECT_DELAY)
+                    finally:
+                        self.connected = False
+                        # The connection goes back to the pool
+                        if not driver.is_closed():
+                            for channel in channels:
+                                await driver.remove_listener(channel, self._dispatch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("NOTIFY listener failed, reconnecting")
+            await asyncio.sleep(_RECONNECT_DELAY)
+
+
+pg_listener = PgListener()
@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi.exceptions import ValidationException
 import uvicorn
@@ -8,7 +9,8 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.core.router import router
 from app.models import Base
-from app.core.database import engine
+from app.core.database import engine, AsyncDBSessionMiddleware
+from app.core.notifications import pg_listener
 from app.core.config import settings
 from app.utils.exception_handler import (
     CustomException,
@@ -21,8 +23,17 @@ logging.config.fileConfig(settings.LOGGING_CONFIG_FILE, disable_existing_loggers
 Base.metadata.create_all(bind=engine)
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Result cache invalidations of the other workers arrive over LISTEN
+    pg_listener.start()
+    yield
+    await pg_listener.stop()
+
+
 def get_application() -> FastAPI:
     application = FastAPI(
+        lifespan=lifespan,
         title=settings.PROJECT_NAME,
         docs_url="/docs",
         redoc_url="/re-docs",
@@ -52,6 +63,7 @@ def get_application() -> FastAPI:
         allow_headers=["*"],
     )
     application.add_middleware(DBSessionMiddleware, db_url=settings.DATABASE_URL)
+    application.add_middleware(AsyncDBSessionMiddleware)
     application.include_router(router, prefix=settings.API_PREFIX)
     application.add_exception_handler(CustomException, custom_error_handler)
     application.add_exception_handler(ValidationException, validation_exception_handler)
@@ -10,3 +10,8 @@ from app.models.model_team_scores import TeamScores  # noqa
 from app.models.model_member_scores import MemberScores  # noqa 
 from app.models.model_judge_assignments import JudgeAssignments  # noqa
 from app.models.model_schedules import Schedules  # noqa
+from app.models.model_round_leaderboard import RoundLeaderboard  # noqa
+from app.models.model_final_result_versions import FinalResultVersions  # noqa
+from app.models.model_final_results import FinalResults  # noqa
+from app.models.model_closed_rounds import ClosedRounds  # noqa
+from app.models.model_round_snapshots import RoundTeamSnapshots, RoundMemberSnapshots  # noqa
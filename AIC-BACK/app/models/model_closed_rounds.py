@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer
+from sqlalchemy.orm import relationship
+from app.models.model_base import BareBaseModel
+
+
+class ClosedRounds(BareBaseModel):
+    """A round whose scoring is over.
+
+    Its rankings and averages are frozen in round_team_snapshots and
+    round_member_snapshots, and score writes to the round are rejected.
+    """
+    __tablename__ = "closed_rounds"
+
+    round = Column(String, nullable=False, unique=True, index=True)
+    team_count = Column(Integer)
+    member_count = Column(Integer)
+
+    # Relationships
+    team_snapshots = relationship("RoundTeamSnapshots", passive_deletes=True)
+    member_snapshots = relationship("RoundMemberSnapshots", passive_deletes=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Numeric
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from app.models.model_base import BareBaseModel
+
+
+class FinalResultVersions(BareBaseModel):
+    """One computation of the final standings and the weights it used"""
+    __tablename__ = "final_result_versions"
+
+    round_weights = Column(JSONB, nullable=False)  # {"round": weight}, normalized to sum to 1
+    member_weight = Column(Numeric(5, 4), nullable=False)
+    team_count = Column(Integer)
+
+    # Relationships
+    results = relationship("FinalResults", back_populates="version", passive_deletes=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from app.models.model_base import BareBaseModel
+
+
+class FinalResults(BareBaseModel):
+    """A team's final standing in one FinalResultVersions snapshot.
+
+    Rows are written once by FinalResultsService and never updated, so the
+    results page reads a version's rows in rank order from one index.
+    """
+    __tablename__ = "final_results"
+    __table_args__ = (
+        UniqueConstraint("version_id", "team_id", name="uq_final_results_version_team"),
+        Index("ix_final_results_version_rank", "version_id", "rank"),
+    )
+
+    version_id = Column(
+        Integer, ForeignKey("final_result_versions.id", ondelete="CASCADE"), nullable=False
+    )
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    team_name = Column(String)
+    rank = Column(Integer, nullable=False)
+    final_score = Column(Numeric(8, 4), nullable=False)
+    team_score = Column(Numeric(8, 4), nullable=False)    # weighted team score part
+    member_score = Column(Numeric(8, 4), nullable=False)  # weighted member score part
+    round_scores = Column(JSONB, nullable=False)          # {"round": combined score}
+
+    # Relationships
+    version = relationship("FinalResultVersions", back_populates="results")
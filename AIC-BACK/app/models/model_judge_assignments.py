@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.models.model_base import BareBaseModel
 
 
 class JudgeAssignments(BareBaseModel):
     __tablename__ = "judge_assignments"
+    __table_args__ = (
+        UniqueConstraint("team_id", "judge_id", "round", name="uq_judge_assignments_team_judge_round"),
+    )
 
     judge_id = Column(Integer, ForeignKey("judges.id"))
     team_id = Column(Integer, ForeignKey("teams.id"))
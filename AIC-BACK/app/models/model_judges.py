@@ -8,7 +8,7 @@ class Judges(BareBaseModel):
 
     full_name = Column(String, index=True)
     phone = Column(String)
-    email = Column(String, index=True)
+    email = Column(String, unique=True, index=True)
     username = Column(String, unique=True, index=True)
     password_hash = Column(String)
     role = Column(String)
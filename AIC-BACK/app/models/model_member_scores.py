@@ -1,10 +1,16 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, Numeric
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, Numeric, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.models.model_base import BareBaseModel
 
 
 class MemberScores(BareBaseModel):
     __tablename__ = "member_scores"
+    __table_args__ = (
+        # One score per judge and team member in each round
+        UniqueConstraint(
+            "team_member_id", "judge_id", "round", name="uq_member_scores_member_judge_round"
+        ),
+    )
 
     team_member_id = Column(Integer, ForeignKey("team_members.id"))
     judge_id = Column(Integer, ForeignKey("judges.id"))
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, Index, UniqueConstraint
+from app.models.model_base import BareBaseModel
+
+
+class RoundLeaderboard(BareBaseModel):
+    """Per (round, team) running aggregate of team_scores.total_score.
+
+    Maintained by TeamScoresService in the same transaction as the score
+    writes, so rankings read the top rows of an index instead of
+    re-aggregating team_scores.
+    """
+    __tablename__ = "round_leaderboard"
+    __table_args__ = (
+        UniqueConstraint("round", "team_id", name="uq_round_leaderboard_round_team"),
+        Index("ix_round_leaderboard_round_avg_score", "round", "avg_score"),
+    )
+
+    round = Column(String, nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    score_sum = Column(Numeric(12, 2), nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)
+    avg_score = Column(Numeric)  # NULL once the team has no score left in the round
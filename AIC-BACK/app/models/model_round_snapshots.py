@@ -0,0 +1,54 @@
+from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, Index, UniqueConstraint
+from app.models.model_base import BareBaseModel
+
+
+class RoundTeamSnapshots(BareBaseModel):
+    """A team's averages and rank in a closed round, written once on close.
+
+    rank follows the raw /rankings order (average total score, then
+    team_id) and is NULL for a team without any total score.
+    """
+    __tablename__ = "round_team_snapshots"
+    __table_args__ = (
+        UniqueConstraint("round", "team_id", name="uq_round_team_snapshots_round_team"),
+        Index("ix_round_team_snapshots_round_rank", "round", "rank"),
+    )
+
+    round = Column(String, ForeignKey("closed_rounds.round", ondelete="CASCADE"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    rank = Column(Integer)
+    avg_creativity = Column(Numeric)
+    avg_feasibility = Column(Numeric)
+    avg_ai_effectiveness = Column(Numeric)
+    avg_presentation = Column(Numeric)
+    avg_social_impact = Column(Numeric)
+    avg_total_score = Column(Numeric)
+    judge_count = Column(Integer, nullable=False)
+
+
+class RoundMemberSnapshots(BareBaseModel):
+    """A team member's averages and ranks in a closed round, written once on close.
+
+    The member's name, team, batch and class are copied as they were when
+    the round closed; the ranks are NULL without any total score.
+    """
+    __tablename__ = "round_member_snapshots"
+    __table_args__ = (
+        UniqueConstraint("round", "team_member_id", name="uq_round_member_snapshots_round_member"),
+        Index("ix_round_member_snapshots_round_rank", "round", "rank", "team_member_id"),
+    )
+
+    round = Column(String, ForeignKey("closed_rounds.round", ondelete="CASCADE"), nullable=False)
+    team_member_id = Column(Integer, ForeignKey("team_members.id", ondelete="CASCADE"), nullable=False)
+    full_name = Column(String)
+    team_id = Column(Integer)
+    student_batch = Column(String)
+    class_code = Column(String)
+    rank = Column(Integer)
+    dense_rank = Column(Integer)
+    batch_rank = Column(Integer)
+    class_rank = Column(Integer)
+    avg_skills_learning = Column(Numeric)
+    avg_inspiration = Column(Numeric)
+    avg_total_score = Column(Numeric)
+    judge_count = Column(Integer, nullable=False)
@@ -1,16 +1,45 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, Computed, DDL, event
+from sqlalchemy.dialects.postgresql import TSTZRANGE, ExcludeConstraint
 from sqlalchemy.orm import relationship
 from app.models.model_base import BareBaseModel
 
 
 class Schedules(BareBaseModel):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # No two schedules at the same location may overlap in time. Checked
+        # per statement, but deferrable so a batch can move rows past each other
+        ExcludeConstraint(
+            ("location", "="),
+            ("time_range", "&&"),
+            name="ex_schedules_location_time_range",
+            using="gist",
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+    )
 
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)  # null nếu sự kiện chung
     round = Column(String, index=True)
     date_time = Column(Float, index=True)
+    duration = Column(Integer, nullable=False, server_default="1800")  # seconds
     location = Column(String)
     note = Column(Text)
+    # [date_time, date_time + duration) kept by Postgres for the exclusion constraint
+    time_range = Column(
+        TSTZRANGE,
+        Computed(
+            "CASE WHEN date_time IS NOT NULL "
+            "THEN tstzrange(to_timestamp(date_time), to_timestamp(date_time + duration)) END",
+            persisted=True,
+        ),
+    )
     
     # Relationship
     team = relationship("Teams", back_populates="schedules")
+
+
+# "=" on location inside a GiST index needs the btree_gist operator classes
+event.listen(
+    Schedules.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS btree_gist")
+)
@@ -1,17 +1,26 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.models.model_base import BareBaseModel
 
 
 class TeamMembers(BareBaseModel):
     __tablename__ = "team_members"
+    __table_args__ = (
+        # At most one leader per team
+        Index(
+            "ux_team_members_team_leader",
+            "team_id",
+            unique=True,
+            postgresql_where=text("is_leader"),
+        ),
+    )
 
     team_id = Column(Integer, ForeignKey("teams.id"))
     full_name = Column(String, index=True)
-    student_code = Column(String, index=True)
+    student_code = Column(String, unique=True, index=True)
     student_batch = Column(String, index=True)  # D23/D24/D25
     class_code = Column(String, index=True)     # 01,02,03...
-    email = Column(String, index=True)
+    email = Column(String, unique=True, index=True)
     phone = Column(String)
     is_leader = Column(Boolean, default=False)
     avatar_url = Column(String)
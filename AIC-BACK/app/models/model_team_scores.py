@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, Numeric
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, Numeric, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.models.model_base import BareBaseModel
 
 
 class TeamScores(BareBaseModel):
     __tablename__ = "team_scores"
+    __table_args__ = (
+        # One score per judge and team in each round
+        UniqueConstraint("team_id", "judge_id", "round", name="uq_team_scores_team_judge_round"),
+    )
 
     team_id = Column(Integer, ForeignKey("teams.id"))
     judge_id = Column(Integer, ForeignKey("judges.id"))
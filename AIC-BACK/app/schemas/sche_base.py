@@ -11,8 +11,22 @@ class BaseModelResponse(BaseModel):
 class PaginationParams(BaseModel):
     page_size: Optional[int] = 10
     page: Optional[int] = 1
+    cursor: Optional[str] = None
+    total_mode: Optional[Literal["exact", "estimate", "none"]] = None
 
 
 class SortParams(BaseModel):
     sort_by: Optional[str] = "id"
     order: Optional[Literal["asc", "desc"]] = "desc"
+
+
+class BulkRowResult(BaseModel):
+    operation: Literal["create", "update", "delete"]
+    index: int
+    success: bool
+    id: Optional[int] = None
+    message: Optional[str] = None
+
+    @classmethod
+    def failed(cls, operation: str, index: int, message: str, id: Optional[int] = None) -> "BulkRowResult":
+        return cls(operation=operation, index=index, success=False, id=id, message=message)
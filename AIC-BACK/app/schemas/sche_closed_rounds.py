@@ -0,0 +1,16 @@
+from typing import Optional
+from app.schemas.sche_base import BaseModelResponse
+
+
+class ClosedRoundsInDBBase(BaseModelResponse):
+    id: int
+    round: str
+    team_count: Optional[int] = None
+    member_count: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ClosedRounds(ClosedRoundsInDBBase):
+    pass
@@ -0,0 +1,44 @@
+from pydantic import BaseModel
+from typing import Optional, Dict
+from app.schemas.sche_base import BaseModelResponse
+from decimal import Decimal
+
+
+class FinalResultsConfig(BaseModel):
+    # round -> weight, normalized to sum to 1; defaults to FINAL_ROUND_WEIGHTS
+    round_weights: Optional[Dict[str, Decimal]] = None
+    # share of member scores in each round's score; defaults to FINAL_MEMBER_WEIGHT
+    member_weight: Optional[Decimal] = None
+
+
+class FinalResultVersionsInDBBase(BaseModelResponse):
+    id: int
+    round_weights: Dict[str, float]
+    member_weight: Decimal
+    team_count: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+class FinalResultVersions(FinalResultVersionsInDBBase):
+    pass
+
+
+class FinalResultsInDBBase(BaseModelResponse):
+    id: int
+    version_id: int
+    team_id: int
+    team_name: Optional[str] = None
+    rank: int
+    final_score: Decimal
+    team_score: Decimal
+    member_score: Decimal
+    round_scores: Dict[str, float]
+
+    class Config:
+        orm_mode = True
+
+
+class FinalResults(FinalResultsInDBBase):
+    pass
@@ -26,3 +26,13 @@ class JudgeAssignmentsInDBBase(JudgeAssignmentsBase, BaseModelResponse):
 
 class JudgeAssignments(JudgeAssignmentsInDBBase):
     pass
+
+
+class JudgeAssignmentsBulkUpdate(JudgeAssignmentsUpdate):
+    id: int
+
+
+class JudgeAssignmentsBulkRequest(BaseModel):
+    create: List[JudgeAssignmentsCreate] = []
+    update: List[JudgeAssignmentsBulkUpdate] = []
+    delete: List[int] = []
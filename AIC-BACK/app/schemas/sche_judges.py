@@ -1,6 +1,9 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Literal
 from app.schemas.sche_base import BaseModelResponse
+from app.schemas.sche_team_scores import TeamScores
+from app.schemas.sche_member_scores import MemberScores
+from app.schemas.sche_judge_assignments import JudgeAssignments
 
 
 class JudgesBase(BaseModel):
@@ -35,5 +38,22 @@ class Judges(JudgesInDBBase):
     pass
 
 
+class JudgesWithRelations(Judges):
+    # Only present when requested with `include=`
+    team_scores: Optional[List[TeamScores]] = None
+    member_scores: Optional[List[MemberScores]] = None
+    judge_assignments: Optional[List[JudgeAssignments]] = None
+
+
 class JudgesInDB(JudgesInDBBase):
-    password_hash: str
\ No newline at end of file
+    password_hash: str
+
+
+class JudgesBulkUpdate(JudgesUpdate):
+    id: int
+
+
+class JudgesBulkRequest(BaseModel):
+    create: List[JudgesCreate] = []
+    update: List[JudgesBulkUpdate] = []
+    delete: List[int] = []
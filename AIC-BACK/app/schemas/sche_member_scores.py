@@ -34,3 +34,7 @@ class MemberScoresInDBBase(MemberScoresBase, BaseModelResponse):
 
 class MemberScores(MemberScoresInDBBase):
     pass
+
+
+class MemberScoresBatchRequest(BaseModel):
+    scores: List[MemberScoresCreate]
@@ -8,7 +8,9 @@ T = TypeVar("T")
 class MetadataResponse(BaseModel):
     page: int
     page_size: int
-    total: int
+    total: Optional[int] = None
+    has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None
 
 
 class BaseResponse(BaseModel):
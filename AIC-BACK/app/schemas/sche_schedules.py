@@ -7,6 +7,7 @@ class SchedulesBase(BaseModel):
     team_id: Optional[int] = None  # null nếu sự kiện chung
     round: str
     date_time: float
+    duration: int = 1800  # seconds, one 30 minute slot by default
     location: str
     note: Optional[str] = None
 
@@ -19,6 +20,7 @@ class SchedulesUpdate(BaseModel):
     team_id: Optional[int] = None
     round: Optional[str] = None
     date_time: Optional[float] = None
+    duration: Optional[int] = None
     location: Optional[str] = None
     note: Optional[str] = None
 
@@ -33,3 +35,47 @@ class SchedulesInDBBase(SchedulesBase, BaseModelResponse):
 class Schedules(SchedulesInDBBase):
     pass
 
+
+class SchedulesBulkUpdate(SchedulesUpdate):
+    id: int
+
+
+class SchedulesBulkRequest(BaseModel):
+    create: List[SchedulesCreate] = []
+    update: List[SchedulesBulkUpdate] = []
+    delete: List[int] = []
+
+
+class SchedulesImportRequest(BaseModel):
+    schedules: List[SchedulesCreate]
+
+
+class ScheduleWindow(BaseModel):
+    start: float
+    end: float
+
+
+class LocationTimeline(BaseModel):
+    location: str
+    busy: List[ScheduleWindow]
+    free: List[ScheduleWindow]
+    busy_seconds: float
+    utilization: float  # percent of the window that is busy
+
+
+class SchedulesTimeline(BaseModel):
+    start: float
+    end: float
+    locations: List[LocationTimeline]
+
+
+class SchedulesGenerateRequest(BaseModel):
+    locations: List[str]
+    start: float
+    end: float
+    slot_duration: int = 1800  # seconds
+    gap: int = 0  # seconds between consecutive slots in a location
+    breaks: List[ScheduleWindow] = []  # no slot in any location overlaps these
+    # Teams in slot order; every team without a schedule in the round by default
+    team_ids: Optional[List[int]] = None
+    note: Optional[str] = None
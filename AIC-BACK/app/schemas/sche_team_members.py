@@ -39,3 +39,13 @@ class TeamMembersInDBBase(TeamMembersBase, BaseModelResponse):
 
 class TeamMembers(TeamMembersInDBBase):
     pass
+
+
+class TeamMembersBulkUpdate(TeamMembersUpdate):
+    id: int
+
+
+class TeamMembersBulkRequest(BaseModel):
+    create: List[TeamMembersCreate] = []
+    update: List[TeamMembersBulkUpdate] = []
+    delete: List[int] = []
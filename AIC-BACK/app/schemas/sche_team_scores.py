@@ -40,3 +40,7 @@ class TeamScoresInDBBase(TeamScoresBase, BaseModelResponse):
 
 class TeamScores(TeamScoresInDBBase):
     pass
+
+
+class TeamScoresBatchRequest(BaseModel):
+    scores: List[TeamScoresCreate]
@@ -1,6 +1,11 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from app.schemas.sche_base import BaseModelResponse
+from app.schemas.sche_team_members import TeamMembers
+from app.schemas.sche_submissions import Submissions
+from app.schemas.sche_team_scores import TeamScores
+from app.schemas.sche_judge_assignments import JudgeAssignments
+from app.schemas.sche_schedules import Schedules
 
 
 class TeamsBase(BaseModel):
@@ -35,5 +40,24 @@ class Teams(TeamsInDBBase):
     pass
 
 
+class TeamsWithRelations(Teams):
+    # Only present when requested with `include=`
+    members: Optional[List[TeamMembers]] = None
+    submissions: Optional[List[Submissions]] = None
+    team_scores: Optional[List[TeamScores]] = None
+    judge_assignments: Optional[List[JudgeAssignments]] = None
+    schedules: Optional[List[Schedules]] = None
+
+
 class TeamsInDB(TeamsInDBBase):
     password_hash: str
+
+
+class TeamsBulkUpdate(TeamsUpdate):
+    id: int
+
+
+class TeamsBulkRequest(BaseModel):
+    create: List[TeamsCreate] = []
+    update: List[TeamsBulkUpdate] = []
+    delete: List[int] = []
@@ -9,6 +9,7 @@ from app.utils.exception_handler import CustomException, ExceptionType
 from app.core.config import keycloak_openid, settings
 from app.utils.enums import UserRole
 from app.utils import time_utils
+from app.services.srv_user import UserService
 
 
 class AuthService(object):
@@ -33,6 +34,7 @@ class AuthService(object):
             raise CustomException(exception=ExceptionType.UNAUTHORIZED)
 
         user.last_login = time_utils.timestamp_now()
+        UserService().invalidate_results(user)
         db.session.commit()
         access_token, expire = create_access_token(
             TokenRequest(
@@ -1,29 +1,392 @@
-from typing import Generic, TypeVar, Type, Any, Optional, List, Tuple
+import functools
+import json
+from inspect import signature
+from collections.abc import Mapping
+from typing import Generic, TypeVar, Type, Any, Optional, List, Tuple, Iterable, Dict
 from fastapi.encoders import jsonable_encoder
 from fastapi_sqlalchemy import db
+from sqlalchemy import select, insert, update, delete, inspect, event, func, Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session, make_transient_to_detached, object_session
+from app.core.config import settings
+from app.core.database import async_db
+from app.core.notifications import pg_listener
 from app.models.model_base import BareBaseModel
+from app.models.model_closed_rounds import ClosedRounds
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
-from app.utils.paging import paginate
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
+from app.utils.paging import paginate, paginate_async
+from app.utils.fields import only_fields
 from app.schemas.sche_response import MetadataResponse
+from app.utils.cache import TaggedCache
 
 
 ModelType = TypeVar("ModelType", bound=BareBaseModel)
 
+# Process-wide read-through cache of rows by primary key, shared by every
+# service instance. Values are column dicts, tagged "row:{table}:{id}": the
+# row tags travel with the result cache ones below and only invalidate it.
+entity_cache = TaggedCache(
+    "entity",
+    maxsize=settings.ENTITY_CACHE_MAXSIZE,
+    ttl=settings.ENTITY_CACHE_TTL,
+    max_tags=settings.ENTITY_CACHE_MAX_TAGS,
+)
+_MISSING = object()
+_ROW_TAG = "row:"
+
+# Cache of read-mostly service results, see cached_result(). Entries are
+# tagged with the table they read ("teams") or finer tags ("round:{r}",
+# "team:{id}") that writes through BaseService invalidate on commit, in
+# every worker: the tags are broadcast on RESULT_CACHE_CHANNEL.
+result_cache = TaggedCache(
+    "result",
+    maxsize=settings.RESULT_CACHE_MAXSIZE,
+    ttl=settings.RESULT_CACHE_TTL,
+    max_tags=settings.RESULT_CACHE_MAX_TAGS,
+)
+# Row columns that produce a "{prefix}:{value}" tag when written
+_TAG_COLUMNS = {"team_id": "team", "round": "round"}
+_PENDING_TAGS = "result_cache_tags"
+# NOTIFY payloads must stay under 8000 bytes
+_NOTIFY_PAYLOAD_SIZE = 7500
+
+
+def _row_value(row: Any, name: str) -> Any:
+    """Column `name` of an ORM object or a column mapping (dict or RETURNING row)"""
+    if isinstance(row, Mapping):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+def _row_tag(table: str, id: Any) -> str:
+    """entity_cache tag of the row `id` of `table`"""
+    return f"{_ROW_TAG}{table}:{id}"
+
+
+def _row_tags(model, row: Any, entity_tag: Optional[str] = None) -> set:
+    """Tags touched by writing `row`, an ORM object or a column mapping"""
+    tags = {model.__tablename__}
+    if _row_value(row, "id") is not None:
+        tags.add(_row_tag(model.__tablename__, _row_value(row, "id")))
+    if entity_tag:
+        tags.add(f"{entity_tag}:{_row_value(row, 'id')}")
+    for column, prefix in _TAG_COLUMNS.items():
+        value = _row_value(row, column)
+        if value is not None:
+            tags.add(f"{prefix}:{value}")
+    return tags
+
+
+def _queue_tags(session: Session, tags: Iterable[str]) -> None:
+    """Invalidate `tags` once the session's transaction commits"""
+    session.info.setdefault(_PENDING_TAGS, set()).update(tags)
+
+
+def _tag_payloads(tags: Iterable[str]) -> List[str]:
+    """`tags` as JSON arrays that each fit in a NOTIFY payload"""
+    payloads, chunk, size = [], [], 2
+    for tag in sorted(tags):
+        tag_size = len(json.dumps(tag).encode()) + 1
+        if chunk and size + tag_size > _NOTIFY_PAYLOAD_SIZE:
+            payloads.append(json.dumps(chunk, separators=(",", ":")))
+            chunk, size = [], 2
+        chunk.append(tag)
+        size += tag_size
+    if chunk:
+        payloads.append(json.dumps(chunk, separators=(",", ":")))
+    return payloads
+
+
+@event.listens_for(Session, "before_commit")
+def _broadcast_pending_tags(session: Session) -> None:
+    """NOTIFY the other workers of the tags this transaction invalidates.
+
+    NOTIFY is transactional, so they hear it exactly when the write commits.
+    """
+    tags = session.info.get(_PENDING_TAGS)
+    if tags:
+        for payload in _tag_payloads(tags):
+            session.execute(select(func.pg_notify(settings.RESULT_CACHE_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session: Session) -> None:
+    # The writing worker does not wait for its own notification
+    tags = session.info.pop(_PENDING_TAGS, None)
+    if tags:
+        _invalidate_tags(tags)
+
+
+def _invalidate_tags(tags: Iterable[str]) -> None:
+    """Bump row tags in entity_cache and the other ones in result_cache"""
+    tags = set(tags)
+    rows = {tag for tag in tags if tag.startswith(_ROW_TAG)}
+    entity_cache.invalidate_tags(*rows)
+    result_cache.invalidate_tags(*(tags - rows))
+
+
+def _invalidate_notified_tags(payload: str) -> None:
+    _invalidate_tags(json.loads(payload))
+
+
+def _invalidate_all() -> None:
+    entity_cache.invalidate_all()
+    result_cache.invalidate_all()
+
+
+# Writes committed while this worker was not listening were never heard
+pg_listener.subscribe(
+    settings.RESULT_CACHE_CHANNEL, _invalidate_notified_tags, on_connect=_invalidate_all
+)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tags(session: Session) -> None:
+    session.info.pop(_PENDING_TAGS, None)
+
+
+def relation_tags(model, names: Optional[Iterable[str]]) -> list:
+    """Table tags of the relationships `names` of `model`, for include= results"""
+    relationships = inspect(model).relationships
+    return [relationships[name].mapper.local_table.name for name in names or []]
+
+
+def _cache_key_part(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (list, tuple, set)):
+        return [_cache_key_part(item) for item in value]
+    return value
+
+
+def _detach(value: Any) -> Any:
+    """Expunge ORM objects of a result so it can outlive the request session"""
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            _detach(item)
+    elif hasattr(value, "_sa_instance_state"):
+        session = object_session(value)
+        if session is not None:
+            session.expunge(value)
+    return value
+
+
+def cached_result(*tags: str, require_listener: bool = False):
+    """Cache a read-only service method in result_cache.
+
+    The key is (service, method, normalized arguments). `tags` are formatted
+    with the call arguments, e.g. cached_result("round:{round}"); a callable
+    tag receives the arguments and returns a list of tags.
+
+    With require_listener=True the cache is bypassed while pg_listener is
+    not connected, i.e. while writes of other workers could go unheard.
+    """
+
+    def call_tags(params: dict) -> list:
+        names = []
+        for tag in tags:
+            if callable(tag):
+                names.extend(tag(params))
+            else:
+                names.append(tag.format(**params))
+        return names
+
+    def decorator(func):
+        func_signature = signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if require_listener and not pg_listener.connected:
+                return func(self, *args, **kwargs)
+            bound = func_signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "self"}
+            key = (
+                type(self).__name__,
+                func.__name__,
+                json.dumps(_cache_key_part(params), sort_keys=True, default=str),
+            )
+            value = result_cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            versions = result_cache.tag_versions(call_tags(params))
+            value = _detach(func(self, *args, **kwargs))
+            result_cache.set(key, value, versions)
+            return value
+
+        return wrapper
+
+    return decorator
+
+_BULK_OPERATIONS = {"create": 0, "update": 1, "delete": 2}
+
+
+def _sort_bulk_results(results: List[BulkRowResult]) -> List[BulkRowResult]:
+    return sorted(results, key=lambda r: (_BULK_OPERATIONS[r.operation], r.index))
+
+
+def _column_values(model, data: dict[str, Any], skip_none: bool) -> dict[str, Any]:
+    """UPDATE values for the mapped columns in `data`; partial updates skip None"""
+    obj_data = jsonable_encoder(data)
+    columns = inspect(model).column_attrs.keys()
+    return {
+        field: value
+        for field, value in obj_data.items()
+        if field in columns and field != "id" and not (skip_none and value is None)
+    }
+
+
+def _constraint_columns(table, name: str) -> List[str]:
+    """Columns of the unique constraint or unique index `name` of `table`"""
+    for item in list(table.constraints) + list(table.indexes):
+        if item.name == name:
+            return [column.name for column in item.columns]
+    raise ValueError(f"{table.name} has no constraint {name}")
+
+
+def _violated_constraint(e: IntegrityError) -> Optional[str]:
+    """Name of the constraint behind an IntegrityError, with psycopg2 or asyncpg"""
+    diag = getattr(e.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    return getattr(getattr(e.orig, "__cause__", None), "constraint_name", None)
+
 
 class BaseService(Generic[ModelType], object):
+    # Prefix of the "{entity_tag}:{id}" result cache tag of this model's rows
+    entity_tag: Optional[str] = None
+    # Unique constraint (or unique index) name -> (exception, detail) raised
+    # when a write violates it, instead of probing for duplicates beforehand
+    unique_errors: Dict[str, Tuple[ExceptionType, str]] = {}
+    # Natural key of the model: the ON CONFLICT target of insert_on_conflict()
+    conflict_constraint: Optional[str] = None
+    # Rows belong to a "round" and can no longer be written once it is closed
+    frozen_on_close: bool = False
 
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
+    def invalidate_results(self, *rows: Any) -> None:
+        """Queue the result cache tags of written rows until the next commit"""
+        _queue_tags(
+            db.session,
+            set().union(*(_row_tags(self.model, row, self.entity_tag) for row in rows)),
+        )
+
+    def _tag_rows(self, ids: Iterable[int]) -> list:
+        """Current (id, tag columns) of rows, read before changing their tags"""
+        table = self.model.__table__
+        columns = [table.c[name] for name in _TAG_COLUMNS if name in table.c]
+        return [
+            dict(row)
+            for row in db.session.execute(
+                select(table.c.id, *columns).where(table.c.id.in_(list(ids)))
+            ).mappings()
+        ]
+
+    def _closed_rounds(self, rounds: Iterable[Optional[str]]) -> List[str]:
+        """The rounds of `rounds` that are closed"""
+        rounds = {round for round in rounds if round is not None}
+        if not rounds:
+            return []
+        return db.session.scalars(
+            select(ClosedRounds.round).where(ClosedRounds.round.in_(rounds))
+        ).all()
+
+    def _check_rounds_open(self, *rows: Any) -> None:
+        """Reject a write to rows of a closed round, see frozen_on_close.
+
+        Called after the write statement: ClosedRoundsService.close_round()
+        (srv_closed_rounds) locks the table in SHARE mode, so either the
+        close waits for this transaction or the write waited for the close
+        and sees it here.
+        """
+        if not self.frozen_on_close:
+            return
+        closed = self._closed_rounds(_row_value(row, "round") for row in rows)
+        if closed:
+            db.session.rollback()
+            raise CustomException(
+                exception=ExceptionType.CONFLICT, detail=f"Round {closed[0]} is closed"
+            )
+
+    def _unique_error(self, e: IntegrityError) -> Exception:
+        """The CustomException of the constraint `e` violated, or `e` itself"""
+        error = self.unique_errors.get(_violated_constraint(e))
+        if error is None:
+            return e
+        exception, detail = error
+        return CustomException(exception=exception, detail=detail)
+
+    def _execute_returning(self, statement) -> Optional[Any]:
+        """First RETURNING row of a write, with constraint violations mapped"""
+        try:
+            return db.session.execute(statement).mappings().first()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise self._unique_error(e)
+
+    def _attach_returned(self, row: Any, commit: bool) -> ModelType:
+        """ORM object of a RETURNING row, merged without a SELECT"""
+        self.invalidate_results(row)
+        row = dict(row)
+        if commit:
+            db.session.commit()
+        obj = self.model(**row)
+        make_transient_to_detached(obj)
+        return db.session.merge(obj, load=False)
+
+    def _cache_key(self, id: int) -> tuple:
+        return (self.model.__tablename__, id)
+
+    def _get_cached(self, id: int) -> Optional[ModelType]:
+        """Read-through lookup: serve the row from entity_cache when possible.
+
+        Only for reads: the cached row may lag behind a write that has not
+        been heard yet, so read-modify-write paths use get_for_update().
+        Misses are not cached, a row created by another worker is found at
+        once. The cache is bypassed while pg_listener is not connected and
+        once the session has written, since its rows are not committed yet.
+        """
+        session = db.session
+        if not pg_listener.connected or session.info.get(_PENDING_TAGS) or session.dirty:
+            return session.get(self.model, id)
+        obj = session.identity_map.get(session.identity_key(self.model, id))
+        if obj is not None:
+            return obj
+        key = self._cache_key(id)
+        cached = entity_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            obj = self.model(**cached)
+            make_transient_to_detached(obj)
+            return session.merge(obj, load=False)
+
+        versions = entity_cache.tag_versions([_row_tag(self.model.__tablename__, id)])
+        obj = session.get(self.model, id)
+        if obj is not None:
+            entity_cache.set(
+                key,
+                {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs},
+                versions,
+            )
+        return obj
+
     def get_by_id(self, id: int) -> ModelType:
-        obj = db.session.query(self.model).get(id)
+        obj = self._get_cached(id)
         if obj is None:
             raise CustomException(exception=ExceptionType.NOT_FOUND)
         return obj
 
     def get_by_id_optional(self, id: int) -> Optional[ModelType]:
-        obj = db.session.query(self.model).get(id)
+        return self._get_cached(id)
+
+    def get_for_update(self, id: int) -> ModelType:
+        """The row as stored, uncached and locked FOR UPDATE until commit"""
+        obj = db.session.get(self.model, id, with_for_update=True, populate_existing=True)
+        if obj is None:
+            raise CustomException(exception=ExceptionType.NOT_FOUND)
         return obj
 
     def get_all(
@@ -41,8 +404,9 @@ class BaseService(Generic[ModelType], object):
         self,
         pagination_params: Optional[PaginationParams] = PaginationParams(),
         sort_params: Optional[SortParams] = SortParams(),
+        fields: Optional[List[str]] = None,
     ) -> Tuple[List[ModelType], MetadataResponse]:
-        query = db.session.query(self.model)
+        query = only_fields(self.model, db.session.query(self.model), fields, sort_params)
         return paginate(
             model=self.model,
             query=query,
@@ -50,37 +414,392 @@ class BaseService(Generic[ModelType], object):
             sort_params=sort_params,
         )
 
-    def create(self, data: dict[str, Any]) -> ModelType:
+    def create(self, data: dict[str, Any], commit: bool = True) -> ModelType:
         obj_data = jsonable_encoder(data)
         obj = self.model(**obj_data)
         db.session.add(obj)
-        db.session.commit()
-        db.session.refresh(obj)
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise self._unique_error(e)
+        self._check_rounds_open(obj)
+        self.invalidate_results(obj)
+        if commit:
+            db.session.commit()
+            db.session.refresh(obj)
         return obj
 
-    def update_by_id(self, id: int, data: dict[str, Any]) -> ModelType:
-        obj_data = jsonable_encoder(data)
-        exist_obj = self.get_by_id(id)
-        for field in obj_data:
-            setattr(exist_obj, field, obj_data[field])
-        db.session.commit()
-        db.session.refresh(exist_obj)
-        return exist_obj
-
-    def partial_update_by_id(self, id: int, data: dict[str, Any]) -> ModelType:
-        obj_data = jsonable_encoder(data)
-        exist_obj = self.get_by_id(id)
-        for field in obj_data:
-            if hasattr(exist_obj, field) and obj_data[field] is not None:
-                if isinstance(getattr(exist_obj, field), list) and not obj_data[field]:
-                    setattr(exist_obj, field, [])
-                else:
-                    setattr(exist_obj, field, obj_data[field])
-        db.session.commit()
-        db.session.refresh(exist_obj)
-        return exist_obj
-
-    def delete_by_id(self, id: int) -> None:
-        obj = self.get_by_id(id)
+    def _insert_on_conflict(
+        self, data: dict[str, Any], upsert: bool, update_fields: Optional[Iterable[str]] = None
+    ) -> Optional[Any]:
+        """INSERT ... ON CONFLICT on conflict_constraint ... RETURNING the row.
+
+        DO UPDATE overwrites the conflicting row with `data`, or only with
+        its `update_fields` (created_at is kept); DO NOTHING returns None
+        instead.
+        """
+        table = self.model.__table__
+        key = _constraint_columns(table, self.conflict_constraint)
+        values = _column_values(self.model, data, skip_none=False)
+        statement = pg_insert(table).values(**values)
+        if upsert:
+            changes = {
+                name: statement.excluded[name]
+                for name in values
+                if name not in key and (update_fields is None or name in update_fields)
+            }
+            changes["updated_at"] = statement.excluded.updated_at
+            statement = statement.on_conflict_do_update(index_elements=key, set_=changes)
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=key)
+        row = self._execute_returning(statement.returning(*table.c))
+        if row is not None:
+            self._check_rounds_open(row)
+        return row
+
+    def _conflict_error(self) -> CustomException:
+        exception, detail = self.unique_errors[self.conflict_constraint]
+        return CustomException(exception=exception, detail=detail)
+
+    def insert_on_conflict(
+        self,
+        data: dict[str, Any],
+        upsert: bool = False,
+        commit: bool = True,
+        update_fields: Optional[Iterable[str]] = None,
+    ) -> ModelType:
+        """Create a row in one statement, letting the unique constraints find duplicates.
+
+        A row with the same natural key raises its unique_errors entry, or is
+        updated in place with upsert=True: every field of `data`, or only
+        `update_fields` (the fields the client sent, so that defaults of
+        the create schema do not overwrite stored values).
+        """
+        row = self._insert_on_conflict(data, upsert, update_fields)
+        if row is None:
+            db.session.rollback()
+            raise self._conflict_error()
+        return self._attach_returned(row, commit)
+
+    def _update_row(self, id: int, values: dict[str, Any]) -> Any:
+        """Apply `values` with a single UPDATE ... WHERE id = :id RETURNING the row"""
+        old_rows = []
+        if any(name in values for name in _TAG_COLUMNS):
+            old_rows = self._tag_rows([id])
+            self.invalidate_results(*old_rows)
+        table = self.model.__table__
+        row = self._execute_returning(
+            update(table).where(table.c.id == id).values(**values).returning(*table.c)
+        )
+        if row is None:
+            db.session.rollback()
+            raise CustomException(exception=ExceptionType.NOT_FOUND)
+        self._check_rounds_open(row, *old_rows)
+        return row
+
+    def _update_returning(self, id: int, values: dict[str, Any], commit: bool = True) -> ModelType:
+        """Apply `values` with a single UPDATE ... WHERE id = :id RETURNING.
+
+        The returned row is attached to the session with merge(load=False)
+        instead of being refreshed.
+        """
+        if not values:
+            return self.get_by_id(id)
+        return self._attach_returned(self._update_row(id, values), commit)
+
+    def update_by_id(self, id: int, data: dict[str, Any], commit: bool = True) -> ModelType:
+        return self._update_returning(
+            id, _column_values(self.model, data, skip_none=False), commit=commit
+        )
+
+    def partial_update_by_id(self, id: int, data: dict[str, Any], commit: bool = True) -> ModelType:
+        return self._update_returning(
+            id, _column_values(self.model, data, skip_none=True), commit=commit
+        )
+
+    def delete_by_id(self, id: int, commit: bool = True) -> None:
+        obj = self.get_for_update(id)
+        self.invalidate_results(obj)
         db.session.delete(obj)
-        db.session.commit()
+        db.session.flush()
+        self._check_rounds_open(obj)
+        if commit:
+            db.session.commit()
+
+
+    def bulk_create(self, rows: List[dict[str, Any]], commit: bool = True) -> List[ModelType]:
+        """Insert all rows with batched INSERT ... RETURNING in one transaction"""
+        if not rows:
+            return []
+        obj_data = [jsonable_encoder(row) for row in rows]
+        objs = db.session.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            obj_data,
+        ).all()
+        self._check_rounds_open(*objs)
+        self.invalidate_results(*objs)
+        if commit:
+            db.session.commit()
+        return objs
+
+    def bulk_update(self, rows: List[dict[str, Any]], commit: bool = True) -> List[ModelType]:
+        """Partially update rows by primary key with one executemany UPDATE.
+
+        Every row must carry its "id"; like partial_update_by_id, None values
+        are left untouched.
+        """
+        if not rows:
+            return []
+        obj_data = []
+        for row in rows:
+            row = jsonable_encoder(row)
+            obj_data.append({k: v for k, v in row.items() if v is not None or k == "id"})
+        changed = [row for row in obj_data if len(row) > 1]
+        old_rows = []
+        if any(name in row for row in changed for name in _TAG_COLUMNS):
+            old_rows = self._tag_rows(row["id"] for row in changed)
+            self.invalidate_results(*old_rows)
+        if changed:
+            db.session.execute(update(self.model), changed)
+        ids = [row["id"] for row in obj_data]
+        objs = (
+            db.session.query(self.model)
+            .filter(self.model.id.in_(ids))
+            .populate_existing()
+            .all()
+        )
+        self._check_rounds_open(*objs, *old_rows)
+        self.invalidate_results(*objs)
+        if commit:
+            db.session.commit()
+        objs_by_id = {obj.id: obj for obj in objs}
+        return [objs_by_id[id] for id in ids if id in objs_by_id]
+
+    def bulk_delete(self, ids: List[int], commit: bool = True) -> List[int]:
+        """Delete rows by primary key with a single DELETE ... RETURNING id"""
+        if not ids:
+            return []
+        table = self.model.__table__
+        columns = [table.c[name] for name in _TAG_COLUMNS if name in table.c]
+        rows = db.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .returning(self.model.id, *columns)
+            .execution_options(synchronize_session=False)
+        ).mappings().all()
+        deleted = [row["id"] for row in rows]
+        self._check_rounds_open(*rows)
+        self.invalidate_results(*(dict(row) for row in rows))
+        if commit:
+            db.session.commit()
+        return deleted
+
+    def export_statement(self, query: Query, fields: List[str]) -> Select:
+        """Turn a filtered list query into a SELECT of plain columns ordered by id.
+
+        Exports stream tuples instead of ORM objects, so nothing is kept in
+        the identity map while millions of rows go through.
+        """
+        table = self.model.__table__
+        columns = [table.c[name] for name in fields if name in table.c]
+        return query.with_entities(*columns).order_by(None).order_by(self.model.id).statement
+
+    def get_existing_ids(self, ids: Iterable[int]) -> set:
+        ids = set(ids)
+        if not ids:
+            return set()
+        return set(db.session.scalars(select(self.model.id).where(self.model.id.in_(ids))).all())
+
+    def bulk_write(
+        self,
+        creates: List[Tuple[int, dict[str, Any]]],
+        updates: List[Tuple[int, dict[str, Any]]],
+        deletes: List[Tuple[int, int]],
+        errors: List[BulkRowResult],
+        atomic: bool = False,
+    ) -> List[BulkRowResult]:
+        """Write validated (index, row) pairs in one transaction and report per row.
+
+        Rows that failed validation are passed in `errors`. With atomic=True
+        nothing is written as soon as one row is invalid.
+        """
+        if errors and atomic:
+            return _sort_bulk_results(errors)
+        try:
+            created = self.bulk_create([row for _, row in creates], commit=False)
+            # Read before commit, which expires the created objects
+            created_ids = [obj.id for obj in created]
+            self.bulk_update([row for _, row in updates], commit=False)
+            deleted = set(self.bulk_delete([id for _, id in deletes], commit=False))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if isinstance(e, IntegrityError):
+                e = self._unique_error(e)
+            message = getattr(e, "message", None) or str(getattr(e, "orig", e))
+            failed = [
+                BulkRowResult.failed(operation, index, message)
+                for operation, items in (("create", creates), ("update", updates), ("delete", deletes))
+                for index, _ in items
+            ]
+            return _sort_bulk_results(errors + failed)
+
+        results = list(errors)
+        results += [
+            BulkRowResult(operation="create", index=index, success=True, id=id)
+            for (index, _), id in zip(creates, created_ids)
+        ]
+        results += [
+            BulkRowResult(operation="update", index=index, success=True, id=row["id"])
+            for index, row in updates
+        ]
+        results += [
+            BulkRowResult(
+                operation="delete",
+                index=index,
+                success=id in deleted,
+                id=id,
+                message=None if id in deleted else ExceptionType.NOT_FOUND.message,
+            )
+            for index, id in deletes
+        ]
+        return _sort_bulk_results(results)
+
+
+class AsyncBaseService(Generic[ModelType], object):
+    """BaseService twin running on the async engine, for `async def` routes.
+
+    Reads bypass entity_cache; writes invalidate it through the same
+    queued tags as BaseService.
+    """
+
+    entity_tag: Optional[str] = None
+    frozen_on_close: bool = False
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    def invalidate_results(self, *rows: Any) -> None:
+        _queue_tags(
+            async_db.session.sync_session,
+            set().union(*(_row_tags(self.model, row, self.entity_tag) for row in rows)),
+        )
+
+    async def _closed_rounds(self, rounds: Iterable[Optional[str]]) -> List[str]:
+        rounds = {round for round in rounds if round is not None}
+        if not rounds:
+            return []
+        return (
+            await async_db.session.scalars(
+                select(ClosedRounds.round).where(ClosedRounds.round.in_(rounds))
+            )
+        ).all()
+
+    async def _check_rounds_open(self, *rows: Any) -> None:
+        """Async counterpart of BaseService._check_rounds_open"""
+        if not self.frozen_on_close:
+            return
+        closed = await self._closed_rounds(_row_value(row, "round") for row in rows)
+        if closed:
+            await async_db.session.rollback()
+            raise CustomException(
+                exception=ExceptionType.CONFLICT, detail=f"Round {closed[0]} is closed"
+            )
+
+    async def get_by_id(self, id: int) -> ModelType:
+        obj = await async_db.session.get(self.model, id)
+        if obj is None:
+            raise CustomException(exception=ExceptionType.NOT_FOUND)
+        return obj
+
+    async def get_by_id_optional(self, id: int) -> Optional[ModelType]:
+        return await async_db.session.get(self.model, id)
+
+    async def get_all(
+        self, sort_params: Optional[SortParams] = SortParams()
+    ) -> Tuple[List[ModelType], MetadataResponse]:
+        return await paginate_async(
+            model=self.model,
+            session=async_db.session,
+            statement=select(self.model),
+            pagination_params=None,
+            sort_params=sort_params,
+        )
+
+    async def get_by_filter(
+        self,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[ModelType], MetadataResponse]:
+        statement = only_fields(self.model, select(self.model), fields, sort_params)
+        return await paginate_async(
+            model=self.model,
+            session=async_db.session,
+            statement=statement,
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+
+    async def create(self, data: dict[str, Any], commit: bool = True) -> ModelType:
+        obj_data = jsonable_encoder(data)
+        obj = self.model(**obj_data)
+        async_db.session.add(obj)
+        await async_db.session.flush()
+        await self._check_rounds_open(obj)
+        self.invalidate_results(obj)
+        if commit:
+            await async_db.session.commit()
+            await async_db.session.refresh(obj)
+        return obj
+
+    async def _update_returning(
+        self, id: int, values: dict[str, Any], commit: bool = True
+    ) -> ModelType:
+        """Async counterpart of BaseService._update_returning"""
+        if not values:
+            return await self.get_by_id(id)
+        old_rows = []
+        if any(name in values for name in _TAG_COLUMNS):
+            old = await self.get_by_id(id)
+            old_rows = [{name: _row_value(old, name) for name in ("id", *_TAG_COLUMNS)}]
+            self.invalidate_results(*old_rows)
+        obj = (
+            await async_db.session.scalars(
+                update(self.model)
+                .where(self.model.id == id)
+                .values(**values)
+                .returning(self.model)
+                .execution_options(populate_existing=True, synchronize_session=False)
+            )
+        ).first()
+        if obj is None:
+            await async_db.session.rollback()
+            raise CustomException(exception=ExceptionType.NOT_FOUND)
+        await self._check_rounds_open(obj, *old_rows)
+        self.invalidate_results(obj)
+        if commit:
+            await async_db.session.commit()
+        return obj
+
+    async def update_by_id(self, id: int, data: dict[str, Any], commit: bool = True) -> ModelType:
+        return await self._update_returning(
+            id, _column_values(self.model, data, skip_none=False), commit=commit
+        )
+
+    async def partial_update_by_id(
+        self, id: int, data: dict[str, Any], commit: bool = True
+    ) -> ModelType:
+        return await self._update_returning(
+            id, _column_values(self.model, data, skip_none=True), commit=commit
+        )
+
+    async def delete_by_id(self, id: int, commit: bool = True) -> None:
+        obj = await self.get_by_id(id)
+        self.invalidate_results(obj)
+        await async_db.session.delete(obj)
+        await async_db.session.flush()
+        await self._check_rounds_open(obj)
+        if commit:
+            await async_db.session.commit()
@@ -0,0 +1,94 @@
+import time
+from typing import Optional, List, Tuple
+from fastapi_sqlalchemy import db
+from sqlalchemy import select, insert, delete, literal, text, Select
+from app.services.srv_base import BaseService, cached_result
+from app.services import srv_team_scores, srv_member_scores
+from app.models.model_closed_rounds import ClosedRounds
+from app.models.model_round_snapshots import RoundTeamSnapshots, RoundMemberSnapshots
+from app.models.model_team_scores import TeamScores
+from app.models.model_member_scores import MemberScores
+from app.utils.exception_handler import CustomException, ExceptionType
+from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_response import MetadataResponse
+from app.utils.paging import paginate
+
+
+def _insert_snapshot(model, statement: Select) -> int:
+    """INSERT ... FROM SELECT of snapshot rows, returning how many were written"""
+    now = time.time()
+    columns = list(statement.selected_columns.keys()) + ["created_at", "updated_at"]
+    result = db.session.execute(
+        insert(model).from_select(columns, statement.add_columns(literal(now), literal(now)))
+    )
+    return result.rowcount
+
+
+class ClosedRoundsService(BaseService[ClosedRounds]):
+    unique_errors = {
+        "ix_closed_rounds_round": (ExceptionType.ALREADY_EXISTS, "Round is already closed"),
+    }
+    conflict_constraint = "ix_closed_rounds_round"
+
+    def __init__(self):
+        super().__init__(ClosedRounds)
+
+    @cached_result("closed_rounds")
+    def is_closed(self, round: str) -> bool:
+        return bool(self._closed_rounds([round]))
+
+    def get_closed_rounds(
+        self,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+    ) -> Tuple[List[ClosedRounds], MetadataResponse]:
+        return paginate(
+            model=self.model,
+            query=db.session.query(self.model),
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+
+    def get_closed_round(self, round: str) -> ClosedRounds:
+        closed_round = db.session.scalars(
+            select(ClosedRounds).where(ClosedRounds.round == round)
+        ).first()
+        if closed_round is None:
+            raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Round is not closed")
+        return closed_round
+
+    def close_round(self, round: str) -> ClosedRounds:
+        """Freeze the team and member rankings and averages of a round.
+
+        The score tables are locked in SHARE mode first: score writes in
+        flight finish before the snapshot is taken, and later ones wait for
+        the close and are then rejected (see BaseService.frozen_on_close).
+        """
+        db.session.execute(
+            text(f"LOCK TABLE {TeamScores.__tablename__}, {MemberScores.__tablename__} IN SHARE MODE")
+        )
+        row = self._insert_on_conflict({"round": round}, upsert=False)
+        if row is None:
+            db.session.rollback()
+            raise self._conflict_error()
+        team_count = _insert_snapshot(RoundTeamSnapshots, srv_team_scores.snapshot_statement(round))
+        member_count = _insert_snapshot(
+            RoundMemberSnapshots, srv_member_scores.snapshot_statement(round)
+        )
+        if not team_count and not member_count:
+            db.session.rollback()
+            raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Round has no scores")
+        row = self._update_row(row["id"], {"team_count": team_count, "member_count": member_count})
+        return self._attach_returned(row, commit=True)
+
+    def reopen_round(self, round: str) -> None:
+        """Drop the snapshots of a closed round and accept score writes again"""
+        row = db.session.execute(
+            delete(ClosedRounds)
+            .where(ClosedRounds.round == round)
+            .returning(ClosedRounds.id, ClosedRounds.round)
+        ).mappings().first()
+        if row is None:
+            raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Round is not closed")
+        self.invalidate_results(row)
+        db.session.commit()
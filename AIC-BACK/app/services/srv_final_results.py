@@ -0,0 +1,221 @@
+import json
+import time
+from decimal import Decimal
+from typing import Optional, List, Tuple, Dict
+from fastapi_sqlalchemy import db
+from sqlalchemy import select, insert, func, desc, and_, literal, values, column, String, Numeric
+from sqlalchemy.dialects.postgresql import JSONB
+from app.services.srv_base import BaseService, cached_result
+from app.models.model_final_results import FinalResults
+from app.models.model_final_result_versions import FinalResultVersions
+from app.models.model_round_leaderboard import RoundLeaderboard
+from app.models.model_member_scores import MemberScores
+from app.models.model_team_members import TeamMembers
+from app.models.model_teams import Teams
+from app.schemas.sche_final_results import FinalResultsConfig
+from app.utils.exception_handler import CustomException, ExceptionType
+from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_response import MetadataResponse
+from app.utils.paging import paginate
+from app.core.config import settings
+
+_RESULT_COLUMNS = (
+    "version_id",
+    "team_id",
+    "team_name",
+    "rank",
+    "final_score",
+    "team_score",
+    "member_score",
+    "round_scores",
+    "created_at",
+    "updated_at",
+)
+
+
+def _team_rounds():
+    """Average team score of each (team, round), read from round_leaderboard"""
+    return select(
+        RoundLeaderboard.team_id,
+        RoundLeaderboard.round,
+        RoundLeaderboard.avg_score.label("team_avg"),
+    ).where(
+        RoundLeaderboard.avg_score.is_not(None)
+    ).subquery("team_rounds")
+
+
+def _member_rounds():
+    """Average over a team's members of each member's average score in a round"""
+    member_avgs = select(
+        MemberScores.team_member_id,
+        MemberScores.round,
+        func.avg(MemberScores.total_score).label("member_avg"),
+    ).where(
+        MemberScores.total_score.is_not(None)
+    ).group_by(
+        MemberScores.team_member_id, MemberScores.round
+    ).subquery("member_avgs")
+    return select(
+        TeamMembers.team_id,
+        member_avgs.c.round,
+        func.avg(member_avgs.c.member_avg).label("member_avg"),
+    ).join(
+        TeamMembers, TeamMembers.id == member_avgs.c.team_member_id
+    ).group_by(
+        TeamMembers.team_id, member_avgs.c.round
+    ).subquery("member_rounds")
+
+
+def _standings(version_id: int, round_weights: Dict[str, Decimal], member_weight: Decimal):
+    """SELECT of every team's final standing, ready for INSERT ... FROM SELECT.
+
+    Each round's score mixes the team average and the members' average by
+    `member_weight`; a missing part counts as 0. The final score is the
+    `round_weights` weighted sum of the round scores, so teams that did
+    not reach a round get nothing for it. Teams without any score rank last.
+    """
+    weights = values(
+        column("round", String), column("weight", Numeric), name="weights"
+    ).data(list(round_weights.items()))
+    team_rounds = _team_rounds()
+    member_rounds = _member_rounds()
+    rounds = select(
+        func.coalesce(team_rounds.c.team_id, member_rounds.c.team_id).label("team_id"),
+        func.coalesce(team_rounds.c.round, member_rounds.c.round).label("round"),
+        func.coalesce(team_rounds.c.team_avg, 0).label("team_avg"),
+        func.coalesce(member_rounds.c.member_avg, 0).label("member_avg"),
+    ).select_from(
+        team_rounds.outerjoin(
+            member_rounds,
+            and_(
+                member_rounds.c.team_id == team_rounds.c.team_id,
+                member_rounds.c.round == team_rounds.c.round,
+            ),
+            full=True,
+        )
+    ).subquery("rounds")
+
+    team_part = (1 - member_weight) * rounds.c.team_avg
+    member_part = member_weight * rounds.c.member_avg
+    totals = select(
+        rounds.c.team_id,
+        func.sum(weights.c.weight * team_part).label("team_score"),
+        func.sum(weights.c.weight * member_part).label("member_score"),
+        func.jsonb_object_agg(rounds.c.round, func.round(team_part + member_part, 4)).label("round_scores"),
+    ).join(
+        weights, weights.c.round == rounds.c.round
+    ).group_by(
+        rounds.c.team_id
+    ).subquery("totals")
+
+    team_score = func.round(func.coalesce(totals.c.team_score, 0), 4)
+    member_score = func.round(func.coalesce(totals.c.member_score, 0), 4)
+    final_score = team_score + member_score
+    now = time.time()
+    return select(
+        literal(version_id),
+        Teams.id,
+        Teams.team_name,
+        func.rank().over(order_by=desc(final_score)),
+        final_score,
+        team_score,
+        member_score,
+        func.coalesce(totals.c.round_scores, literal({}, JSONB)),
+        literal(now),
+        literal(now),
+    ).select_from(
+        Teams.__table__.outerjoin(totals, totals.c.team_id == Teams.id)
+    )
+
+
+class FinalResultsService(BaseService[FinalResults]):
+    def __init__(self):
+        super().__init__(FinalResults)
+
+    def _round_weights(self, round_weights: Optional[Dict[str, Decimal]]) -> Dict[str, Decimal]:
+        """Weights normalized to sum to 1; every scored round counts equally by default"""
+        weights = round_weights or json.loads(settings.FINAL_ROUND_WEIGHTS)
+        if not weights:
+            rounds = db.session.scalars(
+                select(RoundLeaderboard.round).union(select(MemberScores.round))
+            ).all()
+            weights = {round: 1 for round in rounds if round is not None}
+        weights = {round: Decimal(str(weight)) for round, weight in weights.items()}
+        if any(weight < 0 for weight in weights.values()):
+            raise CustomException(
+                exception=ExceptionType.VALIDATION_ERROR, detail="Round weights must not be negative"
+            )
+        total = sum(weights.values())
+        if total <= 0:
+            raise CustomException(
+                exception=ExceptionType.VALIDATION_ERROR, detail="No round has a positive weight"
+            )
+        return {round: weight / total for round, weight in weights.items()}
+
+    def compute_final_results(self, obj_in: FinalResultsConfig) -> FinalResultVersions:
+        """Compute the final standings of every team into a new snapshot version.
+
+        The whole ranking is one INSERT ... SELECT over round_leaderboard
+        and member_scores; earlier versions are kept for comparison.
+        """
+        member_weight = obj_in.member_weight
+        if member_weight is None:
+            member_weight = Decimal(str(settings.FINAL_MEMBER_WEIGHT))
+        if not 0 <= member_weight <= 1:
+            raise CustomException(
+                exception=ExceptionType.VALIDATION_ERROR, detail="Member weight must be between 0 and 1"
+            )
+        round_weights = self._round_weights(obj_in.round_weights)
+
+        version = FinalResultVersions(
+            round_weights={round: float(weight) for round, weight in round_weights.items()},
+            member_weight=member_weight,
+        )
+        db.session.add(version)
+        db.session.flush()
+        result = db.session.execute(
+            insert(FinalResults).from_select(
+                _RESULT_COLUMNS, _standings(version.id, round_weights, member_weight)
+            )
+        )
+        version.team_count = result.rowcount
+        self.invalidate_results({})
+        db.session.commit()
+        db.session.refresh(version)
+        return version
+
+    def get_versions(
+        self,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+    ) -> Tuple[List[FinalResultVersions], MetadataResponse]:
+        return paginate(
+            model=FinalResultVersions,
+            query=db.session.query(FinalResultVersions),
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+
+    @cached_result("final_results")
+    def get_final_results(
+        self,
+        version_id: Optional[int] = None,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+    ) -> Tuple[List[FinalResults], MetadataResponse]:
+        """Standings of a snapshot (the latest by default) in rank order,
+        read from ix_final_results_version_rank"""
+        if version_id is None:
+            version_id = db.session.scalar(select(func.max(FinalResultVersions.id)))
+            if version_id is None:
+                raise CustomException(
+                    exception=ExceptionType.NOT_FOUND, detail="Final results have not been computed yet"
+                )
+        elif db.session.get(FinalResultVersions, version_id) is None:
+            raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Version not found")
+        query = db.session.query(self.model).filter(FinalResults.version_id == version_id)
+        return paginate(
+            model=self.model,
+            query=query,
+            pagination_params=pagination_params,
+            sort_params=SortParams(sort_by="rank", order="asc"),
+        )
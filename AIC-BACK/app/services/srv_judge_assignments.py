@@ -1,19 +1,28 @@
 from typing import Optional, List, Tuple, Any
 from fastapi_sqlalchemy import db
+from sqlalchemy import tuple_
 from app.services.srv_base import BaseService
 from app.models.model_judge_assignments import JudgeAssignments
-from app.schemas.sche_judge_assignments import JudgeAssignmentsCreate, JudgeAssignmentsUpdate
+from app.schemas.sche_judge_assignments import JudgeAssignmentsCreate, JudgeAssignmentsUpdate, JudgeAssignmentsBulkRequest
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
 from app.utils.paging import paginate
 
 
 class JudgeAssignmentsService(BaseService[JudgeAssignments]):
+    unique_errors = {
+        "uq_judge_assignments_team_judge_round": (
+            ExceptionType.ALREADY_EXISTS,
+            "Assignment for this judge to this team in this round already exists",
+        ),
+    }
+    conflict_constraint = "uq_judge_assignments_team_judge_round"
+
     def __init__(self):
         super().__init__(JudgeAssignments)
 
-    def create_assignment(self, obj_in: JudgeAssignmentsCreate) -> JudgeAssignments:
+    def create_assignment(self, obj_in: JudgeAssignmentsCreate, upsert: bool = False) -> JudgeAssignments:
         # Check if team exists
         from app.services.srv_teams import TeamsService
         teams_service = TeamsService()
@@ -28,41 +37,15 @@ class JudgeAssignmentsService(BaseService[JudgeAssignments]):
         if not judge:
             raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Judge not found")
         
-        # Check if assignment already exists
-        existing_assignment = db.session.query(JudgeAssignments).filter(
-            JudgeAssignments.team_id == obj_in.team_id,
-            JudgeAssignments.judge_id == obj_in.judge_id,
-            JudgeAssignments.round == obj_in.round
-        ).first()
-        
-        if existing_assignment:
-            raise CustomException(
-                exception=ExceptionType.ALREADY_EXISTS, 
-                detail=f"Assignment for judge {obj_in.judge_id} to team {obj_in.team_id} in round {obj_in.round} already exists"
-            )
-        
+        # Duplicates are caught by uq_judge_assignments_team_judge_round;
+        # with upsert the existing assignment is returned as is
         assignment_data = obj_in.dict()
-        return self.create(assignment_data)
+        return self.insert_on_conflict(assignment_data, upsert=upsert)
     
     def update_assignment(self, assignment_id: int, obj_in: JudgeAssignmentsUpdate) -> JudgeAssignments:
-        assignment = self.get_by_id(assignment_id)
-        
+        # Moving to a round the judge already has this team in violates
+        # uq_judge_assignments_team_judge_round
         update_data = obj_in.dict(exclude_unset=True)
-        
-        # If updating round, check if assignment already exists with new round
-        if "round" in update_data and update_data["round"] != assignment.round:
-            existing_assignment = db.session.query(JudgeAssignments).filter(
-                JudgeAssignments.team_id == assignment.team_id,
-                JudgeAssignments.judge_id == assignment.judge_id,
-                JudgeAssignments.round == update_data["round"]
-            ).first()
-            
-            if existing_assignment:
-                raise CustomException(
-                    exception=ExceptionType.ALREADY_EXISTS, 
-                    detail=f"Assignment for judge {assignment.judge_id} to team {assignment.team_id} in round {update_data['round']} already exists"
-                )
-        
         return self.partial_update_by_id(assignment_id, update_data)
     
     def get_judge_assignments(
@@ -117,3 +100,75 @@ class JudgeAssignmentsService(BaseService[JudgeAssignments]):
             pagination_params=pagination_params,
             sort_params=sort_params,
         )
+
+
+    def bulk_assignments(self, obj_in: JudgeAssignmentsBulkRequest, atomic: bool = False) -> List[BulkRowResult]:
+        """Create, update and delete judge assignments in one transaction with per-row results"""
+        from app.services.srv_teams import TeamsService
+        from app.services.srv_judges import JudgesService
+        errors, creates, updates, deletes = [], [], [], []
+
+        existing_teams = TeamsService().get_existing_ids(row.team_id for row in obj_in.create)
+        existing_judges = JudgesService().get_existing_ids(row.judge_id for row in obj_in.create)
+        current = {
+            assignment.id: assignment
+            for assignment in db.session.query(JudgeAssignments).filter(
+                JudgeAssignments.id.in_([row.id for row in obj_in.update] + obj_in.delete)
+            ).all()
+        } if obj_in.update or obj_in.delete else {}
+        pairs = {(row.team_id, row.judge_id) for row in obj_in.create}
+        pairs |= {(a.team_id, a.judge_id) for a in current.values()}
+        taken = {
+            (team_id, judge_id, round): id
+            for id, team_id, judge_id, round in db.session.query(
+                JudgeAssignments.id,
+                JudgeAssignments.team_id,
+                JudgeAssignments.judge_id,
+                JudgeAssignments.round
+            ).filter(
+                tuple_(JudgeAssignments.team_id, JudgeAssignments.judge_id).in_(pairs)
+            ).all()
+        } if pairs else {}
+
+        for index, row in enumerate(obj_in.create):
+            if row.team_id not in existing_teams:
+                errors.append(BulkRowResult.failed("create", index, "Team not found"))
+                continue
+            if row.judge_id not in existing_judges:
+                errors.append(BulkRowResult.failed("create", index, "Judge not found"))
+                continue
+            key = (row.team_id, row.judge_id, row.round)
+            if key in taken:
+                errors.append(BulkRowResult.failed(
+                    "create", index,
+                    f"Assignment for judge {row.judge_id} to team {row.team_id} in round {row.round} already exists"
+                ))
+                continue
+            taken[key] = None
+            creates.append((index, row.dict()))
+
+        for index, row in enumerate(obj_in.update):
+            assignment = current.get(row.id)
+            if assignment is None:
+                errors.append(BulkRowResult.failed("update", index, "Assignment not found", row.id))
+                continue
+            update_data = row.dict(exclude_unset=True)
+            if "round" in update_data and update_data["round"] != assignment.round:
+                key = (assignment.team_id, assignment.judge_id, update_data["round"])
+                if key in taken:
+                    errors.append(BulkRowResult.failed(
+                        "update", index,
+                        f"Assignment for judge {assignment.judge_id} to team {assignment.team_id} in round {update_data['round']} already exists",
+                        row.id
+                    ))
+                    continue
+                taken[key] = row.id
+            updates.append((index, update_data))
+
+        for index, assignment_id in enumerate(obj_in.delete):
+            if assignment_id not in current:
+                errors.append(BulkRowResult.failed("delete", index, "Assignment not found", assignment_id))
+                continue
+            deletes.append((index, assignment_id))
+
+        return self.bulk_write(creates, updates, deletes, errors, atomic=atomic)
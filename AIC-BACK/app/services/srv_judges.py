@@ -1,31 +1,33 @@
 from typing import Optional, List, Tuple, Any
 from fastapi_sqlalchemy import db
-from sqlalchemy import or_
-from app.services.srv_base import BaseService
+from sqlalchemy import or_, Select
+from sqlalchemy.orm import Query
+from app.services.srv_base import BaseService, cached_result
 from app.models.model_judges import Judges
-from app.schemas.sche_judges import JudgesCreate, JudgesUpdate
+from app.schemas.sche_judges import JudgesCreate, JudgesUpdate, JudgesBulkRequest
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
 from app.utils.paging import paginate
+from app.utils.fields import only_fields, include_relations
 from app.core.security import get_password_hash, verify_password
 
 
 class JudgesService(BaseService[Judges]):
+    unique_errors = {
+        "ix_judges_username": (ExceptionType.ALREADY_EXISTS, "Username already exists"),
+        "ix_judges_email": (ExceptionType.ALREADY_EXISTS, "Email already exists"),
+    }
+    conflict_constraint = "ix_judges_username"
+
     def __init__(self):
         super().__init__(Judges)
 
     def create_judge(self, obj_in: JudgesCreate) -> Judges:
-        # Check if username already exists
-        existing_judge = db.session.query(Judges).filter(Judges.username == obj_in.username).first()
-        if existing_judge:
-            raise CustomException(exception=ExceptionType.ALREADY_EXISTS, detail="Username already exists")
-        
-        # Check if email already exists
-        existing_email = db.session.query(Judges).filter(Judges.email == obj_in.email).first()
-        if existing_email:
-            raise CustomException(exception=ExceptionType.ALREADY_EXISTS, detail="Email already exists")
-        
+        # Duplicate usernames and emails are rejected by the unique indexes.
+        # There is no upsert: it would let anyone reset a judge's password
+        # or role by username
+
         # Create judge with hashed password
         judge_data = obj_in.dict()
         password = judge_data.pop("password")
@@ -35,29 +37,12 @@ class JudgesService(BaseService[Judges]):
         if "role" not in judge_data or not judge_data["role"]:
             judge_data["role"] = "judge"
         
-        return self.create(judge_data)
+        return self.insert_on_conflict(judge_data)
     
     def update_judge(self, judge_id: int, obj_in: JudgesUpdate) -> Judges:
-        judge = self.get_by_id(judge_id)
-        
+        # Taken usernames and emails are rejected by the unique indexes
         update_data = obj_in.dict(exclude_unset=True)
         
-        # Check if updating to an existing username
-        if "username" in update_data and update_data["username"] != judge.username:
-            existing_judge = db.session.query(Judges).filter(
-                Judges.username == update_data["username"]
-            ).first()
-            if existing_judge:
-                raise CustomException(exception=ExceptionType.ALREADY_EXISTS, detail="Username already exists")
-        
-        # Check if updating to an existing email
-        if "email" in update_data and update_data["email"] != judge.email:
-            existing_email = db.session.query(Judges).filter(
-                Judges.email == update_data["email"]
-            ).first()
-            if existing_email:
-                raise CustomException(exception=ExceptionType.ALREADY_EXISTS, detail="Email already exists")
-        
         # Handle password update separately
         if "password" in update_data:
             password = update_data.pop("password")
@@ -81,13 +66,11 @@ class JudgesService(BaseService[Judges]):
             return None
         return judge
     
-    def search_judges(
+    def _search_query(
         self,
         search_term: Optional[str] = None,
         role: Optional[str] = None,
-        pagination_params: Optional[PaginationParams] = PaginationParams(),
-        sort_params: Optional[SortParams] = SortParams(),
-    ) -> Tuple[List[Judges], MetadataResponse]:
+    ) -> Query:
         query = db.session.query(self.model)
         
         if search_term:
@@ -108,7 +91,20 @@ class JudgesService(BaseService[Judges]):
                     detail="Invalid role filter. Must be either 'admin' or 'judge'"
                 )
             query = query.filter(Judges.role == role)
-        
+        return query
+
+    def search_judges(
+        self,
+        search_term: Optional[str] = None,
+        role: Optional[str] = None,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+        fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Tuple[List[Judges], MetadataResponse]:
+        query = self._search_query(search_term, role)
+        query = only_fields(self.model, query, fields, sort_params)
+        query = include_relations(self.model, query, include)
         return paginate(
             model=self.model,
             query=query,
@@ -116,10 +112,81 @@ class JudgesService(BaseService[Judges]):
             sort_params=sort_params,
         )
     
+    def export_judges(
+        self,
+        search_term: Optional[str] = None,
+        role: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Select:
+        """Same filters as search_judges, as a plain column SELECT for streaming exports"""
+        return self.export_statement(self._search_query(search_term, role), fields)
+
+    @cached_result("judges")
     def get_admins(self) -> List[Judges]:
         """Get all admin judges"""
         return db.session.query(Judges).filter(Judges.role == "admin").all()
     
+    @cached_result("judges")
     def get_regular_judges(self) -> List[Judges]:
         """Get all regular judges"""
-        return db.session.query(Judges).filter(Judges.role == "judge").all()
\ No newline at end of file
+        return db.session.query(Judges).filter(Judges.role == "judge").all()
+
+
+    def bulk_judges(self, obj_in: JudgesBulkRequest, atomic: bool = False) -> List[BulkRowResult]:
+        """Create, update and delete judges in one transaction with per-row results"""
+        errors, creates, updates, deletes = [], [], [], []
+
+        usernames = {row.username for row in obj_in.create}
+        usernames |= {row.username for row in obj_in.update if row.username}
+        emails = {row.email for row in obj_in.create}
+        emails |= {row.email for row in obj_in.update if row.email}
+        taken_usernames = dict(
+            db.session.query(Judges.username, Judges.id).filter(Judges.username.in_(usernames)).all()
+        ) if usernames else {}
+        taken_emails = dict(
+            db.session.query(Judges.email, Judges.id).filter(Judges.email.in_(emails)).all()
+        ) if emails else {}
+        existing_ids = self.get_existing_ids([row.id for row in obj_in.update] + obj_in.delete)
+
+        for index, row in enumerate(obj_in.create):
+            if row.username in taken_usernames:
+                errors.append(BulkRowResult.failed("create", index, "Username already exists"))
+                continue
+            if row.email in taken_emails:
+                errors.append(BulkRowResult.failed("create", index, "Email already exists"))
+                continue
+            taken_usernames[row.username] = None
+            taken_emails[row.email] = None
+            judge_data = row.dict()
+            judge_data["password_hash"] = get_password_hash(judge_data.pop("password"))
+            if not judge_data.get("role"):
+                judge_data["role"] = "judge"
+            creates.append((index, judge_data))
+
+        for index, row in enumerate(obj_in.update):
+            if row.id not in existing_ids:
+                errors.append(BulkRowResult.failed("update", index, "Judge not found", row.id))
+                continue
+            update_data = row.dict(exclude_unset=True)
+            if "username" in update_data and taken_usernames.get(update_data["username"], row.id) != row.id:
+                errors.append(BulkRowResult.failed("update", index, "Username already exists", row.id))
+                continue
+            if "email" in update_data and taken_emails.get(update_data["email"], row.id) != row.id:
+                errors.append(BulkRowResult.failed("update", index, "Email already exists", row.id))
+                continue
+            if "username" in update_data:
+                taken_usernames[update_data["username"]] = row.id
+            if "email" in update_data:
+                taken_emails[update_data["email"]] = row.id
+            if "password" in update_data:
+                update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+            update_data["id"] = row.id
+            updates.append((index, update_data))
+
+        for index, judge_id in enumerate(obj_in.delete):
+            if judge_id not in existing_ids:
+                errors.append(BulkRowResult.failed("delete", index, "Judge not found", judge_id))
+                continue
+            deletes.append((index, judge_id))
+
+        return self.bulk_write(creates, updates, deletes, errors, atomic=atomic)
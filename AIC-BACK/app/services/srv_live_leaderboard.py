@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.core.database import async_db
+from app.core.notifications import pg_listener
+from app.services.srv_round_leaderboard import AsyncRoundLeaderboardService
+
+logger = logging.getLogger(__name__)
+
+# Events kept per subscriber before it is considered too slow and resynced
+_QUEUE_SIZE = 32
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+def ranking_diff(previous: List[dict], current: List[dict]) -> Optional[dict]:
+    """Rows of `current` that are new or changed, and team ids that left the board"""
+    before = {row["team_id"]: row for row in previous}
+    after = {row["team_id"]: row for row in current}
+    changed = [row for row in current if before.get(row["team_id"]) != row]
+    removed = [team_id for team_id in before if team_id not in after]
+    if not changed and not removed:
+        return None
+    return {"changed": changed, "removed": removed}
+
+
+class LiveLeaderboard:
+    """Per-process fan-out of round rankings to Server-Sent Events streams.
+
+    Score writes NOTIFY the round on LEADERBOARD_CHANNEL when they commit.
+    Every worker hears them on its pg_listener connection; the first
+    notification for a round schedules a recompute LIVE_LEADERBOARD_DEBOUNCE_MS later, and the
+    notifications arriving in between are absorbed by it, so a burst of
+    judge submissions costs one query and one broadcast per worker.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._rankings: Dict[str, List[dict]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._leaderboard = AsyncRoundLeaderboardService()
+        pg_listener.subscribe(settings.LEADERBOARD_CHANNEL, self._on_notify, on_connect=self._resync)
+
+    async def _compute(self, round: str) -> List[dict]:
+        async with async_db():
+            return await self._leaderboard.get_round_rankings(
+                round, settings.LIVE_LEADERBOARD_SIZE
+            )
+
+    def _lock(self, round: str) -> asyncio.Lock:
+        return self._locks.setdefault(round, asyncio.Lock())
+
+    def _resync(self) -> None:
+        # Rankings may have moved while no connection was listening
+        for round in list(self._subscribers):
+            self._schedule(round)
+
+    def _on_notify(self, round: str) -> None:
+        if round in self._subscribers:
+            self._schedule(round)
+
+    def _schedule(self, round: str) -> None:
+        if round not in self._pending:
+            self._pending.add(round)
+            task = asyncio.create_task(self._recompute_later(round))
+            # The event loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _recompute_later(self, round: str) -> None:
+        await asyncio.sleep(settings.LIVE_LEADERBOARD_DEBOUNCE_MS / 1000)
+        # Notifications from now on need a new recompute
+        self._pending.discard(round)
+        try:
+            async with self._lock(round):
+                if round not in self._subscribers:
+                    return
+                rankings = await self._compute(round)
+                diff = ranking_diff(self._rankings.get(round, []), rankings)
+                self._rankings[round] = rankings
+                if diff is not None:
+                    self._broadcast(round, _sse("diff", {"round": round, **diff}))
+        except Exception:
+            logger.exception("Leaderboard recompute failed for round %s", round)
+
+    def _broadcast(self, round: str, message: str) -> None:
+        for queue in self._subscribers.get(round, ()):
+            if queue.full():
+                # Too slow to follow the diffs: start it over from a snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(
+                    _sse("snapshot", {"round": round, "rankings": self._rankings[round]})
+                )
+            else:
+                queue.put_nowait(message)
+
+    async def _subscribe(self, round: str) -> asyncio.Queue:
+        pg_listener.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        async with self._lock(round):
+            if round not in self._rankings:
+                self._rankings[round] = await self._compute(round)
+            self._subscribers.setdefault(round, set()).add(queue)
+            queue.put_nowait(_sse("snapshot", {"round": round, "rankings": self._rankings[round]}))
+        return queue
+
+    def _unsubscribe(self, round: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(round)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[round]
+            self._rankings.pop(round, None)
+
+    async def stream(self, round: str) -> AsyncIterator[str]:
+        """SSE body: a snapshot event, then a diff event per recompute that changed the board"""
+        queue = await self._subscribe(round)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(
+                        queue.get(), timeout=settings.LIVE_LEADERBOARD_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line, keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+        finally:
+            self._unsubscribe(round, queue)
+
+
+live_leaderboard = LiveLeaderboard()
@@ -1,21 +1,241 @@
+import functools
+import operator
 from typing import Optional, List, Tuple, Any
 from fastapi_sqlalchemy import db
-from sqlalchemy import func, desc
-from app.services.srv_base import BaseService
+from sqlalchemy import func, desc, select, Select, tuple_, case, literal
+from app.services.srv_base import BaseService, cached_result
 from app.models.model_member_scores import MemberScores
-from app.schemas.sche_member_scores import MemberScoresCreate, MemberScoresUpdate
+from app.schemas.sche_member_scores import MemberScoresCreate, MemberScoresUpdate, MemberScoresBatchRequest
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
-from app.utils.paging import paginate
+from app.utils.paging import (
+    paginate,
+    paginate_grouped,
+    encode_cursor,
+    decode_cursor,
+)
+from app.models.model_team_members import TeamMembers
+from app.models.model_round_snapshots import RoundMemberSnapshots
 from decimal import Decimal
 
 
+# (column, maximum, label) of each scoring criterion
+_SCORE_RANGES = (
+    ("skills_learning", 50, "Skills learning"),
+    ("inspiration", 50, "Inspiration"),
+)
+
+
+def _score_range_error(data: dict) -> Optional[str]:
+    """Message for the first criterion of `data` out of its range, if any"""
+    for name, maximum, label in _SCORE_RANGES:
+        value = data.get(name)
+        if value is not None and (value < 0 or value > maximum):
+            return f"{label} score must be between 0 and {maximum}"
+    return None
+
+
+def _with_total(score_data: dict) -> dict:
+    """Fill in total_score from the criteria when it is not provided"""
+    if not score_data.get("total_score"):
+        score_data["total_score"] = sum(score_data[name] for name, _, _ in _SCORE_RANGES)
+    return score_data
+
+
+def _total_update(table, update_data: dict):
+    """total_score SET expression of an update: the sent criteria plus the stored ones.
+
+    Computed by the UPDATE itself, so it adds up the row as it is, not a
+    copy read earlier.
+    """
+    terms = [
+        table.c[name] if update_data.get(name) is None else update_data[name]
+        for name, _, _ in _SCORE_RANGES
+    ]
+    return functools.reduce(operator.add, terms)
+
+
+def _round_averages(round: str):
+    """Per-team member averages of every criterion in a round, as one GROUP BY subquery"""
+    return select(
+        MemberScores.team_member_id,
+        *(
+            func.avg(getattr(MemberScores, name)).label(f"avg_{name}")
+            for name in ("skills_learning", "inspiration", "total_score")
+        ),
+        func.count(MemberScores.id).label("judge_count"),
+    ).where(
+        MemberScores.round == round
+    ).group_by(
+        MemberScores.team_member_id
+    ).subquery("averages")
+
+
+def _live_rankings(round: str):
+    """Member rankings of an open round with every breakdown as a window function.
+
+    rank / dense_rank are computed over the round, batch_rank within the
+    member's student_batch and class_rank within its class; ties share a rank.
+    """
+    averages = select(
+        MemberScores.round,
+        MemberScores.team_member_id,
+        func.avg(MemberScores.total_score).label("average_score"),
+        func.count(MemberScores.id).label("judge_count"),
+    ).where(
+        MemberScores.round == round,
+        MemberScores.total_score.is_not(None),
+    ).group_by(
+        MemberScores.round, MemberScores.team_member_id
+    ).subquery("averages")
+
+    score_order = desc(averages.c.average_score)
+    return select(
+        averages.c.team_member_id,
+        TeamMembers.full_name,
+        TeamMembers.team_id,
+        TeamMembers.student_batch,
+        TeamMembers.class_code,
+        averages.c.average_score,
+        averages.c.judge_count,
+        func.rank().over(partition_by=averages.c.round, order_by=score_order).label("rank"),
+        func.dense_rank().over(partition_by=averages.c.round, order_by=score_order).label("dense_rank"),
+        func.rank().over(
+            partition_by=(averages.c.round, TeamMembers.student_batch), order_by=score_order
+        ).label("batch_rank"),
+        func.rank().over(
+            partition_by=(averages.c.round, TeamMembers.student_batch, TeamMembers.class_code),
+            order_by=score_order,
+        ).label("class_rank"),
+    ).join(
+        TeamMembers, TeamMembers.id == averages.c.team_member_id
+    ).subquery("rankings")
+
+
+def _snapshot_rankings(round: str):
+    """Member rankings of a closed round, read from round_member_snapshots"""
+    return select(
+        RoundMemberSnapshots.team_member_id,
+        RoundMemberSnapshots.full_name,
+        RoundMemberSnapshots.team_id,
+        RoundMemberSnapshots.student_batch,
+        RoundMemberSnapshots.class_code,
+        RoundMemberSnapshots.avg_total_score.label("average_score"),
+        RoundMemberSnapshots.judge_count,
+        RoundMemberSnapshots.rank,
+        RoundMemberSnapshots.dense_rank,
+        RoundMemberSnapshots.batch_rank,
+        RoundMemberSnapshots.class_rank,
+    ).where(
+        RoundMemberSnapshots.round == round,
+        RoundMemberSnapshots.rank.is_not(None),
+    ).subquery("rankings")
+
+
+def _snapshot_averages(round: str):
+    """Same columns as _round_averages, read from round_member_snapshots"""
+    return select(
+        RoundMemberSnapshots.team_member_id,
+        RoundMemberSnapshots.avg_skills_learning,
+        RoundMemberSnapshots.avg_inspiration,
+        RoundMemberSnapshots.avg_total_score,
+        RoundMemberSnapshots.judge_count,
+    ).where(
+        RoundMemberSnapshots.round == round
+    ).subquery("averages")
+
+
+def snapshot_statement(round: str) -> Select:
+    """SELECT of the round_member_snapshots rows of `round`, for INSERT ... FROM SELECT.
+
+    Uses the same averages and window functions as the open round; members
+    without any total score get no rank.
+    """
+    averages = _round_averages(round)
+    score = averages.c.avg_total_score
+    score_order = desc(score).nulls_last()
+
+    def ranked(window, *partition_by):
+        return case(
+            (score.is_(None), None),
+            else_=window.over(partition_by=partition_by or None, order_by=score_order),
+        )
+
+    return select(
+        literal(round).label("round"),
+        averages.c.team_member_id,
+        TeamMembers.full_name,
+        TeamMembers.team_id,
+        TeamMembers.student_batch,
+        TeamMembers.class_code,
+        ranked(func.rank()).label("rank"),
+        ranked(func.dense_rank()).label("dense_rank"),
+        ranked(func.rank(), TeamMembers.student_batch).label("batch_rank"),
+        ranked(func.rank(), TeamMembers.student_batch, TeamMembers.class_code).label("class_rank"),
+        averages.c.avg_skills_learning,
+        averages.c.avg_inspiration,
+        score,
+        averages.c.judge_count,
+    ).join(
+        TeamMembers, TeamMembers.id == averages.c.team_member_id
+    )
+
+
+def _member_rankings(
+    ranked,
+    limit: int,
+    cursor: Optional[str],
+    student_batch: Optional[str],
+    class_code: Optional[str],
+) -> Select:
+    """One page of the `ranked` member rankings.
+
+    The ranks are computed before the batch/class filters and the keyset
+    seek apply, so they stay the same from page to page. Pages are ordered
+    by (rank, team_member_id).
+    """
+    statement = select(ranked)
+    if student_batch:
+        statement = statement.where(ranked.c.student_batch == student_batch)
+    if class_code:
+        statement = statement.where(ranked.c.class_code == class_code)
+    if cursor:
+        position = decode_cursor(cursor, "rank", "asc")
+        statement = statement.where(
+            tuple_(ranked.c.rank, ranked.c.team_member_id) > tuple_(position["v"], position["id"])
+        )
+    # One extra row tells whether there is a next page
+    return statement.order_by(ranked.c.rank, ranked.c.team_member_id).limit(limit + 1)
+
+
+def _rankings_page(rows: List[Any], limit: int) -> Tuple[List[dict], MetadataResponse]:
+    data = [dict(row) for row in rows[:limit]]
+    has_next = len(rows) > limit
+    next_cursor = None
+    if has_next:
+        last = data[-1]
+        next_cursor = encode_cursor("rank", "asc", last["rank"], last["team_member_id"])
+    return data, MetadataResponse(
+        page=1, page_size=limit, has_next=has_next, next_cursor=next_cursor
+    )
+
+
 class MemberScoresService(BaseService[MemberScores]):
+    unique_errors = {
+        "uq_member_scores_member_judge_round": (
+            ExceptionType.ALREADY_EXISTS,
+            "Score for this team member by this judge in this round already exists",
+        ),
+    }
+    conflict_constraint = "uq_member_scores_member_judge_round"
+
+    frozen_on_close = True
+
     def __init__(self):
         super().__init__(MemberScores)
 
-    def create_member_score(self, obj_in: MemberScoresCreate) -> MemberScores:
+    def create_member_score(self, obj_in: MemberScoresCreate, upsert: bool = False) -> MemberScores:
         # Check if team member exists
         from app.services.srv_team_members import TeamMembersService
         team_members_service = TeamMembersService()
@@ -30,67 +250,73 @@ class MemberScoresService(BaseService[MemberScores]):
         if not judge:
             raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Judge not found")
         
-        # Check if score already exists for this team member, judge, and round
-        existing_score = db.session.query(MemberScores).filter(
-            MemberScores.team_member_id == obj_in.team_member_id,
-            MemberScores.judge_id == obj_in.judge_id,
-            MemberScores.round == obj_in.round
-        ).first()
-        
-        if existing_score:
-            raise CustomException(
-                exception=ExceptionType.ALREADY_EXISTS, 
-                detail=f"Score for team member {obj_in.team_member_id} by judge {obj_in.judge_id} in round {obj_in.round} already exists"
-            )
-        
         # Validate score ranges
-        if obj_in.skills_learning < 0 or obj_in.skills_learning > 50:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="Skills learning score must be between 0 and 50"
-            )
-        
-        if obj_in.inspiration < 0 or obj_in.inspiration > 50:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="Inspiration score must be between 0 and 50"
-            )
-        
-        # Calculate total score if not provided
-        score_data = obj_in.dict()
-        if not score_data.get("total_score"):
-            total = score_data["skills_learning"] + score_data["inspiration"]
-            score_data["total_score"] = total
+        error = _score_range_error(obj_in.dict())
+        if error:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=error)
         
-        return self.create(score_data)
+        # Calculate total score if not provided; duplicates are caught by
+        # uq_member_scores_member_judge_round
+        return self.insert_on_conflict(_with_total(obj_in.dict()), upsert=upsert)
+
+    def _existing_keys(self, keys: set) -> set:
+        """(team_member_id, judge_id, round) of `keys` that already have a score"""
+        if not keys:
+            return set()
+        return set(
+            db.session.execute(
+                select(MemberScores.team_member_id, MemberScores.judge_id, MemberScores.round).where(
+                    tuple_(MemberScores.team_member_id, MemberScores.judge_id, MemberScores.round).in_(keys)
+                )
+            ).tuples().all()
+        )
+
+    def batch_member_scores(
+        self, obj_in: MemberScoresBatchRequest, atomic: bool = False
+    ) -> List[BulkRowResult]:
+        """Create a judge's member scoring sheet in one transaction, see
+        TeamScoresService.batch_team_scores"""
+        from app.services.srv_team_members import TeamMembersService
+        from app.services.srv_judges import JudgesService
+
+        rows = obj_in.scores
+        member_ids = TeamMembersService().get_existing_ids(row.team_member_id for row in rows)
+        judge_ids = JudgesService().get_existing_ids(row.judge_id for row in rows)
+        taken = self._existing_keys({(row.team_member_id, row.judge_id, row.round) for row in rows})
+
+        errors, creates = [], []
+        for index, row in enumerate(rows):
+            key = (row.team_member_id, row.judge_id, row.round)
+            score_data = row.dict()
+            if row.team_member_id not in member_ids:
+                error = "Team member not found"
+            elif row.judge_id not in judge_ids:
+                error = "Judge not found"
+            elif key in taken:
+                error = f"Score for team member {row.team_member_id} by judge {row.judge_id} in round {row.round} already exists"
+            else:
+                error = _score_range_error(score_data)
+            if error:
+                errors.append(BulkRowResult.failed("create", index, error))
+                continue
+            taken.add(key)
+            creates.append((index, _with_total(score_data)))
+
+        return self.bulk_write(creates, [], [], errors, atomic=atomic)
     
     def update_member_score(self, score_id: int, obj_in: MemberScoresUpdate) -> MemberScores:
-        score = self.get_by_id(score_id)
-        
         update_data = obj_in.dict(exclude_unset=True)
         
         # Validate score ranges if provided
-        if "skills_learning" in update_data:
-            if update_data["skills_learning"] < 0 or update_data["skills_learning"] > 50:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Skills learning score must be between 0 and 50"
-                )
-        
-        if "inspiration" in update_data:
-            if update_data["inspiration"] < 0 or update_data["inspiration"] > 50:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Inspiration score must be between 0 and 50"
-                )
+        error = _score_range_error(update_data)
+        if error:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=error)
         
         # Recalculate total score if any component is updated
-        if any(key in update_data for key in ["skills_learning", "inspiration"]):
-            skills_learning = update_data.get("skills_learning", score.skills_learning)
-            inspiration = update_data.get("inspiration", score.inspiration)
-            
-            total = skills_learning + inspiration
-            update_data["total_score"] = total
+        if any(update_data.get(name) is not None for name, _, _ in _SCORE_RANGES):
+            values = {name: value for name, value in update_data.items() if value is not None}
+            values["total_score"] = _total_update(self.model.__table__, update_data)
+            return self._update_returning(score_id, values)
         
         return self.partial_update_by_id(score_id, update_data)
     
@@ -132,6 +358,23 @@ class MemberScoresService(BaseService[MemberScores]):
             sort_params=sort_params,
         )
     
+    def export_scores(
+        self,
+        team_member_id: Optional[int] = None,
+        judge_id: Optional[int] = None,
+        round: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Select:
+        """Same filters as get_member_scores/get_judge_member_scores, for streaming exports"""
+        query = db.session.query(self.model)
+        if team_member_id:
+            query = query.filter(MemberScores.team_member_id == team_member_id)
+        if judge_id:
+            query = query.filter(MemberScores.judge_id == judge_id)
+        if round:
+            query = query.filter(MemberScores.round == round)
+        return self.export_statement(query, fields)
+    
     def get_member_average_scores(self, team_member_id: int, round: str) -> dict:
         """Get average scores for a team member in a specific round"""
         result = db.session.query(
@@ -159,32 +402,44 @@ class MemberScoresService(BaseService[MemberScores]):
             "judge_count": result.judge_count
         }
     
-    def get_team_member_rankings(self, round: str, limit: int = 10) -> List[dict]:
-        """Get team member rankings for a specific round based on average total score"""
-        subquery = db.session.query(
-            MemberScores.team_member_id,
-            func.avg(MemberScores.total_score).label("avg_score")
-        ).filter(
-            MemberScores.round == round
-        ).group_by(
-            MemberScores.team_member_id
-        ).subquery()
-        
-        query = db.session.query(
-            subquery.c.team_member_id,
-            subquery.c.avg_score
-        ).order_by(
-            desc(subquery.c.avg_score)
-        ).limit(limit)
-        
-        results = query.all()
-        
-        rankings = []
-        for rank, (team_member_id, avg_score) in enumerate(results, 1):
-            rankings.append({
-                "rank": rank,
-                "team_member_id": team_member_id,
-                "average_score": avg_score
-            })
-        
-        return rankings
+    @cached_result("round:{round}")
+    def get_round_average_scores(
+        self,
+        round: str,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+    ) -> Tuple[List[dict], MetadataResponse]:
+        """Average scores of every team member in a round, sortable by any average or judge_count.
+
+        A closed round is read from its snapshot.
+        """
+        closed = self._closed_rounds([round])
+        averages = _snapshot_averages(round) if closed else _round_averages(round)
+        return paginate_grouped(
+            model=self.model,
+            query=db.session.query(averages),
+            columns=averages.c,
+            key="team_member_id",
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+
+    @cached_result("round:{round}", "team_members")
+    def get_team_member_rankings(
+        self,
+        round: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        student_batch: Optional[str] = None,
+        class_code: Optional[str] = None,
+    ) -> Tuple[List[dict], MetadataResponse]:
+        """Team member rankings for a round by average total score, with
+        per-batch and per-class ranks, one keyset page at a time.
+
+        A closed round is read from its snapshot.
+        """
+        ranked = _snapshot_rankings(round) if self._closed_rounds([round]) else _live_rankings(round)
+        rows = db.session.execute(
+            _member_rankings(ranked, limit, cursor, student_batch, class_code)
+        ).mappings().all()
+        return _rankings_page(rows, limit)
@@ -0,0 +1,113 @@
+from decimal import Decimal
+from typing import Optional, List, Any, Iterable, Tuple
+from fastapi_sqlalchemy import db
+from sqlalchemy import select, desc, func
+from sqlalchemy.dialects.postgresql import insert
+from app.services.srv_base import BaseService, AsyncBaseService
+from app.models.model_round_leaderboard import RoundLeaderboard
+from app.core.config import settings
+from app.core.database import async_db
+
+
+def score_key(score: Any) -> Optional[tuple]:
+    """(round, team_id, total_score) of a team score, or None if it does not rank"""
+    if isinstance(score, dict):
+        round, team_id, total = score.get("round"), score.get("team_id"), score.get("total_score")
+    else:
+        round, team_id, total = score.round, score.team_id, score.total_score
+    if round is None or team_id is None or total is None:
+        return None
+    return round, team_id, Decimal(str(total))
+
+
+def _move_statements(moves: Iterable[Tuple[Optional[tuple], Optional[tuple]]]) -> list:
+    """One multi-row upsert applying every (old, new) score move, and the
+    pg_notify() of each round it touched (either key may be None).
+
+    NOTIFY is transactional: listeners (see srv_live_leaderboard) only hear
+    about it once the score write commits, and never if it rolls back.
+    """
+    deltas = {}
+    for old, new in moves:
+        for key, sign in ((old, -1), (new, 1)):
+            if key is None:
+                continue
+            round, team_id, total = key
+            score_sum, score_count = deltas.get((round, team_id), (Decimal(0), 0))
+            deltas[(round, team_id)] = (score_sum + sign * total, score_count + sign)
+
+    rows = [
+        {
+            "round": round,
+            "team_id": team_id,
+            "score_sum": score_sum,
+            "score_count": score_count,
+            "avg_score": score_sum / score_count if score_count > 0 else None,
+        }
+        for (round, team_id), (score_sum, score_count) in deltas.items()
+        if score_sum or score_count
+    ]
+    if not rows:
+        return []
+
+    statement = insert(RoundLeaderboard).values(rows)
+    table = RoundLeaderboard.__table__
+    new_sum = table.c.score_sum + statement.excluded.score_sum
+    new_count = table.c.score_count + statement.excluded.score_count
+    statement = statement.on_conflict_do_update(
+        constraint="uq_round_leaderboard_round_team",
+        set_={
+            "score_sum": new_sum,
+            "score_count": new_count,
+            "avg_score": new_sum / func.nullif(new_count, 0),
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    rounds = sorted({row["round"] for row in rows})
+    return [statement] + [
+        select(func.pg_notify(settings.LEADERBOARD_CHANNEL, round)) for round in rounds
+    ]
+
+
+def _top_statement(round: str, limit: int):
+    return (
+        select(RoundLeaderboard.team_id, RoundLeaderboard.avg_score, RoundLeaderboard.score_count)
+        .where(RoundLeaderboard.round == round, RoundLeaderboard.avg_score.is_not(None))
+        .order_by(desc(RoundLeaderboard.avg_score), RoundLeaderboard.team_id)
+        .limit(limit)
+    )
+
+
+def _rankings(results) -> List[dict]:
+    return [
+        {"rank": rank, "team_id": team_id, "average_score": avg_score, "judge_count": count}
+        for rank, (team_id, avg_score, count) in enumerate(results, 1)
+    ]
+
+
+class RoundLeaderboardService(BaseService[RoundLeaderboard]):
+    def __init__(self):
+        super().__init__(RoundLeaderboard)
+
+    def move_score(self, old: Optional[tuple], new: Optional[tuple]) -> None:
+        """Apply a score change to the leaderboard inside the caller's transaction.
+
+        `old` and `new` are score_key() values of the row before and after
+        the write; None for a created or deleted score.
+        """
+        self.move_scores([(old, new)])
+
+    def move_scores(self, moves: Iterable[Tuple[Optional[tuple], Optional[tuple]]]) -> None:
+        for statement in _move_statements(moves):
+            db.session.execute(statement)
+
+    def get_round_rankings(self, round: str, limit: int = 10) -> List[dict]:
+        return _rankings(db.session.execute(_top_statement(round, limit)).all())
+
+
+class AsyncRoundLeaderboardService(AsyncBaseService[RoundLeaderboard]):
+    def __init__(self):
+        super().__init__(RoundLeaderboard)
+
+    async def get_round_rankings(self, round: str, limit: int = 10) -> List[dict]:
+        return _rankings((await async_db.session.execute(_top_statement(round, limit))).all())
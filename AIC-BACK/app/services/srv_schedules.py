@@ -1,17 +1,42 @@
 from typing import Optional, List, Tuple, Any
 from fastapi_sqlalchemy import db
-from sqlalchemy import or_, and_, desc
-from app.services.srv_base import BaseService
+from sqlalchemy import desc, select, tuple_, func, text, or_, and_
+from sqlalchemy.exc import IntegrityError
+from bisect import bisect_left, insort
+from itertools import groupby
+from app.services.srv_base import BaseService, cached_result
 from app.models.model_schedules import Schedules
-from app.schemas.sche_schedules import SchedulesCreate, SchedulesUpdate
+from app.schemas.sche_schedules import (
+    SchedulesCreate,
+    SchedulesUpdate,
+    SchedulesBulkRequest,
+    SchedulesGenerateRequest,
+    SchedulesImportRequest,
+    SchedulesTimeline,
+)
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
 from app.utils.paging import paginate
+from app.utils.ical import event_lines, render_calendar
+from app.utils.scheduling import free_intervals, place_slots, overlapping_pairs, timeline
 from datetime import datetime, timedelta
 
+EXCLUSION_CONSTRAINT = "ex_schedules_location_time_range"
+CONFLICT_ERROR = "Schedule conflicts with existing schedule(s) at the same location"
+DURATION_ERROR = "Schedule duration must be positive"
+
+
+def _time_range(start: float, end: float):
+    """tstzrange [start, end) of epoch seconds, comparable with Schedules.time_range"""
+    return func.tstzrange(func.to_timestamp(start), func.to_timestamp(end))
+
 
 class SchedulesService(BaseService[Schedules]):
+    unique_errors = {
+        EXCLUSION_CONSTRAINT: (ExceptionType.VALIDATION_ERROR, CONFLICT_ERROR),
+    }
+
     def __init__(self):
         super().__init__(Schedules)
 
@@ -24,37 +49,8 @@ class SchedulesService(BaseService[Schedules]):
             if not team:
                 raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Team not found")
         
-        # Check for time conflicts
-        schedule_time = obj_in.date_time
-        duration_minutes = 30  # Default duration in minutes
-        
-        # Convert to datetime for easier calculation
-        schedule_datetime = datetime.fromtimestamp(schedule_time)
-        end_datetime = schedule_datetime + timedelta(minutes=duration_minutes)
-        end_time = end_datetime.timestamp()
-        
-        # Check for conflicts with existing schedules at the same location
-        conflicts = db.session.query(Schedules).filter(
-            Schedules.location == obj_in.location,
-            or_(
-                # New schedule starts during an existing schedule
-                and_(
-                    Schedules.date_time <= schedule_time,
-                    Schedules.date_time + 1800 > schedule_time  # 1800 seconds = 30 minutes
-                ),
-                # New schedule ends during an existing schedule
-                and_(
-                    Schedules.date_time < end_time,
-                    Schedules.date_time >= schedule_time
-                )
-            )
-        ).all()
-        
-        if conflicts:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail=f"Schedule conflicts with existing schedule(s) at the same location"
-            )
+        if obj_in.duration <= 0:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=DURATION_ERROR)
         
         # If team_id is provided, check if team already has a schedule in this round
         if obj_in.team_id:
@@ -69,11 +65,13 @@ class SchedulesService(BaseService[Schedules]):
                     detail=f"Team {obj_in.team_id} already has a schedule for round {obj_in.round}"
                 )
         
+        # Time conflicts at the same location are rejected by
+        # ex_schedules_location_time_range when the row is inserted
         schedule_data = obj_in.dict()
         return self.create(schedule_data)
     
     def update_schedule(self, schedule_id: int, obj_in: SchedulesUpdate) -> Schedules:
-        schedule = self.get_by_id(schedule_id)
+        schedule = self.get_for_update(schedule_id)
         
         update_data = obj_in.dict(exclude_unset=True)
         
@@ -85,39 +83,8 @@ class SchedulesService(BaseService[Schedules]):
             if not team:
                 raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Team not found")
         
-        # Check for time or location conflicts if either is being updated
-        if "date_time" in update_data or "location" in update_data:
-            schedule_time = update_data.get("date_time", schedule.date_time)
-            location = update_data.get("location", schedule.location)
-            
-            # Convert to datetime for easier calculation
-            schedule_datetime = datetime.fromtimestamp(schedule_time)
-            end_datetime = schedule_datetime + timedelta(minutes=30)  # Default duration
-            end_time = end_datetime.timestamp()
-            
-            # Check for conflicts with existing schedules at the same location
-            conflicts = db.session.query(Schedules).filter(
-                Schedules.id != schedule_id,
-                Schedules.location == location,
-                or_(
-                    # Updated schedule starts during an existing schedule
-                    and_(
-                        Schedules.date_time <= schedule_time,
-                        Schedules.date_time + 1800 > schedule_time  # 1800 seconds = 30 minutes
-                    ),
-                    # Updated schedule ends during an existing schedule
-                    and_(
-                        Schedules.date_time < end_time,
-                        Schedules.date_time >= schedule_time
-                    )
-                )
-            ).all()
-            
-            if conflicts:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail=f"Schedule conflicts with existing schedule(s) at the same location"
-                )
+        if update_data.get("duration") is not None and update_data["duration"] <= 0:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=DURATION_ERROR)
         
         # If team_id or round is being updated, check for existing team schedule in that round
         if ("team_id" in update_data and update_data["team_id"]) or "round" in update_data:
@@ -137,6 +104,8 @@ class SchedulesService(BaseService[Schedules]):
                         detail=f"Team {team_id} already has a schedule for round {round_val}"
                     )
         
+        # A new time, duration or location that overlaps another schedule is
+        # rejected by ex_schedules_location_time_range
         return self.partial_update_by_id(schedule_id, update_data)
     
     def get_team_schedules(
@@ -154,6 +123,7 @@ class SchedulesService(BaseService[Schedules]):
             sort_params=sort_params,
         )
     
+    @cached_result("round:{round}")
     def get_round_schedules(
         self, 
         round: str,
@@ -208,3 +178,390 @@ class SchedulesService(BaseService[Schedules]):
             pagination_params=pagination_params,
             sort_params=sort_params,
         )
+
+
+    @cached_result("schedules")
+    def get_timeline(self, start: float, end: float) -> SchedulesTimeline:
+        """Busy and free intervals of every location within [start, end).
+
+        One query returns every location with its schedules overlapping the
+        window (none for an idle location), ordered so that each location's
+        intervals are merged in a single sweep.
+        """
+        if end <= start:
+            raise CustomException(
+                exception=ExceptionType.VALIDATION_ERROR, detail="Timeline end must be after its start"
+            )
+        locations = select(Schedules.location).where(
+            Schedules.location.is_not(None)
+        ).distinct().subquery("locations")
+        booked = Schedules.__table__.alias("booked")
+        rows = db.session.execute(
+            select(locations.c.location, booked.c.date_time, booked.c.duration).select_from(
+                locations.outerjoin(
+                    booked,
+                    and_(
+                        booked.c.location == locations.c.location,
+                        booked.c.time_range.overlaps(_time_range(start, end)),
+                    ),
+                )
+            ).order_by(locations.c.location, booked.c.date_time)
+        ).all()
+        return SchedulesTimeline(
+            start=start,
+            end=end,
+            locations=[
+                {
+                    "location": location,
+                    **timeline(
+                        (
+                            (date_time, date_time + duration)
+                            for _, date_time, duration in location_rows
+                            if date_time is not None
+                        ),
+                        start,
+                        end,
+                    ),
+                }
+                for location, location_rows in groupby(rows, key=lambda row: row[0])
+            ],
+        )
+
+    def _calendar(self, name: str, *conditions) -> bytes:
+        """.ics feed of the schedules matching `conditions`, in start order"""
+        from app.models.model_teams import Teams
+
+        rows = db.session.execute(
+            select(Schedules, Teams.team_name).outerjoin(
+                Teams, Teams.id == Schedules.team_id
+            ).where(
+                Schedules.date_time.is_not(None), *conditions
+            ).order_by(Schedules.date_time, Schedules.id)
+        ).all()
+        return render_calendar(
+            name,
+            (
+                event_lines(
+                    uid=f"schedule-{schedule.id}@aic",
+                    start=schedule.date_time,
+                    end=schedule.date_time + schedule.duration,
+                    stamp=schedule.updated_at or schedule.created_at or schedule.date_time,
+                    summary=f"{schedule.round}: {team_name or 'General event'}",
+                    location=schedule.location,
+                    description=schedule.note,
+                )
+                for schedule, team_name in rows
+            ),
+        )
+
+    @cached_result("schedules", "teams", require_listener=True)
+    def get_team_calendar(self, team_id: int) -> bytes:
+        """A team's schedules together with the general events (team_id null).
+
+        Feeds are polled aggressively and answered with 304 from the cached
+        body, so they are only cached while schedule and team writes of
+        every worker are heard (see result_cache).
+        """
+        from app.models.model_teams import Teams
+
+        team = db.session.get(Teams, team_id)
+        if team is None:
+            raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Team not found")
+        return self._calendar(
+            f"{team.team_name or team_id} schedule",
+            or_(Schedules.team_id == team_id, Schedules.team_id.is_(None)),
+        )
+
+    @cached_result("schedules", "teams", require_listener=True)
+    def get_location_calendar(self, location: str) -> bytes:
+        return self._calendar(f"{location} schedule", Schedules.location == location)
+
+    @cached_result("schedules", "teams", require_listener=True)
+    def get_round_calendar(self, round: str) -> bytes:
+        return self._calendar(f"{round} schedule", Schedules.round == round)
+
+    def bulk_schedules(self, obj_in: SchedulesBulkRequest, atomic: bool = False) -> List[BulkRowResult]:
+        """Create, update and delete schedules in one transaction with per-row results.
+
+        Location conflicts and team-per-round duplicates are checked in memory
+        against the rows of the affected locations/teams loaded once.
+        """
+        from app.services.srv_teams import TeamsService
+        errors, creates, updates, deletes = [], [], [], []
+
+        current = {
+            schedule.id: schedule
+            for schedule in db.session.query(Schedules).filter(
+                Schedules.id.in_([row.id for row in obj_in.update] + obj_in.delete)
+            ).all()
+        } if obj_in.update or obj_in.delete else {}
+
+        def merged(row) -> dict:
+            data = row.dict(exclude_unset=True)
+            schedule = current[row.id]
+            for field in ("team_id", "round", "date_time", "duration", "location"):
+                data.setdefault(field, getattr(schedule, field))
+            return data
+
+        new_rows = [row.dict() for row in obj_in.create]
+        new_rows += [merged(row) for row in obj_in.update if row.id in current]
+        existing_teams = TeamsService().get_existing_ids(
+            row["team_id"] for row in new_rows if row["team_id"]
+        )
+
+        # Occupied (start, end) per location, sorted; they never overlap each other
+        occupied = {}
+        locations = {row["location"] for row in new_rows}
+        if locations:
+            start = min(row["date_time"] for row in new_rows)
+            end = max(row["date_time"] + (row["duration"] or 0) for row in new_rows)
+            for location, date_time, duration in db.session.query(
+                Schedules.location, Schedules.date_time, Schedules.duration
+            ).filter(
+                Schedules.location.in_(locations),
+                Schedules.time_range.overlaps(_time_range(start, end)),
+                # Rows updated or deleted in this batch give up their current slot
+                Schedules.id.notin_([row.id for row in obj_in.update] + obj_in.delete),
+            ).all():
+                insort(occupied.setdefault(location, []), (date_time, date_time + duration))
+
+        team_rounds = {
+            (team_id, round): id
+            for id, team_id, round in db.session.query(
+                Schedules.id, Schedules.team_id, Schedules.round
+            ).filter(
+                tuple_(Schedules.team_id, Schedules.round).in_(
+                    {(row["team_id"], row["round"]) for row in new_rows if row["team_id"]}
+                ),
+                Schedules.id.notin_(obj_in.delete),
+            ).all()
+        } if any(row["team_id"] for row in new_rows) else {}
+
+        # `owner` is the schedule id for updates and ("create", index) for new rows
+        def conflict(data: dict, owner: Any) -> Optional[str]:
+            if data["team_id"] and data["team_id"] not in existing_teams:
+                return "Team not found"
+            if data["duration"] is None or data["duration"] <= 0:
+                return DURATION_ERROR
+            start, end = data["date_time"], data["date_time"] + data["duration"]
+            # Of the slots starting before `end`, the last one also ends last
+            slots = occupied.get(data["location"], [])
+            position = bisect_left(slots, (end,))
+            if position and slots[position - 1][1] > start:
+                return CONFLICT_ERROR
+            key = (data["team_id"], data["round"])
+            if data["team_id"] and team_rounds.get(key, owner) != owner:
+                return f"Team {data['team_id']} already has a schedule for round {data['round']}"
+            return None
+
+        def reserve(data: dict, owner: Any) -> None:
+            start = data["date_time"]
+            insort(occupied.setdefault(data["location"], []), (start, start + data["duration"]))
+            if data["team_id"]:
+                team_rounds[(data["team_id"], data["round"])] = owner
+
+        for index, row in enumerate(obj_in.create):
+            schedule_data = row.dict()
+            message = conflict(schedule_data, ("create", index))
+            if message:
+                errors.append(BulkRowResult.failed("create", index, message))
+                continue
+            reserve(schedule_data, ("create", index))
+            creates.append((index, schedule_data))
+
+        for index, row in enumerate(obj_in.update):
+            if row.id not in current:
+                errors.append(BulkRowResult.failed("update", index, "Schedule not found", row.id))
+                continue
+            message = conflict(merged(row), row.id)
+            if message:
+                errors.append(BulkRowResult.failed("update", index, message, row.id))
+                continue
+            reserve(merged(row), row.id)
+            updates.append((index, row.dict(exclude_unset=True)))
+
+        for index, schedule_id in enumerate(obj_in.delete):
+            if schedule_id not in current:
+                errors.append(BulkRowResult.failed("delete", index, "Schedule not found", schedule_id))
+                continue
+            deletes.append((index, schedule_id))
+
+        # Rows of the batch may take each other's slots, so overlaps are
+        # only checked once all of them are written
+        db.session.execute(text(f"SET CONSTRAINTS {EXCLUSION_CONSTRAINT} DEFERRED"))
+        return self.bulk_write(creates, updates, deletes, errors, atomic=atomic)
+
+    def import_schedules(self, obj_in: SchedulesImportRequest) -> List[BulkRowResult]:
+        """Create a whole schedule sheet, or nothing if any row conflicts.
+
+        The rows and the existing schedules of their locations and
+        (team, round) pairs are loaded once. Overlaps are found with one sort
+        and sweep per location (app.utils.scheduling.overlapping_pairs) and
+        duplicate teams with a dict, so every conflict of every row is
+        reported before anything is written.
+        """
+        from app.services.srv_teams import TeamsService
+
+        rows = [row.dict() for row in obj_in.schedules]
+        if not rows:
+            return []
+        problems = {index: [] for index in range(len(rows))}
+        existing_teams = TeamsService().get_existing_ids(
+            row["team_id"] for row in rows if row["team_id"]
+        )
+        for index, row in enumerate(rows):
+            if row["team_id"] and row["team_id"] not in existing_teams:
+                problems[index].append("Team not found")
+            if row["duration"] <= 0:
+                problems[index].append(DURATION_ERROR)
+
+        # ("row", index) for imported rows, ("schedule", id) for existing ones
+        intervals = [
+            (row["location"], ("row", index), row["date_time"], row["date_time"] + row["duration"])
+            for index, row in enumerate(rows)
+            if row["duration"] > 0
+        ]
+        if intervals:
+            start = min(interval[2] for interval in intervals)
+            end = max(interval[3] for interval in intervals)
+            intervals += [
+                (location, ("schedule", id), date_time, date_time + duration)
+                for id, location, date_time, duration in db.session.execute(
+                    select(Schedules.id, Schedules.location, Schedules.date_time, Schedules.duration).where(
+                        Schedules.location.in_({row["location"] for row in rows}),
+                        Schedules.time_range.overlaps(_time_range(start, end)),
+                    )
+                ).all()
+            ]
+        for first, second in overlapping_pairs(intervals):
+            for (kind, index), (other_kind, other) in ((first, second), (second, first)):
+                if kind == "row":
+                    at = rows[index]["location"]
+                    target = f"schedule {other}" if other_kind == "schedule" else f"row {other}"
+                    problems[index].append(f"Conflicts with {target} at {at}")
+
+        team_rounds = {(row["team_id"], row["round"]) for row in rows if row["team_id"]}
+        taken = {
+            (team_id, round): ("schedule", id)
+            for id, team_id, round in db.session.execute(
+                select(Schedules.id, Schedules.team_id, Schedules.round).where(
+                    tuple_(Schedules.team_id, Schedules.round).in_(team_rounds)
+                )
+            ).all()
+        } if team_rounds else {}
+        for index, row in enumerate(rows):
+            if not row["team_id"]:
+                continue
+            key = (row["team_id"], row["round"])
+            owner = taken.setdefault(key, ("row", index))
+            if owner[0] == "schedule":
+                problems[index].append(
+                    f"Team {row['team_id']} already has a schedule for round {row['round']}"
+                )
+            elif owner[1] != index:
+                problems[index].append(
+                    f"Team {row['team_id']} is also scheduled in row {owner[1]} for round {row['round']}"
+                )
+
+        errors = [
+            BulkRowResult.failed("create", index, "; ".join(messages))
+            for index, messages in problems.items()
+            if messages
+        ]
+        creates = list(enumerate(rows))
+        return self.bulk_write(creates, [], [], errors, atomic=True)
+
+    def _generate_error(self, obj_in: SchedulesGenerateRequest) -> Optional[str]:
+        if not obj_in.locations:
+            return "At least one location is required"
+        if obj_in.end <= obj_in.start:
+            return "End must be after start"
+        if obj_in.slot_duration <= 0:
+            return DURATION_ERROR
+        if obj_in.gap < 0:
+            return "Gap must not be negative"
+        if any(window.end <= window.start for window in obj_in.breaks):
+            return "Every break must end after it starts"
+        return None
+
+    def generate_schedules(self, round: str, obj_in: SchedulesGenerateRequest) -> List[Schedules]:
+        """Place every unscheduled team of a round into slots and insert them at once.
+
+        Existing schedules keep their location busy, and general events of
+        the round (no team_id) and the breaks keep every location busy. The
+        free time is cut into the earliest slots across locations in memory
+        (see app.utils.scheduling.place_slots) and written with one multi-row
+        INSERT, which ex_schedules_location_time_range still guards.
+        """
+        from app.services.srv_teams import TeamsService
+        from app.models.model_teams import Teams
+
+        error = self._generate_error(obj_in)
+        if error:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=error)
+
+        if obj_in.team_ids is None:
+            team_ids = db.session.scalars(select(Teams.id).order_by(Teams.id)).all()
+        else:
+            team_ids = list(dict.fromkeys(obj_in.team_ids))
+            if TeamsService().get_existing_ids(team_ids) != set(team_ids):
+                raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Team not found")
+        scheduled = set(db.session.scalars(
+            select(Schedules.team_id).where(Schedules.round == round, Schedules.team_id.is_not(None))
+        ).all())
+        team_ids = [team_id for team_id in team_ids if team_id not in scheduled]
+        if not team_ids:
+            return []
+
+        busy = {location: [] for location in obj_in.locations}
+        everywhere = [(window.start, window.end) for window in obj_in.breaks]
+        for location, team_id, schedule_round, date_time, duration in db.session.execute(
+            select(
+                Schedules.location, Schedules.team_id, Schedules.round, Schedules.date_time, Schedules.duration
+            ).where(
+                Schedules.time_range.overlaps(_time_range(obj_in.start, obj_in.end)),
+                or_(
+                    Schedules.location.in_(obj_in.locations),
+                    and_(Schedules.team_id.is_(None), Schedules.round == round),
+                ),
+            )
+        ).all():
+            interval = (date_time, date_time + duration)
+            if team_id is None and schedule_round == round:
+                everywhere.append(interval)
+            else:
+                busy[location].append(interval)
+
+        free = {
+            location: free_intervals(intervals + everywhere, obj_in.start, obj_in.end)
+            for location, intervals in busy.items()
+        }
+        slots = place_slots(free, len(team_ids), obj_in.slot_duration, obj_in.gap)
+        if len(slots) < len(team_ids):
+            raise CustomException(
+                exception=ExceptionType.VALIDATION_ERROR,
+                detail=f"Only {len(slots)} of {len(team_ids)} teams fit in the free time of these locations",
+            )
+
+        rows = [
+            {
+                "team_id": team_id,
+                "round": round,
+                "date_time": start,
+                "duration": obj_in.slot_duration,
+                "location": location,
+                "note": obj_in.note,
+            }
+            for team_id, (location, start) in zip(team_ids, slots)
+        ]
+        try:
+            schedules = self.bulk_create(rows, commit=False)
+        except IntegrityError as e:
+            db.session.rollback()
+            raise self._unique_error(e)
+        # Keep the inserted rows loaded for the response rather than
+        # refreshing each of them after the commit
+        for schedule in schedules:
+            db.session.expunge(schedule)
+        db.session.commit()
+        return schedules
@@ -1,14 +1,17 @@
 from typing import Optional, List, Tuple, Any
 from fastapi import UploadFile
 from fastapi_sqlalchemy import db
-from sqlalchemy import or_
-from app.services.srv_base import BaseService
+from sqlalchemy import or_, select, Select
+from sqlalchemy.orm import Query
+from app.services.srv_base import BaseService, AsyncBaseService
 from app.models.model_submissions import Submissions
 from app.schemas.sche_submissions import SubmissionsCreate, SubmissionsUpdate
 from app.utils.exception_handler import CustomException, ExceptionType
 from app.schemas.sche_base import PaginationParams, SortParams
 from app.schemas.sche_response import MetadataResponse
+from app.core.database import async_db
 from app.utils.paging import paginate
+from app.utils.fields import only_fields
 from app.utils.file_handler import file_handler
 from datetime import datetime
 
@@ -47,8 +50,6 @@ class SubmissionsService(BaseService[Submissions]):
         return self.create(submission_data)
     
     def update_submission(self, submission_id: int, obj_in: SubmissionsUpdate) -> Submissions:
-        submission = self.get_by_id(submission_id)
-        
         update_data = obj_in.dict(exclude_unset=True)
         
         # Update submitted_at if files are being updated
@@ -72,14 +73,12 @@ class SubmissionsService(BaseService[Submissions]):
             sort_params=sort_params,
         )
     
-    def search_submissions(
+    def _search_query(
         self,
         search_term: Optional[str] = None,
         team_id: Optional[int] = None,
         status_submission: Optional[str] = None,
-        pagination_params: Optional[PaginationParams] = PaginationParams(),
-        sort_params: Optional[SortParams] = SortParams(),
-    ) -> Tuple[List[Submissions], MetadataResponse]:
+    ) -> Query:
         query = db.session.query(self.model)
         
         if team_id:
@@ -98,7 +97,19 @@ class SubmissionsService(BaseService[Submissions]):
                     Submissions.status_submission.ilike(f"%{search_term}%")
                 )
             )
-        
+        return query
+
+    def search_submissions(
+        self,
+        search_term: Optional[str] = None,
+        team_id: Optional[int] = None,
+        status_submission: Optional[str] = None,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Submissions], MetadataResponse]:
+        query = self._search_query(search_term, team_id, status_submission)
+        query = only_fields(self.model, query, fields, sort_params)
         return paginate(
             model=self.model,
             query=query,
@@ -106,6 +117,16 @@ class SubmissionsService(BaseService[Submissions]):
             sort_params=sort_params,
         )
     
+    def export_submissions(
+        self,
+        search_term: Optional[str] = None,
+        team_id: Optional[int] = None,
+        status_submission: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Select:
+        """Same filters as search_submissions, as a plain column SELECT for streaming exports"""
+        return self.export_statement(self._search_query(search_term, team_id, status_submission), fields)
+
     async def create_submission_with_files(
         self,
         team_id: int,
@@ -202,7 +223,7 @@ class SubmissionsService(BaseService[Submissions]):
         source_code_url: Optional[str] = None,
     ) -> Submissions:
         """Update submission with file uploads"""
-        submission = self.get_by_id(submission_id)
+        submission = self.get_for_update(submission_id)
         
         update_data = {}
         
@@ -260,4 +281,153 @@ class SubmissionsService(BaseService[Submissions]):
                 file_handler.delete_file(update_data["report_file"])
             if "slide_file" in update_data:
                 file_handler.delete_file(update_data["slide_file"])
-            raise e
\ No newline at end of file
+            raise e
+
+
+class AsyncSubmissionsService(AsyncBaseService[Submissions]):
+    def __init__(self):
+        super().__init__(Submissions)
+
+    async def create_submission_with_files(
+        self,
+        team_id: int,
+        project_title: str,
+        description: str,
+        technology: str,
+        status_submission: str = "submitted",
+        report_file: Optional[UploadFile] = None,
+        slide_file: Optional[UploadFile] = None,
+        video_url: Optional[str] = None,
+        source_code_url: Optional[str] = None,
+    ) -> Submissions:
+        """Create submission with file uploads without blocking the event loop"""
+        from app.services.srv_teams import AsyncTeamsService
+        team = await AsyncTeamsService().get_by_id_optional(team_id)
+        if not team:
+            raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Team not found")
+
+        existing_submission = (await async_db.session.scalars(
+            select(Submissions).where(Submissions.team_id == team_id).limit(1)
+        )).first()
+
+        # If submission exists, update it instead of creating a new one
+        if existing_submission:
+            return await self.update_submission_with_files(
+                submission_id=existing_submission.id,
+                project_title=project_title,
+                description=description,
+                technology=technology,
+                status_submission=status_submission,
+                report_file=report_file,
+                slide_file=slide_file,
+                video_url=video_url,
+                source_code_url=source_code_url
+            )
+
+        report_file_path = None
+        slide_file_path = None
+
+        if report_file and report_file.filename:
+            report_file_path = await file_handler.save_submission_file(
+                file=report_file,
+                team_id=team_id,
+                file_type="report"
+            )
+
+        if slide_file and slide_file.filename:
+            slide_file_path = await file_handler.save_submission_file(
+                file=slide_file,
+                team_id=team_id,
+                file_type="slide"
+            )
+
+        submission_data = {
+            "team_id": team_id,
+            "project_title": project_title,
+            "description": description,
+            "technology": technology,
+            "report_file": report_file_path,
+            "slide_file": slide_file_path,
+            "video_url": video_url,
+            "source_code_url": source_code_url,
+            "status_submission": status_submission,
+            "submitted_at": datetime.now().isoformat()
+        }
+
+        try:
+            return await self.create(submission_data)
+        except Exception as e:
+            # Clean up uploaded files if database operation fails
+            if report_file_path:
+                file_handler.delete_file(report_file_path)
+            if slide_file_path:
+                file_handler.delete_file(slide_file_path)
+            raise e
+
+    async def update_submission_with_files(
+        self,
+        submission_id: int,
+        project_title: Optional[str] = None,
+        description: Optional[str] = None,
+        technology: Optional[str] = None,
+        status_submission: Optional[str] = None,
+        report_file: Optional[UploadFile] = None,
+        slide_file: Optional[UploadFile] = None,
+        video_url: Optional[str] = None,
+        source_code_url: Optional[str] = None,
+    ) -> Submissions:
+        """Update submission with file uploads without blocking the event loop"""
+        submission = await self.get_by_id(submission_id)
+
+        update_data = {}
+        if project_title is not None:
+            update_data["project_title"] = project_title
+        if description is not None:
+            update_data["description"] = description
+        if technology is not None:
+            update_data["technology"] = technology
+        if status_submission is not None:
+            update_data["status_submission"] = status_submission
+        if video_url is not None:
+            update_data["video_url"] = video_url
+        if source_code_url is not None:
+            update_data["source_code_url"] = source_code_url
+
+        old_report_file = submission.report_file
+        old_slide_file = submission.slide_file
+
+        if report_file and report_file.filename:
+            update_data["report_file"] = await file_handler.save_submission_file(
+                file=report_file,
+                team_id=submission.team_id,
+                file_type="report"
+            )
+
+        if slide_file and slide_file.filename:
+            update_data["slide_file"] = await file_handler.save_submission_file(
+                file=slide_file,
+                team_id=submission.team_id,
+                file_type="slide"
+            )
+
+        # Update submitted_at if files are being updated
+        if any(key in update_data for key in ["report_file", "slide_file", "video_url", "source_code_url"]):
+            update_data["submitted_at"] = datetime.now().isoformat()
+
+        try:
+            updated_submission = await self.partial_update_by_id(submission_id, update_data)
+
+            # Delete old files after successful update
+            if "report_file" in update_data and old_report_file:
+                file_handler.delete_file(old_report_file)
+            if "slide_file" in update_data and old_slide_file:
+                file_handler.delete_file(old_slide_file)
+
+            return updated_submission
+        except Exception as e:
+            # Clean up new uploaded files if database operation fails
+            if "report_file" in update_data:
+                file_handler.delete_file(update_data["report_file"])
+            if "slide_file" in update_data:
+                file_handler.delete_file(update_data["slide_file"])
+            raise e
@@ -1,20 +1,38 @@
 from typing import Optional, List, Tuple, Any
 from fastapi_sqlalchemy import db
-from sqlalchemy import or_
+from sqlalchemy import or_, select, Select
+from sqlalchemy.orm import Query
 from app.services.srv_base import BaseService
 from app.models.model_team_members import TeamMembers
-from app.schemas.sche_team_members import TeamMembersCreate, TeamMembersUpdate
+from app.schemas.sche_team_members import TeamMembersCreate, TeamMembersUpdate, TeamMembersBulkRequest
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
 from app.utils.paging import paginate
+from app.utils.fields import only_fields
 
 
 class TeamMembersService(BaseService[TeamMembers]):
+    unique_errors = {
+        "ix_team_members_student_code": (
+            ExceptionType.ALREADY_EXISTS,
+            "Student with this code already exists in a team",
+        ),
+        "ix_team_members_email": (
+            ExceptionType.ALREADY_EXISTS,
+            "Student with this email already exists in a team",
+        ),
+        "ux_team_members_team_leader": (
+            ExceptionType.VALIDATION_ERROR,
+            "Team already has a leader",
+        ),
+    }
+    conflict_constraint = "ix_team_members_student_code"
+
     def __init__(self):
         super().__init__(TeamMembers)
 
-    def create_team_member(self, obj_in: TeamMembersCreate) -> TeamMembers:
+    def create_team_member(self, obj_in: TeamMembersCreate, upsert: bool = False) -> TeamMembers:
         # Check if team exists
         from app.services.srv_teams import TeamsService
         teams_service = TeamsService()
@@ -22,59 +40,17 @@ class TeamMembersService(BaseService[TeamMembers]):
         if not team:
             raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Team not found")
         
-        # Check if student_code already exists
-        existing_member = db.session.query(TeamMembers).filter(
-            TeamMembers.student_code == obj_in.student_code
-        ).first()
-        if existing_member:
-            raise CustomException(
-                exception=ExceptionType.ALREADY_EXISTS, 
-                detail="Student with this code already exists in a team"
-            )
-        
-        # Check if email already exists
-        existing_email = db.session.query(TeamMembers).filter(
-            TeamMembers.email == obj_in.email
-        ).first()
-        if existing_email:
-            raise CustomException(
-                exception=ExceptionType.ALREADY_EXISTS, 
-                detail="Student with this email already exists in a team"
-            )
-        
-        # If this is a leader, ensure no other leader exists in the team
-        if obj_in.is_leader:
-            existing_leader = db.session.query(TeamMembers).filter(
-                TeamMembers.team_id == obj_in.team_id,
-                TeamMembers.is_leader == True
-            ).first()
-            if existing_leader:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Team already has a leader"
-                )
-        
+        # Duplicate student codes and emails and a second leader in the team
+        # are rejected by the unique indexes; with upsert the member with the
+        # same student code is updated instead
         member_data = obj_in.dict()
-        return self.create(member_data)
+        return self.insert_on_conflict(
+            member_data, upsert=upsert, update_fields=obj_in.dict(exclude_unset=True).keys()
+        )
     
     def update_team_member(self, member_id: int, obj_in: TeamMembersUpdate) -> TeamMembers:
-        member = self.get_by_id(member_id)
-        
+        # A second leader in the team violates ux_team_members_team_leader
         update_data = obj_in.dict(exclude_unset=True)
-        
-        # If updating leader status to True, check if another leader exists
-        if update_data.get("is_leader") is True:
-            existing_leader = db.session.query(TeamMembers).filter(
-                TeamMembers.team_id == member.team_id,
-                TeamMembers.is_leader == True,
-                TeamMembers.id != member_id
-            ).first()
-            if existing_leader:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Team already has a leader"
-                )
-        
         return self.partial_update_by_id(member_id, update_data)
     
     def get_team_members(
@@ -92,13 +68,11 @@ class TeamMembersService(BaseService[TeamMembers]):
             sort_params=sort_params,
         )
     
-    def search_members(
+    def _search_query(
         self,
         search_term: Optional[str] = None,
         team_id: Optional[int] = None,
-        pagination_params: Optional[PaginationParams] = PaginationParams(),
-        sort_params: Optional[SortParams] = SortParams(),
-    ) -> Tuple[List[TeamMembers], MetadataResponse]:
+    ) -> Query:
         query = db.session.query(self.model)
         
         if team_id:
@@ -115,10 +89,98 @@ class TeamMembersService(BaseService[TeamMembers]):
                     TeamMembers.phone.ilike(f"%{search_term}%")
                 )
             )
-        
+        return query
+
+    def search_members(
+        self,
+        search_term: Optional[str] = None,
+        team_id: Optional[int] = None,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[TeamMembers], MetadataResponse]:
+        query = self._search_query(search_term, team_id)
+        query = only_fields(self.model, query, fields, sort_params)
         return paginate(
             model=self.model,
             query=query,
             pagination_params=pagination_params,
             sort_params=sort_params,
         )
+
+    def export_members(
+        self,
+        search_term: Optional[str] = None,
+        team_id: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Select:
+        """Same filters as search_members, as a plain column SELECT for streaming exports"""
+        return self.export_statement(self._search_query(search_term, team_id), fields)
+
+
+    def bulk_team_members(self, obj_in: TeamMembersBulkRequest, atomic: bool = False) -> List[BulkRowResult]:
+        """Create, update and delete team members in one transaction with per-row results"""
+        from app.services.srv_teams import TeamsService
+        errors, creates, updates, deletes = [], [], [], []
+
+        existing_teams = TeamsService().get_existing_ids(row.team_id for row in obj_in.create)
+        members = dict(
+            db.session.query(TeamMembers.id, TeamMembers.team_id).filter(
+                TeamMembers.id.in_([row.id for row in obj_in.update] + obj_in.delete)
+            ).all()
+        ) if obj_in.update or obj_in.delete else {}
+        student_codes = {row.student_code for row in obj_in.create}
+        emails = {row.email for row in obj_in.create}
+        taken_codes = set(db.session.scalars(
+            select(TeamMembers.student_code).where(TeamMembers.student_code.in_(student_codes))
+        ).all()) if student_codes else set()
+        taken_emails = set(db.session.scalars(
+            select(TeamMembers.email).where(TeamMembers.email.in_(emails))
+        ).all()) if emails else set()
+        team_ids = {row.team_id for row in obj_in.create} | set(members.values())
+        leaders = dict(
+            db.session.query(TeamMembers.team_id, TeamMembers.id).filter(
+                TeamMembers.team_id.in_(team_ids),
+                TeamMembers.is_leader == True
+            ).all()
+        ) if team_ids else {}
+
+        for index, row in enumerate(obj_in.create):
+            if row.team_id not in existing_teams:
+                errors.append(BulkRowResult.failed("create", index, "Team not found"))
+                continue
+            if row.student_code in taken_codes:
+                errors.append(BulkRowResult.failed("create", index, "Student with this code already exists in a team"))
+                continue
+            if row.email in taken_emails:
+                errors.append(BulkRowResult.failed("create", index, "Student with this email already exists in a team"))
+                continue
+            if row.is_leader and row.team_id in leaders:
+                errors.append(BulkRowResult.failed("create", index, "Team already has a leader"))
+                continue
+            taken_codes.add(row.student_code)
+            taken_emails.add(row.email)
+            if row.is_leader:
+                leaders[row.team_id] = None
+            creates.append((index, row.dict()))
+
+        for index, row in enumerate(obj_in.update):
+            if row.id not in members:
+                errors.append(BulkRowResult.failed("update", index, "Team member not found", row.id))
+                continue
+            update_data = row.dict(exclude_unset=True)
+            team_id = members[row.id]
+            if update_data.get("is_leader") is True:
+                if leaders.get(team_id, row.id) != row.id:
+                    errors.append(BulkRowResult.failed("update", index, "Team already has a leader", row.id))
+                    continue
+                leaders[team_id] = row.id
+            updates.append((index, update_data))
+
+        for index, member_id in enumerate(obj_in.delete):
+            if member_id not in members:
+                errors.append(BulkRowResult.failed("delete", index, "Team member not found", member_id))
+                continue
+            deletes.append((index, member_id))
+
+        return self.bulk_write(creates, updates, deletes, errors, atomic=atomic)
@@ -1,21 +1,306 @@
+import functools
+import operator
 from typing import Optional, List, Tuple, Any
 from fastapi_sqlalchemy import db
-from sqlalchemy import func, desc
-from app.services.srv_base import BaseService
+import numpy as np
+from sqlalchemy import func, desc, select, Select, Float, tuple_, case, literal
+from app.services.srv_base import BaseService, cached_result
+from app.services.srv_round_leaderboard import (
+    RoundLeaderboardService,
+    score_key,
+)
 from app.models.model_team_scores import TeamScores
-from app.schemas.sche_team_scores import TeamScoresCreate, TeamScoresUpdate
+from app.models.model_round_snapshots import RoundTeamSnapshots
+from app.schemas.sche_team_scores import TeamScoresCreate, TeamScoresUpdate, TeamScoresBatchRequest
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
-from app.utils.paging import paginate
+from app.utils.paging import paginate, paginate_grouped
+from app.utils.normalization import NormalizationMethod, rank_teams
+from app.utils.score_stats import round_statistics
 from decimal import Decimal
 
 
+# (column, maximum, label) of each scoring criterion
+_SCORE_RANGES = (
+    ("creativity", 25, "Creativity"),
+    ("feasibility", 25, "Feasibility"),
+    ("ai_effectiveness", 20, "AI effectiveness"),
+    ("presentation", 15, "Presentation"),
+    ("social_impact", 15, "Social impact"),
+)
+
+
+def _score_range_error(data: dict) -> Optional[str]:
+    """Message for the first criterion of `data` out of its range, if any"""
+    for name, maximum, label in _SCORE_RANGES:
+        value = data.get(name)
+        if value is not None and (value < 0 or value > maximum):
+            return f"{label} score must be between 0 and {maximum}"
+    return None
+
+
+def _with_total(score_data: dict) -> dict:
+    """Fill in total_score from the criteria when it is not provided"""
+    if not score_data.get("total_score"):
+        score_data["total_score"] = sum(score_data[name] for name, _, _ in _SCORE_RANGES)
+    return score_data
+
+
+def _total_update(table, update_data: dict):
+    """total_score SET expression of an update: the sent criteria plus the stored ones.
+
+    Computed by the UPDATE itself, so it adds up the row as it is, not a
+    copy read earlier.
+    """
+    terms = [
+        table.c[name] if update_data.get(name) is None else update_data[name]
+        for name, _, _ in _SCORE_RANGES
+    ]
+    return functools.reduce(operator.add, terms)
+
+
+# Columns whose change moves a score on the round leaderboard
+_LEADERBOARD_COLUMNS = ("round", "team_id", "total_score")
+
+
+def _score_key_statement(id: int):
+    return (
+        select(TeamScores.round, TeamScores.team_id, TeamScores.total_score)
+        .where(TeamScores.id == id)
+        .with_for_update()
+    )
+
+
+def _natural_key_statement(data: dict):
+    return (
+        select(TeamScores.round, TeamScores.team_id, TeamScores.total_score)
+        .where(
+            TeamScores.team_id == data["team_id"],
+            TeamScores.judge_id == data["judge_id"],
+            TeamScores.round == data["round"],
+        )
+        .with_for_update()
+    )
+
+
+def _round_score_matrix(round: str):
+    """team_id, judge_id and total_score columns of a round as three arrays.
+
+    Aggregating into arrays in Postgres returns one row, which is far
+    cheaper to turn into NumPy arrays than thousands of ORM rows.
+    """
+    return select(
+        func.array_agg(TeamScores.team_id),
+        func.array_agg(TeamScores.judge_id),
+        func.array_agg(TeamScores.total_score.cast(Float)),
+    ).where(
+        TeamScores.round == round,
+        TeamScores.team_id.is_not(None),
+        TeamScores.judge_id.is_not(None),
+        TeamScores.total_score.is_not(None),
+    )
+
+
+def _round_score_columns(round: str):
+    """team_id, judge_id, total_score and every criterion of a round, each as one array"""
+    return select(
+        func.array_agg(TeamScores.team_id),
+        func.array_agg(TeamScores.judge_id),
+        func.array_agg(TeamScores.total_score.cast(Float)),
+        *(func.array_agg(getattr(TeamScores, name).cast(Float)) for name, _, _ in _SCORE_RANGES),
+    ).where(
+        TeamScores.round == round,
+        TeamScores.team_id.is_not(None),
+        TeamScores.judge_id.is_not(None),
+        TeamScores.total_score.is_not(None),
+    )
+
+
+def _round_statistics(columns, bins: int) -> dict:
+    team_ids, judge_ids, totals, *criteria = columns
+    # NULL criteria come back as None and become NaN
+    return round_statistics(
+        np.asarray(team_ids or [], dtype=np.int64),
+        np.asarray(judge_ids or [], dtype=np.int64),
+        np.asarray(totals or [], dtype=np.float64),
+        {
+            name: np.asarray(values or [], dtype=np.float64)
+            for (name, _, _), values in zip(_SCORE_RANGES, criteria)
+        },
+        bins,
+        upper=sum(maximum for _, maximum, _ in _SCORE_RANGES),
+    )
+
+
+def _normalized_rankings(columns, method: NormalizationMethod, limit: int, trim: float) -> List[dict]:
+    team_ids, judge_ids, scores = columns
+    if not scores:
+        return []
+    return rank_teams(
+        np.asarray(team_ids, dtype=np.int64),
+        np.asarray(judge_ids, dtype=np.int64),
+        np.asarray(scores, dtype=np.float64),
+        method,
+        limit,
+        trim,
+    )
+
+
+def _round_averages(round: str):
+    """Per-team averages of every criterion in a round, as one GROUP BY subquery"""
+    return select(
+        TeamScores.team_id,
+        *(
+            func.avg(getattr(TeamScores, name)).label(f"avg_{name}")
+            for name in (
+                "creativity",
+                "feasibility",
+                "ai_effectiveness",
+                "presentation",
+                "social_impact",
+                "total_score",
+            )
+        ),
+        func.count(TeamScores.id).label("judge_count"),
+    ).where(
+        TeamScores.round == round
+    ).group_by(
+        TeamScores.team_id
+    ).subquery("averages")
+
+
+def _snapshot_averages(round: str):
+    """Same columns as _round_averages, read from round_team_snapshots"""
+    return select(
+        RoundTeamSnapshots.team_id,
+        RoundTeamSnapshots.avg_creativity,
+        RoundTeamSnapshots.avg_feasibility,
+        RoundTeamSnapshots.avg_ai_effectiveness,
+        RoundTeamSnapshots.avg_presentation,
+        RoundTeamSnapshots.avg_social_impact,
+        RoundTeamSnapshots.avg_total_score,
+        RoundTeamSnapshots.judge_count,
+    ).where(
+        RoundTeamSnapshots.round == round
+    ).subquery("averages")
+
+
+def _snapshot_rankings_statement(round: str, limit: int):
+    """Raw rankings of a closed round, the same rows as the leaderboard's"""
+    return (
+        select(
+            RoundTeamSnapshots.rank,
+            RoundTeamSnapshots.team_id,
+            RoundTeamSnapshots.avg_total_score.label("average_score"),
+            RoundTeamSnapshots.judge_count,
+        )
+        .where(RoundTeamSnapshots.round == round, RoundTeamSnapshots.rank.is_not(None))
+        .order_by(RoundTeamSnapshots.rank)
+        .limit(limit)
+    )
+
+
+def snapshot_statement(round: str) -> Select:
+    """SELECT of the round_team_snapshots rows of `round`, for INSERT ... FROM SELECT.
+
+    Teams are ranked like the raw leaderboard: by average total score, ties
+    broken by team_id, and without a rank when they have no total score.
+    """
+    averages = _round_averages(round)
+    score = averages.c.avg_total_score
+    return select(
+        literal(round).label("round"),
+        averages.c.team_id,
+        case(
+            (score.is_(None), None),
+            else_=func.row_number().over(order_by=(desc(score).nulls_last(), averages.c.team_id)),
+        ).label("rank"),
+        averages.c.avg_creativity,
+        averages.c.avg_feasibility,
+        averages.c.avg_ai_effectiveness,
+        averages.c.avg_presentation,
+        averages.c.avg_social_impact,
+        score,
+        averages.c.judge_count,
+    )
+
+
 class TeamScoresService(BaseService[TeamScores]):
+    unique_errors = {
+        "uq_team_scores_team_judge_round": (
+            ExceptionType.ALREADY_EXISTS,
+            "Score for this team by this judge in this round already exists",
+        ),
+    }
+    conflict_constraint = "uq_team_scores_team_judge_round"
+    frozen_on_close = True
+
     def __init__(self):
         super().__init__(TeamScores)
+        self.leaderboard = RoundLeaderboardService()
+
+    def _locked_score_key(self, id: int) -> Optional[tuple]:
+        row = db.session.execute(_score_key_statement(id)).mappings().first()
+        return score_key(dict(row)) if row else None
 
-    def create_team_score(self, obj_in: TeamScoresCreate) -> TeamScores:
+    def _locked_natural_key(self, data: dict) -> Optional[tuple]:
+        row = db.session.execute(_natural_key_statement(data)).mappings().first()
+        return score_key(dict(row)) if row else None
+
+    # create/update/delete keep round_leaderboard in step within the same transaction
+
+    def create(self, data: dict[str, Any], commit: bool = True) -> TeamScores:
+        score = super().create(data, commit=False)
+        self.leaderboard.move_score(None, score_key(score))
+        if commit:
+            db.session.commit()
+            db.session.refresh(score)
+        return score
+
+    def bulk_create(self, rows: List[dict[str, Any]], commit: bool = True) -> List[TeamScores]:
+        scores = super().bulk_create(rows, commit=False)
+        self.leaderboard.move_scores((None, score_key(score)) for score in scores)
+        if commit:
+            db.session.commit()
+        return scores
+
+    def insert_on_conflict(
+        self, data: dict[str, Any], upsert: bool = False, commit: bool = True
+    ) -> TeamScores:
+        old = None
+        if upsert:
+            # The score being replaced leaves the leaderboard, so it is locked
+            # and read first. When there is none yet, DO NOTHING tells whether
+            # a concurrent insert got there first, and then that one is replaced.
+            row = None
+            while row is None:
+                old = self._locked_natural_key(data)
+                row = self._insert_on_conflict(data, upsert=old is not None)
+        else:
+            row = self._insert_on_conflict(data, upsert=False)
+            if row is None:
+                db.session.rollback()
+                raise self._conflict_error()
+        self.leaderboard.move_score(old, score_key(dict(row)))
+        return self._attach_returned(row, commit)
+
+    def _update_returning(self, id: int, values: dict[str, Any], commit: bool = True) -> TeamScores:
+        if not any(name in values for name in _LEADERBOARD_COLUMNS):
+            return super()._update_returning(id, values, commit=commit)
+        old = self._locked_score_key(id)
+        row = self._update_row(id, values)
+        self.leaderboard.move_score(old, score_key(dict(row)))
+        return self._attach_returned(row, commit)
+
+    def delete_by_id(self, id: int, commit: bool = True) -> None:
+        old = self._locked_score_key(id)
+        super().delete_by_id(id, commit=False)
+        self.leaderboard.move_score(old, None)
+        if commit:
+            db.session.commit()
+
+    def create_team_score(self, obj_in: TeamScoresCreate, upsert: bool = False) -> TeamScores:
         # Check if team exists
         from app.services.srv_teams import TeamsService
         teams_service = TeamsService()
@@ -30,115 +315,76 @@ class TeamScoresService(BaseService[TeamScores]):
         if not judge:
             raise CustomException(exception=ExceptionType.NOT_FOUND, detail="Judge not found")
         
-        # Check if score already exists for this team, judge, and round
-        existing_score = db.session.query(TeamScores).filter(
-            TeamScores.team_id == obj_in.team_id,
-            TeamScores.judge_id == obj_in.judge_id,
-            TeamScores.round == obj_in.round
-        ).first()
-        
-        if existing_score:
-            raise CustomException(
-                exception=ExceptionType.ALREADY_EXISTS, 
-                detail=f"Score for team {obj_in.team_id} by judge {obj_in.judge_id} in round {obj_in.round} already exists"
-            )
-        
         # Validate score ranges
-        if obj_in.creativity < 0 or obj_in.creativity > 25:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="Creativity score must be between 0 and 25"
-            )
+        error = _score_range_error(obj_in.dict())
+        if error:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=error)
         
-        if obj_in.feasibility < 0 or obj_in.feasibility > 25:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="Feasibility score must be between 0 and 25"
-            )
-        
-        if obj_in.ai_effectiveness < 0 or obj_in.ai_effectiveness > 20:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="AI effectiveness score must be between 0 and 20"
-            )
-        
-        if obj_in.presentation < 0 or obj_in.presentation > 15:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="Presentation score must be between 0 and 15"
-            )
-        
-        if obj_in.social_impact < 0 or obj_in.social_impact > 15:
-            raise CustomException(
-                exception=ExceptionType.VALIDATION_ERROR, 
-                detail="Social impact score must be between 0 and 15"
-            )
-        
-        # Calculate total score if not provided
-        score_data = obj_in.dict()
-        if not score_data.get("total_score"):
-            total = (
-                score_data["creativity"] + 
-                score_data["feasibility"] + 
-                score_data["ai_effectiveness"] + 
-                score_data["presentation"] + 
-                score_data["social_impact"]
-            )
-            score_data["total_score"] = total
-        
-        return self.create(score_data)
+        # Calculate total score if not provided; duplicates are caught by
+        # uq_team_scores_team_judge_round
+        return self.insert_on_conflict(_with_total(obj_in.dict()), upsert=upsert)
+
+    def _existing_keys(self, keys: set) -> set:
+        """(team_id, judge_id, round) of `keys` that already have a score"""
+        if not keys:
+            return set()
+        return set(
+            db.session.execute(
+                select(TeamScores.team_id, TeamScores.judge_id, TeamScores.round).where(
+                    tuple_(TeamScores.team_id, TeamScores.judge_id, TeamScores.round).in_(keys)
+                )
+            ).tuples().all()
+        )
+
+    def batch_team_scores(
+        self, obj_in: TeamScoresBatchRequest, atomic: bool = False
+    ) -> List[BulkRowResult]:
+        """Create a judge's whole scoring sheet in one transaction.
+
+        Teams, judges and duplicates are checked with one IN query each and
+        the valid rows are written with a single multi-row INSERT.
+        """
+        from app.services.srv_teams import TeamsService
+        from app.services.srv_judges import JudgesService
+
+        rows = obj_in.scores
+        team_ids = TeamsService().get_existing_ids(row.team_id for row in rows)
+        judge_ids = JudgesService().get_existing_ids(row.judge_id for row in rows)
+        taken = self._existing_keys({(row.team_id, row.judge_id, row.round) for row in rows})
+
+        errors, creates = [], []
+        for index, row in enumerate(rows):
+            key = (row.team_id, row.judge_id, row.round)
+            score_data = row.dict()
+            if row.team_id not in team_ids:
+                error = "Team not found"
+            elif row.judge_id not in judge_ids:
+                error = "Judge not found"
+            elif key in taken:
+                error = f"Score for team {row.team_id} by judge {row.judge_id} in round {row.round} already exists"
+            else:
+                error = _score_range_error(score_data)
+            if error:
+                errors.append(BulkRowResult.failed("create", index, error))
+                continue
+            taken.add(key)
+            creates.append((index, _with_total(score_data)))
+
+        return self.bulk_write(creates, [], [], errors, atomic=atomic)
     
     def update_team_score(self, score_id: int, obj_in: TeamScoresUpdate) -> TeamScores:
-        score = self.get_by_id(score_id)
-        
         update_data = obj_in.dict(exclude_unset=True)
         
         # Validate score ranges if provided
-        if "creativity" in update_data:
-            if update_data["creativity"] < 0 or update_data["creativity"] > 25:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Creativity score must be between 0 and 25"
-                )
-        
-        if "feasibility" in update_data:
-            if update_data["feasibility"] < 0 or update_data["feasibility"] > 25:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Feasibility score must be between 0 and 25"
-                )
-        
-        if "ai_effectiveness" in update_data:
-            if update_data["ai_effectiveness"] < 0 or update_data["ai_effectiveness"] > 20:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="AI effectiveness score must be between 0 and 20"
-                )
-        
-        if "presentation" in update_data:
-            if update_data["presentation"] < 0 or update_data["presentation"] > 15:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Presentation score must be between 0 and 15"
-                )
-        
-        if "social_impact" in update_data:
-            if update_data["social_impact"] < 0 or update_data["social_impact"] > 15:
-                raise CustomException(
-                    exception=ExceptionType.VALIDATION_ERROR, 
-                    detail="Social impact score must be between 0 and 15"
-                )
+        error = _score_range_error(update_data)
+        if error:
+            raise CustomException(exception=ExceptionType.VALIDATION_ERROR, detail=error)
         
         # Recalculate total score if any component is updated
-        if any(key in update_data for key in ["creativity", "feasibility", "ai_effectiveness", "presentation", "social_impact"]):
-            creativity = update_data.get("creativity", score.creativity)
-            feasibility = update_data.get("feasibility", score.feasibility)
-            ai_effectiveness = update_data.get("ai_effectiveness", score.ai_effectiveness)
-            presentation = update_data.get("presentation", score.presentation)
-            social_impact = update_data.get("social_impact", score.social_impact)
-            
-            total = creativity + feasibility + ai_effectiveness + presentation + social_impact
-            update_data["total_score"] = total
+        if any(update_data.get(name) is not None for name, _, _ in _SCORE_RANGES):
+            values = {name: value for name, value in update_data.items() if value is not None}
+            values["total_score"] = _total_update(self.model.__table__, update_data)
+            return self._update_returning(score_id, values)
         
         return self.partial_update_by_id(score_id, update_data)
     
@@ -180,6 +426,23 @@ class TeamScoresService(BaseService[TeamScores]):
             sort_params=sort_params,
         )
     
+    def export_scores(
+        self,
+        team_id: Optional[int] = None,
+        judge_id: Optional[int] = None,
+        round: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Select:
+        """Same filters as get_team_scores/get_judge_scores, for streaming exports"""
+        query = db.session.query(self.model)
+        if team_id:
+            query = query.filter(TeamScores.team_id == team_id)
+        if judge_id:
+            query = query.filter(TeamScores.judge_id == judge_id)
+        if round:
+            query = query.filter(TeamScores.round == round)
+        return self.export_statement(query, fields)
+    
     def get_team_average_scores(self, team_id: int, round: str) -> dict:
         """Get average scores for a team in a specific round"""
         result = db.session.query(
@@ -216,30 +479,56 @@ class TeamScoresService(BaseService[TeamScores]):
             "judge_count": result.judge_count
         }
     
-    def get_round_rankings(self, round: str, limit: int = 10) -> List[dict]:
-        """Get team rankings for a specific round based on average total score"""
-        subquery = db.session.query(
-            TeamScores.team_id,
-            func.avg(TeamScores.total_score).label("avg_score")
-        ).group_by(
-            TeamScores.team_id
-        ).subquery()
-        
-        query = db.session.query(
-            subquery.c.team_id,
-            subquery.c.avg_score
-        ).order_by(
-            desc(subquery.c.avg_score)
-        ).limit(limit)
-        
-        results = query.all()
-        
-        rankings = []
-        for rank, (team_id, avg_score) in enumerate(results, 1):
-            rankings.append({
-                "rank": rank,
-                "team_id": team_id,
-                "average_score": avg_score
-            })
-        
-        return rankings
+    @cached_result("round:{round}")
+    def get_round_average_scores(
+        self,
+        round: str,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+    ) -> Tuple[List[dict], MetadataResponse]:
+        """Average scores of every team in a round, sortable by any average or judge_count.
+
+        A closed round is read from its snapshot.
+        """
+        closed = self._closed_rounds([round])
+        averages = _snapshot_averages(round) if closed else _round_averages(round)
+        return paginate_grouped(
+            model=self.model,
+            query=db.session.query(averages),
+            columns=averages.c,
+            key="team_id",
+            pagination_params=pagination_params,
+            sort_params=sort_params,
+        )
+
+    @cached_result("round:{round}")
+    def get_round_rankings(
+        self,
+        round: str,
+        limit: int = 10,
+        method: NormalizationMethod = "raw",
+        trim: float = 0.1,
+    ) -> List[dict]:
+        """Get team rankings for a specific round.
+
+        "raw" ranks by average total score from the leaderboard table, or
+        from the snapshot once the round is closed; the other methods
+        correct for judge bias, see app.utils.normalization.
+        """
+        if method == "raw":
+            if self._closed_rounds([round]):
+                rows = db.session.execute(_snapshot_rankings_statement(round, limit)).mappings()
+                return [dict(row) for row in rows]
+            return self.leaderboard.get_round_rankings(round, limit)
+        columns = db.session.execute(_round_score_matrix(round)).one()
+        return _normalized_rankings(columns, method, limit, trim)
+
+    @cached_result("round:{round}")
+    def get_round_statistics(self, round: str, bins: int = 10) -> dict:
+        """Score distribution, judge leniency and inter-judge agreement of a round.
+
+        The round is read once as arrays and everything is computed with
+        NumPy, see app.utils.score_stats.
+        """
+        columns = db.session.execute(_round_score_columns(round)).one()
+        return {"round": round, **_round_statistics(columns, bins)}
@@ -1,36 +1,40 @@
 from typing import Optional, List, Tuple, Any, Dict
 from fastapi_sqlalchemy import db
-from sqlalchemy import or_
-from app.services.srv_base import BaseService
+from sqlalchemy import or_, Select
+from sqlalchemy.orm import Query
+from app.services.srv_base import BaseService, AsyncBaseService, cached_result, relation_tags
 from app.models.model_teams import Teams
-from app.schemas.sche_teams import TeamsCreate, TeamsUpdate
+from app.schemas.sche_teams import TeamsCreate, TeamsUpdate, TeamsBulkRequest
 from app.utils.exception_handler import CustomException, ExceptionType
-from app.schemas.sche_base import PaginationParams, SortParams
+from app.schemas.sche_base import PaginationParams, SortParams, BulkRowResult
 from app.schemas.sche_response import MetadataResponse
 from app.utils.paging import paginate
+from app.utils.fields import only_fields, include_relations
 from app.core.security import get_password_hash, verify_password
 
 
 class TeamsService(BaseService[Teams]):
+    entity_tag = "team"
+    unique_errors = {
+        "ix_teams_username": (ExceptionType.ALREADY_EXISTS, "Username already exists"),
+    }
+    conflict_constraint = "ix_teams_username"
+
     def __init__(self):
         super().__init__(Teams)
 
     def create_team(self, obj_in: TeamsCreate) -> Teams:
-        # Check if username already exists
-        existing_team = db.session.query(Teams).filter(Teams.username == obj_in.username).first()
-        if existing_team:
-            raise CustomException(exception=ExceptionType.ALREADY_EXISTS, detail="Username already exists")
+        # A taken username is rejected by ix_teams_username. There is no
+        # upsert: it would let anyone reset a team's password by username
 
         # Create team with hashed password
         team_data = obj_in.dict()
         password = team_data.pop("password")
         team_data["password_hash"] = get_password_hash(password)
         
-        return self.create(team_data)
+        return self.insert_on_conflict(team_data)
     
     def update_team(self, team_id: int, obj_in: TeamsUpdate) -> Teams:
-        team = self.get_by_id(team_id)
-        
         update_data = obj_in.dict(exclude_unset=True)
         
         # Handle password update separately
@@ -48,12 +52,10 @@ class TeamsService(BaseService[Teams]):
             return None
         return team
     
-    def search_teams(
+    def _search_query(
         self,
         search_term: Optional[str] = None,
-        pagination_params: Optional[PaginationParams] = PaginationParams(),
-        sort_params: Optional[SortParams] = SortParams(),
-    ) -> Tuple[List[Teams], MetadataResponse]:
+    ) -> Query:
         query = db.session.query(self.model)
         
         if search_term:
@@ -64,10 +66,82 @@ class TeamsService(BaseService[Teams]):
                     Teams.username.ilike(f"%{search_term}%")
                 )
             )
-        
+        return query
+
+    @cached_result("teams", lambda params: relation_tags(Teams, params["include"]))
+    def search_teams(
+        self,
+        search_term: Optional[str] = None,
+        pagination_params: Optional[PaginationParams] = PaginationParams(),
+        sort_params: Optional[SortParams] = SortParams(),
+        fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Tuple[List[Teams], MetadataResponse]:
+        query = self._search_query(search_term)
+        query = only_fields(self.model, query, fields, sort_params)
+        query = include_relations(self.model, query, include)
         return paginate(
             model=self.model,
             query=query,
             pagination_params=pagination_params,
             sort_params=sort_params,
         )
+
+    def export_teams(
+        self,
+        search_term: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Select:
+        """Same filters as search_teams, as a plain column SELECT for streaming exports"""
+        return self.export_statement(self._search_query(search_term), fields)
+
+    
+    def bulk_teams(self, obj_in: TeamsBulkRequest, atomic: bool = False) -> List[BulkRowResult]:
+        """Create, update and delete teams in one transaction with per-row results"""
+        errors, creates, updates, deletes = [], [], [], []
+
+        usernames = {row.username for row in obj_in.create}
+        usernames |= {row.username for row in obj_in.update if row.username}
+        taken = dict(
+            db.session.query(Teams.username, Teams.id).filter(Teams.username.in_(usernames)).all()
+        ) if usernames else {}
+        existing_ids = self.get_existing_ids([row.id for row in obj_in.update] + obj_in.delete)
+
+        for index, row in enumerate(obj_in.create):
+            if row.username in taken:
+                errors.append(BulkRowResult.failed("create", index, "Username already exists"))
+                continue
+            taken[row.username] = None
+            team_data = row.dict()
+            team_data["password_hash"] = get_password_hash(team_data.pop("password"))
+            creates.append((index, team_data))
+
+        for index, row in enumerate(obj_in.update):
+            if row.id not in existing_ids:
+                errors.append(BulkRowResult.failed("update", index, "Team not found", row.id))
+                continue
+            update_data = row.dict(exclude_unset=True)
+            if "username" in update_data and taken.get(update_data["username"], row.id) != row.id:
+                errors.append(BulkRowResult.failed("update", index, "Username already exists", row.id))
+                continue
+            if "username" in update_data:
+                taken[update_data["username"]] = row.id
+            if "password" in update_data:
+                update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+            update_data["id"] = row.id
+            updates.append((index, update_data))
+
+        for index, team_id in enumerate(obj_in.delete):
+            if team_id not in existing_ids:
+                errors.append(BulkRowResult.failed("delete", index, "Team not found", team_id))
+                continue
+            deletes.append((index, team_id))
+
+        return self.bulk_write(creates, updates, deletes, errors, atomic=atomic)
+
+
+class AsyncTeamsService(AsyncBaseService[Teams]):
+    entity_tag = "team"
+
+    def __init__(self):
+        super().__init__(Teams)
@@ -0,0 +1,139 @@
+import threading
+from typing import Any, Hashable, Iterable
+from cachetools import TTLCache
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries also expire after a TTL.
+
+    Keeps hit/miss/eviction counters so the hit rate can be monitored. The
+    cache is per process: with several workers, an entry may be served up to
+    `ttl` seconds after another worker changed the row.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self._data = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self._data.maxsize,
+                "ttl": self._data.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class TaggedCache(LRUTTLCache):
+    """LRUTTLCache whose entries can also be invalidated by tag.
+
+    Every tag carries a version number. An entry remembers the versions of
+    its tags when stored and becomes a miss as soon as one of them has been
+    bumped, so invalidating a tag is O(1) whatever the number of entries.
+
+    Versions come from one increasing clock. At most `max_tags` tags are
+    tracked: beyond that, the least recently bumped ones are forgotten down
+    to half of it, and every untracked tag reads as the newest forgotten
+    version, so a stale entry can never become valid again (unbumped ones
+    only miss once).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, max_tags: int):
+        super().__init__(name, maxsize, ttl)
+        self.max_tags = max_tags
+        # tag -> version, in bump order
+        self._tag_versions: dict = {}
+        self._clock = 0
+        # Version of every tag missing from _tag_versions
+        self._floor = 0
+
+    def _version(self, tag: str) -> int:
+        return self._tag_versions.get(tag, self._floor)
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, versions = entry
+                if all(self._version(tag) == v for tag, v in versions):
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def tag_versions(self, tags: Iterable[str]) -> tuple:
+        """Snapshot of tag versions, taken before computing the value to store.
+
+        Storing with versions read up front means a write that commits while
+        the value is being computed still invalidates it.
+        """
+        with self._lock:
+            return tuple((tag, self._version(tag)) for tag in set(tags))
+
+    def set(self, key: Hashable, value: Any, versions: tuple = ()) -> None:
+        with self._lock:
+            self._data[key] = (value, versions)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                self._clock += 1
+                self._tag_versions.pop(tag, None)
+                self._tag_versions[tag] = self._clock
+            self.invalidations += len(tags)
+            if len(self._tag_versions) > self.max_tags:
+                oldest = list(self._tag_versions)[: len(self._tag_versions) - self.max_tags // 2]
+                self._floor = self._tag_versions[oldest[-1]]
+                for tag in oldest:
+                    del self._tag_versions[tag]
+
+    def invalidate_all(self) -> None:
+        """Make every entry a miss, including those being computed right now"""
+        with self._lock:
+            self._clock += 1
+            self._floor = self._clock
+            self._tag_versions.clear()
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats["tags"] = len(self._tag_versions)
+            stats["max_tags"] = self.max_tags
+        return stats
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong validator of a response body: equal only for identical bytes"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so a W/ prefix is ignored"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def etag_response(
+    request: Request,
+    content: Any,
+    media_type: str = "application/json",
+    cache_control: str = "no-cache",
+) -> Response:
+    """Response carrying a strong ETag of its body, or an empty 304 Not Modified
+    when the request's If-None-Match already names that body.
+
+    `content` is the raw body, or anything JSON-encodable (a DataResponse),
+    rendered exactly like FastAPI's JSONResponse. "no-cache" lets clients keep
+    the body but revalidate it on every use.
+    """
+    if isinstance(content, bytes):
+        body = content
+    else:
+        body = JSONResponse(jsonable_encoder(content)).body
+    headers = {"ETag": strong_etag(body), "Cache-Control": cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -16,6 +16,8 @@ class ExceptionType(enum.Enum):
     FORBIDDEN = 403, "Don't have access rights to the content"
     NOT_FOUND = 404, "Resource not found"
     CONFLICT = 409, "Resource already exists"
+    ALREADY_EXISTS = 409, "Resource already exists"
+    VALIDATION_ERROR = 400, "Client error: Invalid data"
     INTERNAL_SERVER_ERROR = 500, "Something went wrong"
 
     def __new__(cls, *args, **kwds):
@@ -39,6 +41,7 @@ class CustomException(Exception):
         http_code: Optional[int] = None,
         message: Optional[str] = None,
         exception: Optional[ExceptionType] = None,
+        detail: Optional[str] = None,
     ):
         if exception and (
             type(exception) is ExceptionType or type(exception) is CustomException
@@ -48,6 +51,9 @@ class CustomException(Exception):
         else:
             self.http_code = http_code
             self.message = message
+        if detail:
+            self.message = detail
+        super().__init__(self.message)
 
 
 async def fastapi_error_handler(request, exc: Exception):
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from typing import Iterator, Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from app.core.config import settings
+from app.core.database import engine
+
+ExportFormat = Literal["csv", "ndjson"]
+
+_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _partitions(statement: Select, batch_size: int) -> Iterator[tuple]:
+    """Yield (columns, rows) batches from a server-side cursor.
+
+    The export runs on its own connection: the request session is already
+    closed by the time StreamingResponse consumes the body.
+    """
+    with engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(statement)
+        columns = list(result.keys())
+        yielded = False
+        for rows in result.partitions():
+            yielded = True
+            yield columns, rows
+        if not yielded:
+            yield columns, []
+
+
+def _csv_lines(statement: Select, batch_size: int) -> Iterator[str]:
+    header_written = False
+    for columns, rows in _partitions(statement, batch_size):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def _ndjson_lines(statement: Select, batch_size: int) -> Iterator[str]:
+    for columns, rows in _partitions(statement, batch_size):
+        if rows:
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + "\n"
+                for row in rows
+            )
+
+
+def export_response(
+    statement: Select,
+    export_format: ExportFormat,
+    filename: str,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> StreamingResponse:
+    """Stream the rows of `statement` as CSV or NDJSON, one batch at a time"""
+    lines = _csv_lines if export_format == "csv" else _ndjson_lines
+    return StreamingResponse(
+        lines(statement, batch_size),
+        media_type=_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format}"'
+        },
+    )
@@ -0,0 +1,136 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Type
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+from app.schemas.sche_base import SortParams
+from app.utils.exception_handler import CustomException, ExceptionType
+
+
+def parse_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma separated `fields=` value against a response schema.
+
+    Only fields exposed by the schema can be requested, so projections never
+    leak columns such as password hashes. `id` is always returned.
+    """
+    if not fields:
+        return None
+    names = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise CustomException(
+            exception=ExceptionType.VALIDATION_ERROR,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return names
+
+
+def only_fields(
+    model,
+    query,
+    fields: Optional[List[str]],
+    sort_params: Optional[SortParams] = None,
+):
+    """Load only the requested columns of a Query or select() statement.
+
+    The sort column is loaded as well because cursor pagination reads it
+    from the last row of the page.
+    """
+    if not fields:
+        return query
+    columns = inspect(model).column_attrs.keys()
+    names = [name for name in fields if name in columns]
+    if sort_params and sort_params.sort_by in columns and sort_params.sort_by not in names:
+        names.append(sort_params.sort_by)
+    return query.options(load_only(*(getattr(model, name) for name in names)))
+
+
+def _relation_fields(schema: Type[BaseModel]) -> List[str]:
+    """Relationship fields are the ones a composite schema adds to its base schema"""
+    base_fields = schema.__base__.model_fields
+    return [name for name in schema.model_fields if name not in base_fields]
+
+
+@lru_cache(maxsize=None)
+def _relation_adapter(schema: Type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(schema.model_fields[name].annotation)
+
+
+def parse_include(schema: Type[BaseModel], include: Optional[str]) -> List[str]:
+    """Validate a comma separated `include=` value against a composite schema"""
+    if not include:
+        return []
+    allowed = _relation_fields(schema)
+    names = []
+    for name in include.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise CustomException(
+            exception=ExceptionType.VALIDATION_ERROR,
+            detail=f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return names
+
+
+def include_relations(model, query, include: Optional[List[str]]):
+    """Batch-load the requested relationships with one SELECT ... IN per relationship"""
+    if not include:
+        return query
+    return query.options(*(selectinload(getattr(model, name)) for name in include))
+
+
+def expand(
+    rows: List[Any],
+    schema: Type[BaseModel],
+    include: Optional[List[str]],
+    fields: Optional[List[str]] = None,
+) -> List[dict]:
+    """Turn rows into dicts for a composite schema such as TeamsWithRelations.
+
+    Only the relationships listed in `include` are read; the others are left
+    out of the result so that serializing a page never lazy loads them.
+    """
+    relations = _relation_fields(schema)
+    columns = fields or [name for name in schema.model_fields if name not in relations]
+    adapters = {name: _relation_adapter(schema, name) for name in include or []}
+    return [
+        {
+            **{name: getattr(row, name) for name in columns},
+            **{
+                name: adapter.validate_python(getattr(row, name), from_attributes=True)
+                for name, adapter in adapters.items()
+            },
+        }
+        for row in rows
+    ]
+
+
+def project(rows: List[Any], fields: Optional[List[str]]) -> List[Any]:
+    """Turn rows loaded by only_fields into dicts holding the requested fields"""
+    if not fields:
+        return rows
+    return [{name: getattr(row, name) for name in fields} for row in rows]
+
+
+@lru_cache(maxsize=None)
+def sparse(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Copy of a response schema where every field is optional.
+
+    Used as the documented item type of list endpoints that accept `fields=`,
+    whose rows may only carry the requested keys.
+    """
+    return create_model(
+        f"{schema.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (Optional[field.annotation], None)
+            for name, field in schema.model_fields.items()
+        },
+    )
@@ -1,6 +1,7 @@
 import os
 import uuid
 import shutil
+import aiofiles
 from typing import Optional
 from pathlib import Path
 from fastapi import UploadFile
@@ -85,10 +86,10 @@ class FileHandler:
             # Make sure directory exists
             file_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save file
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
+            # Save file in chunks so large uploads do not block the event loop
+            async with aiofiles.open(file_path, "wb") as buffer:
+                while chunk := await file.read(1024 * 1024):
+                    await buffer.write(chunk)
                 
             # Verify file was saved
             print(f"File saved successfully: {file_path.exists()}")
@@ -0,0 +1,78 @@
+from typing import Iterable, List, Optional
+from app.utils.time_utils import timestamp_to_datetime
+
+CALENDAR_MEDIA_TYPE = "text/calendar; charset=utf-8"
+PRODUCT_ID = "-//AIC//Schedules//EN"
+
+
+def _escape(text: str) -> str:
+    """TEXT value escaping of RFC 5545 section 3.3.11"""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Split a content line into 75 octet pieces, continued with a leading space"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    pieces, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Never cut a multi-byte character in half
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(pieces)
+
+
+def _utc(timestamp: float) -> str:
+    return timestamp_to_datetime(timestamp).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_lines(
+    uid: str,
+    start: float,
+    end: float,
+    stamp: float,
+    summary: str,
+    location: Optional[str] = None,
+    description: Optional[str] = None,
+) -> List[str]:
+    """VEVENT content lines of one event, times in UTC"""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_utc(stamp)}",
+        f"DTSTART:{_utc(start)}",
+        f"DTEND:{_utc(end)}",
+        f"SUMMARY:{_escape(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_escape(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_calendar(name: str, events: Iterable[List[str]]) -> bytes:
+    """A complete VCALENDAR of `events` (event_lines), folded and CRLF terminated"""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for event in events:
+        lines.extend(event)
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines).encode("utf-8")
@@ -0,0 +1,107 @@
+from typing import List, Literal, Tuple
+import numpy as np
+
+NormalizationMethod = Literal["raw", "zscore", "minmax", "trimmed"]
+
+
+def _group_means(index: np.ndarray, values: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    counts = np.bincount(index, minlength=size)
+    sums = np.bincount(index, weights=values, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan), counts
+
+
+def zscore_by_judge(judge_index: np.ndarray, scores: np.ndarray, judge_count: int) -> np.ndarray:
+    """Each score as standard deviations from its judge's mean score.
+
+    A judge who gave every team the same score gets 0 for all of them.
+    """
+    means, counts = _group_means(judge_index, scores, judge_count)
+    deviations = scores - means[judge_index]
+    # Two passes: E[x^2] - E[x]^2 cancels badly when the scores are close
+    squares = np.bincount(judge_index, weights=deviations * deviations, minlength=judge_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stds = np.sqrt(squares / counts)[judge_index]
+    # Rounding of the mean leaves equal scores a spread of a few ulps
+    tolerance = 1e-9 * np.maximum(np.abs(means[judge_index]), 1.0)
+    return np.divide(deviations, stds, out=np.zeros_like(scores), where=stds > tolerance)
+
+
+def minmax_by_judge(judge_index: np.ndarray, scores: np.ndarray, judge_count: int) -> np.ndarray:
+    """Each score rescaled to [0, 1] between its judge's lowest and highest score.
+
+    A judge who gave every team the same score gets 0.5 for all of them.
+    """
+    lows = np.full(judge_count, np.inf)
+    highs = np.full(judge_count, -np.inf)
+    np.minimum.at(lows, judge_index, scores)
+    np.maximum.at(highs, judge_index, scores)
+    spans = (highs - lows)[judge_index]
+    offsets = scores - lows[judge_index]
+    return np.divide(offsets, spans, out=np.full_like(scores, 0.5), where=spans > 1e-12)
+
+
+def trimmed_means(
+    team_index: np.ndarray, scores: np.ndarray, team_count: int, trim: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-team mean after dropping the `trim` fraction of lowest and highest scores"""
+    order = np.lexsort((scores, team_index))
+    sorted_teams = team_index[order]
+    sorted_scores = scores[order]
+    counts = np.bincount(team_index, minlength=team_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    positions = np.arange(len(scores)) - starts[sorted_teams]
+    cut = np.floor(counts * trim).astype(np.int64)[sorted_teams]
+    keep = (positions >= cut) & (positions < counts[sorted_teams] - cut)
+    means, _ = _group_means(sorted_teams[keep], sorted_scores[keep], team_count)
+    return means, counts
+
+
+def team_scores(
+    team_ids: np.ndarray,
+    judge_ids: np.ndarray,
+    scores: np.ndarray,
+    method: NormalizationMethod,
+    trim: float = 0.1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(team ids, per-team score, per-team judge count) for one round.
+
+    - raw: mean of total_score
+    - zscore / minmax: mean of the scores normalized per judge, which
+      cancels out lenient and strict judges
+    - trimmed: mean of total_score without the `trim` extremes of each team
+    """
+    teams, team_index = np.unique(team_ids, return_inverse=True)
+    if method == "trimmed":
+        values, counts = trimmed_means(team_index, scores, len(teams), trim)
+        return teams, values, counts
+    if method in ("zscore", "minmax"):
+        judges, judge_index = np.unique(judge_ids, return_inverse=True)
+        normalize = zscore_by_judge if method == "zscore" else minmax_by_judge
+        scores = normalize(judge_index, scores, len(judges))
+    values, counts = _group_means(team_index, scores, len(teams))
+    return teams, values, counts
+
+
+def rank_teams(
+    team_ids: np.ndarray,
+    judge_ids: np.ndarray,
+    scores: np.ndarray,
+    method: NormalizationMethod,
+    limit: int,
+    trim: float = 0.1,
+) -> List[dict]:
+    """Top `limit` teams by normalized score, ties broken by team id"""
+    if len(scores) == 0:
+        return []
+    teams, values, counts = team_scores(team_ids, judge_ids, scores, method, trim)
+    order = np.lexsort((teams, -values))[:limit]
+    return [
+        {
+            "rank": rank,
+            "team_id": int(teams[i]),
+            "average_score": round(float(values[i]), 4),
+            "judge_count": int(counts[i]),
+        }
+        for rank, i in enumerate(order, 1)
+    ]
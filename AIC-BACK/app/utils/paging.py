@@ -1,9 +1,244 @@
-from typing import Optional, List, Any
-from sqlalchemy import asc, desc
+import base64
+import json
+import threading
+from decimal import Decimal
+from cachetools import TTLCache
+from typing import Optional, List, Any, Tuple
+from sqlalchemy import asc, desc, and_, or_, func, select, Select
 from sqlalchemy.orm import Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.sche_response import MetadataResponse
-from app.utils.exception_handler import CustomException
+from app.utils.exception_handler import CustomException, ExceptionType
 from app.schemas.sche_base import PaginationParams, SortParams
+from app.core.config import settings
+
+
+_count_cache = TTLCache(maxsize=1024, ttl=settings.PAGINATION_COUNT_CACHE_TTL)
+_count_cache_lock = threading.Lock()
+
+
+def encode_cursor(sort_by: str, order: str, value: Any, id: int) -> str:
+    """Encode the (sort_by, id) position of a row into an opaque cursor"""
+    if isinstance(value, Decimal):
+        value = str(value)
+    payload = {"s": sort_by, "o": order, "v": value, "id": id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> dict:
+    """Decode a cursor, rejecting it if it was issued for another sort order"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_by or payload["o"] != order:
+            raise ValueError("cursor sort mismatch")
+        int(payload["id"])
+    except Exception:
+        raise CustomException(exception=ExceptionType.BAD_REQUEST_FORMAT_MISMATCH)
+    return payload
+
+
+def _seek_filter(model, sort_by: str, order: str, cursor: dict):
+    """Build the WHERE clause that seeks past the cursor on (sort_by, id).
+
+    Postgres puts NULLs last for ASC and first for DESC, so the predicate
+    follows the same convention to keep pages gap-free.
+    """
+    column = getattr(model, sort_by)
+    last_id = int(cursor["id"])
+    value = cursor["v"]
+    if value is not None:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type in (int, float, Decimal, str):
+            # A tampered value must not reach the database as the wrong type
+            try:
+                value = python_type(value)
+            except (TypeError, ValueError, ArithmeticError):
+                raise CustomException(exception=ExceptionType.BAD_REQUEST_FORMAT_MISMATCH)
+
+    if sort_by == "id":
+        return model.id < last_id if order == "desc" else model.id > last_id
+
+    if order == "desc":
+        if value is None:
+            return or_(
+                column.isnot(None),
+                and_(column.is_(None), model.id < last_id),
+            )
+        return or_(column < value, and_(column == value, model.id < last_id))
+
+    if value is None:
+        return and_(column.is_(None), model.id > last_id)
+    return or_(
+        column > value,
+        and_(column == value, model.id > last_id),
+        column.is_(None),
+    )
+
+
+def _order_by(model, query: Query, sort_params: Optional[SortParams]) -> Query:
+    if not (sort_params and sort_params.order):
+        return query
+    direction = desc if sort_params.order == "desc" else asc
+    query = query.order_by(direction(getattr(model, sort_params.sort_by)))
+    if sort_params.sort_by != "id":
+        # Tie-break on id so that offset and cursor pages are stable
+        query = query.order_by(direction(model.id))
+    return query
+
+
+def _next_cursor(data: List[Any], sort_params: Optional[SortParams]) -> Optional[str]:
+    if not data or not (sort_params and sort_params.order):
+        return None
+    last = data[-1]
+    return encode_cursor(
+        sort_by=sort_params.sort_by,
+        order=sort_params.order,
+        value=getattr(last, sort_params.sort_by),
+        id=last.id,
+    )
+
+
+def _total_mode(pagination_params: Optional[PaginationParams]) -> str:
+    if pagination_params and pagination_params.total_mode:
+        return pagination_params.total_mode
+    if pagination_params and pagination_params.cursor:
+        return "none"
+    return "exact"
+
+
+def _count_key(model, query) -> tuple:
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile()
+    params = tuple(sorted((k, repr(v)) for k, v in compiled.params.items()))
+    return (model.__tablename__, str(compiled), params)
+
+
+def _planner_estimate(connection, statement) -> Optional[int]:
+    """Row estimate from the Postgres planner, without executing the query"""
+    compiled = statement.compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    row = connection.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), params
+    ).first()
+    plan = row[0] if row else None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if not plan:
+        return None
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_count(key: tuple) -> Optional[int]:
+    with _count_cache_lock:
+        return _count_cache.get(key)
+
+
+def _store_count(key: tuple, total: int) -> None:
+    with _count_cache_lock:
+        _count_cache[key] = total
+
+
+def count_total(model, query: Query, total_mode: str = "exact") -> Optional[int]:
+    """Count the rows of a list query according to total_mode.
+
+    - exact: SELECT count(*) on every call
+    - estimate: short-TTL cached count per (model, filter); on a miss the
+      planner estimate is used for large results and an exact count otherwise
+    - none: no count at all
+    """
+    if total_mode == "none":
+        return None
+    if total_mode != "estimate":
+        return query.count()
+
+    key = _count_key(model, query)
+    total = _cached_count(key)
+    if total is not None:
+        return total
+    try:
+        total = _planner_estimate(query.session.connection(), query.statement)
+    except Exception:
+        total = None
+    if total is None or total < settings.PAGINATION_ESTIMATE_THRESHOLD:
+        total = query.count()
+    _store_count(key, total)
+    return total
+
+
+def _apply_seek(model, query, pagination_params: PaginationParams, sort_params: Optional[SortParams]):
+    """Replace the ordering of a Query/Select by (sort_by, id) and seek past the cursor"""
+    sort_params = sort_params or SortParams()
+    if not sort_params.order:
+        sort_params = SortParams(sort_by=sort_params.sort_by, order="desc")
+    cursor = decode_cursor(
+        pagination_params.cursor, sort_params.sort_by, sort_params.order
+    )
+    # Any ordering applied by the caller would break the seek predicate
+    query = query.order_by(None)
+    query = query.filter(_seek_filter(model, sort_params.sort_by, sort_params.order, cursor))
+    return _order_by(model, query, sort_params), sort_params
+
+
+def _keyset_page(
+    data: List[Any],
+    total: Optional[int],
+    pagination_params: PaginationParams,
+    sort_params: SortParams,
+) -> Tuple[List[Any], MetadataResponse]:
+    page_size = pagination_params.page_size
+    has_next = bool(page_size) and len(data) > page_size
+    if has_next:
+        data = data[:page_size]
+    metadata = MetadataResponse(
+        page=pagination_params.page,
+        page_size=page_size or len(data),
+        total=total,
+        has_next=has_next,
+        next_cursor=_next_cursor(data, sort_params) if has_next else None,
+    )
+    return data, metadata
+
+
+def _offset_page(
+    data: List[Any],
+    total: Optional[int],
+    total_mode: str,
+    pagination_params: PaginationParams,
+    sort_params: Optional[SortParams],
+) -> Tuple[List[Any], MetadataResponse]:
+    page_size = pagination_params.page_size
+    page = pagination_params.page or 1
+    offset = page_size * (page - 1)
+    if total_mode == "exact":
+        has_next = offset + len(data) < total
+    else:
+        has_next = len(data) > page_size
+        data = data[:page_size]
+        if not has_next and (data or page == 1):
+            total = offset + len(data)
+    metadata = MetadataResponse(
+        page=page,
+        page_size=page_size,
+        total=total,
+        has_next=has_next,
+        next_cursor=_next_cursor(data, sort_params) if has_next else None,
+    )
+    return data, metadata
+
+
+def _page_bounds(pagination_params: PaginationParams, total_mode: str) -> Tuple[int, int]:
+    """LIMIT/OFFSET for a page; modes without an exact total fetch one extra row"""
+    page_size = pagination_params.page_size
+    offset = page_size * ((pagination_params.page or 1) - 1)
+    limit = page_size if total_mode == "exact" else page_size + 1
+    return limit, offset
 
 
 def paginate(
@@ -13,29 +248,161 @@ def paginate(
     sort_params: Optional[SortParams],
 ) -> List[Any]:
     try:
-        total = query.count()
-        metadata = MetadataResponse(
-            page=1,
-            page_size=total,
-            total=total,
+        total_mode = _total_mode(pagination_params)
+        if pagination_params and pagination_params.cursor:
+            total = count_total(model, query, total_mode)
+            query, sort_params = _apply_seek(model, query, pagination_params, sort_params)
+            if pagination_params.page_size:
+                query = query.limit(pagination_params.page_size + 1)
+            data, metadata = _keyset_page(query.all(), total, pagination_params, sort_params)
+        elif pagination_params and pagination_params.page_size:
+            total = count_total(model, query, total_mode)
+            limit, offset = _page_bounds(pagination_params, total_mode)
+            query = _order_by(model, query, sort_params).limit(limit).offset(offset)
+            data, metadata = _offset_page(
+                query.all(), total, total_mode, pagination_params, sort_params
+            )
+        else:
+            data = _order_by(model, query, sort_params).all()
+            metadata = MetadataResponse(
+                page=1,
+                page_size=len(data),
+                total=len(data),
+                has_next=False,
+                next_cursor=None,
+            )
+    except Exception as e:
+        raise CustomException(exception=e)
+    return data, metadata
+
+
+def _grouped_order(columns, key: str, sort_params: Optional[SortParams]) -> list:
+    """ORDER BY for rows of a GROUP BY subquery, with `key` standing in for id"""
+    sort_params = sort_params or SortParams()
+    sort_by = key if sort_params.sort_by in (None, "id") else sort_params.sort_by
+    if sort_by not in columns.keys():
+        raise CustomException(
+            exception=ExceptionType.VALIDATION_ERROR,
+            detail=f"Unknown sort field: {sort_by}. Allowed: {', '.join(columns.keys())}",
+        )
+    direction = asc if sort_params.order == "asc" else desc
+    order = [direction(columns[sort_by])]
+    if sort_by != key:
+        order.append(direction(columns[key]))
+    return order
+
+
+def _grouped_page(
+    rows: List[Any],
+    total: Optional[int],
+    total_mode: str,
+    pagination_params: Optional[PaginationParams],
+) -> Tuple[List[dict], MetadataResponse]:
+    data = [dict(row._mapping) for row in rows]
+    if not (pagination_params and pagination_params.page_size):
+        return data, MetadataResponse(
+            page=1, page_size=len(data), total=len(data), has_next=False, next_cursor=None
         )
-        if sort_params and sort_params.order:
-            direction = desc if sort_params.order == "desc" else asc
-            query = query.order_by(direction(getattr(model, sort_params.sort_by)))
-        if pagination_params:
+    # Aggregated rows have no id to build a cursor from
+    return _offset_page(data, total, total_mode, pagination_params, None)
+
+
+def _check_grouped_params(pagination_params: Optional[PaginationParams]) -> str:
+    if pagination_params and pagination_params.cursor:
+        raise CustomException(
+            exception=ExceptionType.VALIDATION_ERROR,
+            detail="Cursor pagination is not supported for aggregated results, use page",
+        )
+    return _total_mode(pagination_params)
+
+
+def paginate_grouped(
+    model,
+    query: Query,
+    columns,
+    key: str,
+    pagination_params: Optional[PaginationParams],
+    sort_params: Optional[SortParams],
+) -> Tuple[List[dict], MetadataResponse]:
+    """Offset pagination over a Query selecting from a GROUP BY subquery.
+
+    `columns` is the subquery's column collection: sort_by may name any of
+    them, "id" meaning the group `key`. Rows are returned as dicts.
+    """
+    total_mode = _check_grouped_params(pagination_params)
+    query = query.order_by(*_grouped_order(columns, key, sort_params))
+    total = None
+    if pagination_params and pagination_params.page_size:
+        total = count_total(model, query.order_by(None), total_mode)
+        limit, offset = _page_bounds(pagination_params, total_mode)
+        query = query.limit(limit).offset(offset)
+    return _grouped_page(query.all(), total, total_mode, pagination_params)
+
+
+async def count_total_async(
+    model, session: AsyncSession, statement: Select, total_mode: str = "exact"
+) -> Optional[int]:
+    """Async counterpart of count_total for 2.0-style select() statements"""
+    if total_mode == "none":
+        return None
+    count_statement = select(func.count()).select_from(
+        statement.order_by(None).subquery()
+    )
+    if total_mode != "estimate":
+        return await session.scalar(count_statement)
+
+    key = _count_key(model, statement)
+    total = _cached_count(key)
+    if total is not None:
+        return total
+    try:
+        total = await session.run_sync(
+            lambda sync_session: _planner_estimate(sync_session.connection(), statement)
+        )
+    except Exception:
+        total = None
+    if total is None or total < settings.PAGINATION_ESTIMATE_THRESHOLD:
+        total = await session.scalar(count_statement)
+    _store_count(key, total)
+    return total
+
+
+async def paginate_async(
+    model,
+    session: AsyncSession,
+    statement: Select,
+    pagination_params: Optional[PaginationParams],
+    sort_params: Optional[SortParams],
+) -> List[Any]:
+    """Same contract as paginate() for an AsyncSession and a select() statement"""
+    try:
+        total_mode = _total_mode(pagination_params)
+        if pagination_params and pagination_params.cursor:
+            total = await count_total_async(model, session, statement, total_mode)
+            statement, sort_params = _apply_seek(
+                model, statement, pagination_params, sort_params
+            )
             if pagination_params.page_size:
-                query = query.limit(pagination_params.page_size)
-            if pagination_params.page:
-                query = query.offset(
-                    pagination_params.page_size * (pagination_params.page - 1)
-                )
+                statement = statement.limit(pagination_params.page_size + 1)
+            rows = (await session.scalars(statement)).all()
+            data, metadata = _keyset_page(list(rows), total, pagination_params, sort_params)
+        elif pagination_params and pagination_params.page_size:
+            total = await count_total_async(model, session, statement, total_mode)
+            limit, offset = _page_bounds(pagination_params, total_mode)
+            statement = _order_by(model, statement, sort_params).limit(limit).offset(offset)
+            rows = (await session.scalars(statement)).all()
+            data, metadata = _offset_page(
+                list(rows), total, total_mode, pagination_params, sort_params
+            )
+        else:
+            data = list((await session.scalars(_order_by(model, statement, sort_params))).all())
             metadata = MetadataResponse(
-                page=pagination_params.page,
-                page_size=pagination_params.page_size,
-                total=total,
+                page=1,
+                page_size=len(data),
+                total=len(data),
+                has_next=False,
+                next_cursor=None,
             )
-        data = query.all()
-        print("============ PAGINATE ============", data, metadata, flush=True)
     except Exception as e:
         raise CustomException(exception=e)
     return data, metadata
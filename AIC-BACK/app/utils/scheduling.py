@@ -0,0 +1,116 @@
+import heapq
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# [start, end) in epoch seconds
+Interval = Tuple[float, float]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Union of `intervals` as sorted, non-overlapping intervals.
+
+    Touching intervals ([a, b) and [b, c)) are merged too.
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_intervals(busy: Iterable[Interval], start: float, end: float) -> List[Interval]:
+    """The parts of [start, end) not covered by any of `busy`"""
+    free: List[Interval] = []
+    position = start
+    for busy_start, busy_end in merge_intervals(busy):
+        if busy_end <= position:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start > position:
+            free.append((position, busy_start))
+        position = max(position, busy_end)
+    if position < end:
+        free.append((position, end))
+    return free
+
+
+def _next_slot(free: List[Interval], index: int, earliest: float, length: float) -> Optional[Tuple[float, int]]:
+    """(start, interval index) of the first slot of `length` in `free` starting
+    at or after `earliest`, scanning from free[index]"""
+    while index < len(free):
+        start = max(earliest, free[index][0])
+        if start + length <= free[index][1]:
+            return start, index
+        index += 1
+    return None
+
+
+def place_slots(
+    free: Dict[str, List[Interval]], count: int, length: float, gap: float = 0
+) -> List[Tuple[str, float]]:
+    """Up to `count` (location, start) slots of `length` seconds, earliest first.
+
+    Every location fills its free intervals back to back, `gap` seconds
+    apart. A heap keyed on each location's next slot start always takes the
+    earliest one, so the slots are the `count` earliest possible and the day
+    ends as soon as it can; ties go to the location listed first.
+    """
+    heap = []
+    for order, (location, intervals) in enumerate(free.items()):
+        slot = _next_slot(intervals, 0, float("-inf"), length)
+        if slot is not None:
+            heap.append((slot[0], order, location, slot[1]))
+    heapq.heapify(heap)
+
+    slots: List[Tuple[str, float]] = []
+    while heap and len(slots) < count:
+        start, order, location, index = heapq.heappop(heap)
+        slots.append((location, start))
+        slot = _next_slot(free[location], index, start + length + gap, length)
+        if slot is not None:
+            heapq.heappush(heap, (slot[0], order, location, slot[1]))
+    return slots
+
+
+def overlapping_pairs(intervals: Iterable[Tuple[Hashable, Any, float, float]]) -> List[Tuple[Any, Any]]:
+    """Every pair of overlapping intervals within the same group.
+
+    `intervals` are (group, key, start, end). One sort by (group, start)
+    and a sweep keeping a heap of the intervals still open, so the cost is
+    O(n log n) plus the number of pairs. Each pair is (earlier, later).
+    """
+    pairs: List[Tuple[Any, Any]] = []
+    active: List[Tuple[float, int, Any]] = []
+    group = None
+    ordered = sorted(intervals, key=lambda interval: (interval[0], interval[2]))
+    for order, (interval_group, key, start, end) in enumerate(ordered):
+        if order == 0 or interval_group != group:
+            group, active = interval_group, []
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        pairs.extend((other, key) for _, _, other in active)
+        heapq.heappush(active, (end, order, key))
+    return pairs
+
+
+def timeline(busy: Iterable[Interval], start: float, end: float) -> dict:
+    """Busy and free parts of [start, end) and the share of it that is busy.
+
+    `busy` is merged in one sweep and clipped to the window; utilization is
+    a percentage of the window length.
+    """
+    merged = [
+        (max(busy_start, start), min(busy_end, end))
+        for busy_start, busy_end in merge_intervals(busy)
+        if busy_start < end and busy_end > start
+    ]
+    busy_seconds = sum(busy_end - busy_start for busy_start, busy_end in merged)
+    return {
+        "busy": [{"start": busy_start, "end": busy_end} for busy_start, busy_end in merged],
+        "free": [{"start": free_start, "end": free_end} for free_start, free_end in free_intervals(merged, start, end)],
+        "busy_seconds": busy_seconds,
+        "utilization": round(100 * busy_seconds / (end - start), 2),
+    }
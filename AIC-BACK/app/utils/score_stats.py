@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+# Judges need this many teams in common for their correlation to be reported
+MIN_COMMON_TEAMS = 3
+
+
+def _number(value) -> Optional[float]:
+    """JSON-friendly float, None for NaN and infinities"""
+    value = float(value)
+    return round(value, 4) if np.isfinite(value) else None
+
+
+def describe(values: np.ndarray) -> dict:
+    """count / mean / std / min / max of `values`, ignoring NaN"""
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"count": 0, "mean": None, "std": None, "min": None, "max": None}
+    return {
+        "count": int(len(values)),
+        "mean": _number(values.mean()),
+        "std": _number(values.std()),
+        "min": _number(values.min()),
+        "max": _number(values.max()),
+    }
+
+
+def distribution(scores: np.ndarray, bins: int, upper: float) -> dict:
+    """Summary, percentiles and a `bins` bucket histogram over [0, upper]"""
+    counts, edges = np.histogram(scores, bins=bins, range=(0, upper))
+    percentiles = np.percentile(scores, PERCENTILES) if len(scores) else [np.nan] * len(PERCENTILES)
+    return {
+        **describe(scores),
+        "percentiles": {f"p{p}": _number(v) for p, v in zip(PERCENTILES, percentiles)},
+        "histogram": {
+            "edges": [_number(edge) for edge in edges],
+            "counts": counts.tolist(),
+        },
+    }
+
+
+def score_matrix(
+    team_index: np.ndarray, judge_index: np.ndarray, scores: np.ndarray, shape: tuple
+) -> np.ndarray:
+    """teams x judges matrix of scores, NaN where a judge did not score a team"""
+    matrix = np.full(shape, np.nan)
+    matrix[team_index, judge_index] = scores
+    return matrix
+
+
+def judge_leniency(judges: np.ndarray, matrix: np.ndarray) -> List[dict]:
+    """Per-judge summary of total scores and leniency.
+
+    leniency is the judge's mean offset from the consensus (mean score) of
+    the teams they scored, so a judge who only saw strong teams is not
+    mistaken for a lenient one.
+    """
+    scored = ~np.isnan(matrix)
+    consensus = np.nanmean(matrix, axis=1, keepdims=True)
+    offsets = np.where(scored, matrix - consensus, np.nan)
+    counts = scored.sum(axis=0)
+    # Every judge in the matrix scored at least one team
+    means = np.nanmean(matrix, axis=0)
+    stds = np.nanstd(matrix, axis=0)
+    leniency = np.nanmean(offsets, axis=0)
+    return [
+        {
+            "judge_id": int(judge),
+            "score_count": int(count),
+            "mean": _number(mean),
+            "std": _number(std),
+            "leniency": _number(offset),
+        }
+        for judge, count, mean, std, offset in zip(judges, counts, means, stds, leniency)
+    ]
+
+
+def pairwise_correlations(judges: np.ndarray, matrix: np.ndarray) -> List[dict]:
+    """Pearson correlation of every pair of judges over the teams both scored.
+
+    All pairs are computed at once from masked matrix products instead of
+    one pass per pair.
+    """
+    present = (~np.isnan(matrix)).astype(np.float64)
+    # Centering each judge keeps the sums small, so that the one-pass
+    # variances below do not cancel out
+    values = np.nan_to_num(matrix - np.nanmean(matrix, axis=0))
+    common = present.T @ present
+    # sums[j, k]: sum of judge j's scores over the teams judge k also scored
+    sums = values.T @ present
+    squares = (values * values).T @ present
+    products = values.T @ values
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = products - sums * sums.T / common
+        variance = squares - sums * sums / common
+        # Equal scores over the common teams leave only rounding: no correlation
+        flat = variance <= 1e-9 * squares
+        correlation = np.where(
+            flat | flat.T, np.nan, covariance / np.sqrt(variance * variance.T)
+        )
+    first, second = np.triu_indices(len(judges), k=1)
+    return [
+        {
+            "judge_a": int(judges[a]),
+            "judge_b": int(judges[b]),
+            "common_teams": int(common[a, b]),
+            "correlation": _number(correlation[a, b]),
+        }
+        for a, b in zip(first, second)
+        if common[a, b] >= MIN_COMMON_TEAMS
+    ]
+
+
+def kendalls_w(matrix: np.ndarray) -> dict:
+    """Kendall's coefficient of concordance, corrected for ties.
+
+    W needs every judge to rank the same teams, so it is computed over the
+    teams scored by all judges of the round (None when there are fewer than
+    two; the pairwise correlations still cover partial assignments). 1 means
+    the judges ordered those teams identically, 0 means no agreement.
+    """
+    complete = matrix[~np.isnan(matrix).any(axis=1)]
+    teams, judges = complete.shape
+    if teams < 2 or judges < 2:
+        return {"w": None, "teams": int(teams), "judges": int(judges)}
+    # Average ranks per judge: values below plus half of the ties
+    below = (complete[None, :, :] < complete[:, None, :]).sum(axis=1)
+    equal = (complete[None, :, :] == complete[:, None, :]).sum(axis=1)
+    ranks = below + (equal + 1) / 2
+    totals = ranks.sum(axis=1)
+    spread = ((totals - totals.mean()) ** 2).sum()
+    # A tie group of size t adds t^3 - t; each of its members adds t^2 - 1
+    ties = (equal ** 2 - 1).sum()
+    denominator = judges ** 2 * (teams ** 3 - teams) - judges * ties
+    w = 12 * spread / denominator if denominator > 0 else np.nan
+    return {"w": _number(w), "teams": int(teams), "judges": int(judges)}
+
+
+def round_statistics(
+    team_ids: np.ndarray,
+    judge_ids: np.ndarray,
+    totals: np.ndarray,
+    criteria: Dict[str, np.ndarray],
+    bins: int,
+    upper: float,
+) -> dict:
+    """Distribution, per-criterion, per-judge and agreement statistics of a round"""
+    if len(totals) == 0:
+        return {
+            "score_count": 0,
+            "team_count": 0,
+            "judge_count": 0,
+            "total": distribution(totals, bins, upper),
+            "criteria": {name: describe(values) for name, values in criteria.items()},
+            "judges": [],
+            "agreement": {
+                "mean_correlation": None,
+                "pairwise": [],
+                "kendalls_w": {"w": None, "teams": 0, "judges": 0},
+            },
+        }
+    teams, team_index = np.unique(team_ids, return_inverse=True)
+    judges, judge_index = np.unique(judge_ids, return_inverse=True)
+    matrix = score_matrix(team_index, judge_index, totals, (len(teams), len(judges)))
+    correlations = pairwise_correlations(judges, matrix)
+    known = [pair["correlation"] for pair in correlations if pair["correlation"] is not None]
+    return {
+        "score_count": int(len(totals)),
+        "team_count": int(len(teams)),
+        "judge_count": int(len(judges)),
+        "total": distribution(totals, bins, upper),
+        "criteria": {name: describe(values) for name, values in criteria.items()},
+        "judges": judge_leniency(judges, matrix),
+        "agreement": {
+            "mean_correlation": _number(np.mean(known)) if known else None,
+            "pairwise": correlations,
+            "kendalls_w": kendalls_w(matrix),
+        },
+    }
@@ -0,0 +1,111 @@
+"""
+Benchmark POST /submissions under concurrent uploads.
+
+Compare two running servers, e.g. the sync build and the async build:
+
+    python benchmarks/bench_submissions.py \
+        --target sync=http://localhost:8001 \
+        --target async=http://localhost:8000 \
+        --concurrency 50 --requests 1000 --teams 1-200
+
+Each request uploads a report file for a team taken round-robin from --teams,
+so after the first pass requests exercise the update-with-files path as well.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import List, Tuple
+
+import httpx
+
+
+def parse_targets(values: List[str]) -> List[Tuple[str, str]]:
+    targets = []
+    for value in values:
+        name, _, url = value.partition("=")
+        if not url:
+            name, url = value, value
+        targets.append((name, url.rstrip("/")))
+    return targets
+
+
+def parse_teams(value: str) -> List[int]:
+    start, _, end = value.partition("-")
+    return list(range(int(start), int(end or start) + 1))
+
+
+async def run_target(
+    base_url: str,
+    api_prefix: str,
+    total_requests: int,
+    concurrency: int,
+    team_ids: List[int],
+    payload: bytes,
+) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total_requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for i in counter:
+                team_id = team_ids[i % len(team_ids)]
+                started = time.perf_counter()
+                response = await client.post(
+                    f"{api_prefix}/submissions",
+                    data={
+                        "team_id": str(team_id),
+                        "project_title": f"Benchmark {i}",
+                        "description": "benchmark upload",
+                        "technology": "FastAPI",
+                    },
+                    files={"report_file": ("report.pdf", payload, "application/pdf")},
+                )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="name=base_url, may be repeated")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--teams", default="1-50", help="team id range used round-robin, e.g. 1-200")
+    parser.add_argument("--file-size-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    payload = os.urandom(args.file_size_kb * 1024)
+    team_ids = parse_teams(args.teams)
+
+    print(f"{'target':<12}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, url in parse_targets(args.target):
+        result = await run_target(
+            url, args.api_prefix, args.requests, args.concurrency, team_ids, payload
+        )
+        print(
+            f"{name:<12}{result['requests']:>10}{result['errors']:>8}"
+            f"{result['rps']:>10.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
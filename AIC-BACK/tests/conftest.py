@@ -0,0 +1,106 @@
+import os
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Settings require a secret key; the unit tests do not care which
+os.environ.setdefault("SECRET_KEY", "test")
+
+# The app and the models are imported inside the database fixtures: the
+# app creates its tables on import, and the unit tests need no database.
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def count_queries():
+    """Call the returned function with a callable to get the number of SQL
+    statements it executed, on any engine"""
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def count(func) -> int:
+        statements.clear()
+        event.listen(Engine, "before_cursor_execute", listener)
+        try:
+            func()
+        finally:
+            event.remove(Engine, "before_cursor_execute", listener)
+        return len(statements)
+
+    return count
+
+
+@pytest.fixture(scope="module")
+def teams_and_judges():
+    """30 teams with members, a submission and a score by one of 30 judges.
+
+    The rows are newer than any existing ones, so they fill the default
+    (id desc) pages, and are deleted afterwards.
+    """
+    from app.core.database import SessionLocal
+    from app.models import Judges, Submissions, TeamMembers, TeamScores, Teams
+
+    tag = uuid.uuid4().hex[:8]
+    session = SessionLocal()
+    teams, judges = [], []
+    for i in range(30):
+        team = Teams(team_name=f"team-{tag}-{i}", username=f"team-{tag}-{i}", password_hash="x")
+        judge = Judges(
+            full_name=f"judge-{tag}-{i}",
+            email=f"judge-{tag}-{i}@example.com",
+            username=f"judge-{tag}-{i}",
+            password_hash="x",
+            role="judge",
+        )
+        session.add_all([team, judge])
+        session.flush()
+        session.add_all(
+            [
+                TeamMembers(
+                    team_id=team.id,
+                    full_name=f"member-{k}",
+                    student_batch="D23",
+                    class_code="01",
+                    student_code=f"{tag}-{i}-{k}",
+                    email=f"member-{tag}-{i}-{k}@example.com",
+                )
+                for k in range(3)
+            ]
+            + [
+                Submissions(team_id=team.id, project_title="project", status_submission="submitted"),
+                TeamScores(
+                    team_id=team.id,
+                    judge_id=judge.id,
+                    round=f"round-{tag}",
+                    creativity=10,
+                    feasibility=10,
+                    ai_effectiveness=10,
+                    presentation=10,
+                    social_impact=10,
+                    total_score=50,
+                ),
+            ]
+        )
+        teams.append(team.id)
+        judges.append(judge.id)
+    session.commit()
+    yield teams, judges
+
+    session.query(TeamScores).filter(TeamScores.judge_id.in_(judges)).delete(synchronize_session=False)
+    session.query(Submissions).filter(Submissions.team_id.in_(teams)).delete(synchronize_session=False)
+    session.query(TeamMembers).filter(TeamMembers.team_id.in_(teams)).delete(synchronize_session=False)
+    session.query(Teams).filter(Teams.id.in_(teams)).delete(synchronize_session=False)
+    session.query(Judges).filter(Judges.id.in_(judges)).delete(synchronize_session=False)
+    session.commit()
+    session.close()
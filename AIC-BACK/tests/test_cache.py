@@ -0,0 +1,166 @@
+import json
+
+import pytest
+
+from app.utils.cache import TaggedCache
+
+
+def _cache(max_tags=100, maxsize=100):
+    return TaggedCache("test", maxsize=maxsize, ttl=60, max_tags=max_tags)
+
+
+def _store(cache, key, value, *tags):
+    cache.set(key, value, cache.tag_versions(tags))
+
+
+def test_entry_is_a_hit_until_one_of_its_tags_is_bumped():
+    cache = _cache()
+    _store(cache, "k", 1, "teams", "round:r1")
+    cache.invalidate_tags("round:r2", "judges")
+    assert cache.get("k") == 1
+    cache.invalidate_tags("round:r1")
+    assert cache.get("k", None) is None
+    # The stale entry is dropped on that miss
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_stored_again_after_invalidation_is_a_hit():
+    cache = _cache()
+    _store(cache, "k", 1, "teams")
+    cache.invalidate_tags("teams")
+    _store(cache, "k", 2, "teams")
+    assert cache.get("k") == 2
+
+
+def test_untagged_entry_is_only_evicted_by_size():
+    cache = _cache(maxsize=2)
+    _store(cache, "a", 1)
+    cache.invalidate_tags("teams")
+    assert cache.get("a") == 1
+    _store(cache, "b", 2)
+    _store(cache, "c", 3)
+    assert cache.get("a", None) is None
+    assert (cache.get("b"), cache.get("c")) == (2, 3)
+
+
+def test_value_computed_during_an_invalidation_is_never_served():
+    cache = _cache()
+    versions = cache.tag_versions(["teams"])
+    # A write commits while the value is being computed
+    cache.invalidate_tags("teams")
+    cache.set("k", "stale", versions)
+    assert cache.get("k", None) is None
+
+
+def test_value_computed_during_invalidate_all_is_never_served():
+    cache = _cache()
+    versions = cache.tag_versions(["teams", "round:r1"])
+    cache.invalidate_all()
+    cache.set("k", "stale", versions)
+    assert cache.get("k", None) is None
+
+
+def test_invalidate_all_drops_every_entry():
+    cache = _cache()
+    _store(cache, "a", 1, "teams")
+    _store(cache, "b", 2)
+    cache.invalidate_all()
+    assert cache.get("a", None) is None and cache.get("b", None) is None
+    _store(cache, "a", 3, "teams")
+    assert cache.get("a") == 3
+
+
+def test_tracked_tags_are_bounded_by_max_tags():
+    cache = _cache(max_tags=4)
+    cache.invalidate_tags(*(f"team:{i}" for i in range(10)))
+    assert cache.stats()["tags"] <= 4
+    cache.invalidate_tags(*(f"round:{i}" for i in range(100)))
+    assert cache.stats()["tags"] <= 4
+
+
+def test_stale_entry_stays_stale_when_its_tag_is_forgotten():
+    cache = _cache(max_tags=4)
+    _store(cache, "k", "stale", "team:1")
+    cache.invalidate_tags("team:1")
+    # team:1 is the least recently bumped and gets forgotten
+    cache.invalidate_tags("team:2", "team:3", "team:4", "team:5")
+    assert "team:1" not in cache._tag_versions
+    assert cache.get("k", None) is None
+
+
+def test_fresh_entry_of_a_forgotten_tag_only_misses_once():
+    cache = _cache(max_tags=4)
+    cache.invalidate_tags("team:1")
+    _store(cache, "k", 1, "team:1")
+    _store(cache, "other", 1, "team:9")
+    cache.invalidate_tags("team:2", "team:3", "team:4", "team:5")
+    assert "team:1" not in cache._tag_versions
+    assert cache.get("k", None) is None
+    assert cache.get("other", None) is None
+    _store(cache, "k", 2, "team:1")
+    assert cache.get("k") == 2
+
+
+def test_entry_of_a_recently_bumped_tag_survives_pruning():
+    cache = _cache(max_tags=4)
+    cache.invalidate_tags("team:1", "team:2", "team:3")
+    cache.invalidate_tags("team:4")
+    _store(cache, "k", 1, "team:4")
+    cache.invalidate_tags("team:5")
+    assert "team:4" in cache._tag_versions
+    assert cache.get("k") == 1
+
+
+def test_value_computed_across_pruning_is_never_served():
+    cache = _cache(max_tags=4)
+    versions = cache.tag_versions(["team:1"])
+    cache.invalidate_tags("team:1", "team:2", "team:3", "team:4", "team:5")
+    assert "team:1" not in cache._tag_versions
+    cache.set("k", "stale", versions)
+    assert cache.get("k", None) is None
+
+
+def test_stats_count_hits_misses_and_tags():
+    cache = _cache()
+    _store(cache, "k", 1, "teams")
+    cache.get("k")
+    cache.get("missing", None)
+    cache.invalidate_tags("teams")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"], stats["tags"]) == (1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_tag_payloads_fit_in_a_notify():
+    from app.services.srv_base import _NOTIFY_PAYLOAD_SIZE, _tag_payloads
+
+    tags = {f"row:team_scores:{i}" for i in range(2000)} | {"teams", "round:r1"}
+    payloads = _tag_payloads(tags)
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) <= _NOTIFY_PAYLOAD_SIZE for payload in payloads)
+    assert set().union(*(json.loads(payload) for payload in payloads)) == tags
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    from app.services import srv_base
+
+    entity_cache, result_cache = _cache(), _cache()
+    monkeypatch.setattr(srv_base, "entity_cache", entity_cache)
+    monkeypatch.setattr(srv_base, "result_cache", result_cache)
+    return entity_cache, result_cache
+
+
+def test_notified_row_tags_only_invalidate_the_entity_cache(caches):
+    from app.services.srv_base import _invalidate_notified_tags, _row_tag
+
+    entity_cache, result_cache = caches
+    row = _row_tag("teams", 1)
+    _store(entity_cache, ("teams", 1), {"id": 1}, row)
+    _store(result_cache, "teams page", [], "teams")
+    _invalidate_notified_tags(json.dumps([row]))
+    assert entity_cache.get(("teams", 1), None) is None
+    assert result_cache.get("teams page") == []
+    _invalidate_notified_tags(json.dumps(["teams"]))
+    assert result_cache.get("teams page", None) is None
+    assert result_cache.stats()["tags"] == 1
@@ -0,0 +1,32 @@
+import pytest
+
+PAGE_SIZES = (1, 5, 30)
+
+
+@pytest.mark.parametrize(
+    "path, include",
+    [
+        ("/api/v1/teams", "members,submissions"),
+        ("/api/v1/judges", "team_scores"),
+    ],
+)
+def test_include_query_count_is_constant(client, count_queries, teams_and_judges, path, include):
+    """count + page + one query per included relationship, whatever the page size"""
+    counts = []
+    for page_size in PAGE_SIZES:
+        responses = []
+        counts.append(
+            count_queries(
+                lambda: responses.append(
+                    client.get(path, params={"page_size": page_size, "include": include})
+                )
+            )
+        )
+        response = responses[0]
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert len(data) == page_size
+        for relationship in include.split(","):
+            assert all(relationship in item for item in data)
+
+    assert counts == [2 + len(include.split(","))] * len(PAGE_SIZES)
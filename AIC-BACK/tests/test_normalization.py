@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from app.utils.normalization import (
+    minmax_by_judge,
+    rank_teams,
+    team_scores,
+    trimmed_means,
+    zscore_by_judge,
+)
+
+
+def _arrays(team_ids, judge_ids, scores):
+    return (
+        np.asarray(team_ids, dtype=np.int64),
+        np.asarray(judge_ids, dtype=np.int64),
+        np.asarray(scores, dtype=np.float64),
+    )
+
+
+# Judge 1 is strict and only scored teams 1 and 2, judge 2 is lenient and
+# only scored teams 2 and 3: raw means favour team 3, per-judge
+# normalization ranks the teams the way each judge ordered them.
+MATRIX = _arrays([1, 2, 2, 3], [1, 1, 2, 2], [60, 40, 90, 80])
+
+
+def _ranking(method, trim=0.1, limit=10, arrays=MATRIX):
+    return [(row["team_id"], row["average_score"]) for row in rank_teams(*arrays, method, limit, trim)]
+
+
+def test_raw_ranking_of_known_matrix():
+    assert _ranking("raw") == [(3, 80.0), (2, 65.0), (1, 60.0)]
+
+
+def test_zscore_ranking_of_known_matrix():
+    assert _ranking("zscore") == [(1, 1.0), (2, 0.0), (3, -1.0)]
+
+
+def test_minmax_ranking_of_known_matrix():
+    assert _ranking("minmax") == [(1, 1.0), (2, 0.5), (3, 0.0)]
+
+
+def test_judge_counts_and_limit():
+    rows = rank_teams(*MATRIX, "raw", 2)
+    assert [(row["rank"], row["team_id"], row["judge_count"]) for row in rows] == [(1, 3, 1), (2, 2, 2)]
+
+
+def test_ties_are_broken_by_team_id():
+    arrays = _arrays([7, 3, 5], [1, 1, 1], [50, 50, 50])
+    assert [team for team, _ in _ranking("raw", arrays=arrays)] == [3, 5, 7]
+
+
+def test_zscore_of_zero_variance_judge_is_zero():
+    scores = np.array([50.0, 50.0, 50.0, 10.0, 30.0])
+    judge_index = np.array([0, 0, 0, 1, 1])
+    assert zscore_by_judge(judge_index, scores, 2).tolist() == [0.0, 0.0, 0.0, -1.0, 1.0]
+
+
+@pytest.mark.parametrize("score", [0.1, 7.77, 23.7, 91.35, 1e6 + 0.1])
+@pytest.mark.parametrize("count", [3, 7, 10])
+def test_zscore_of_equal_inexact_scores_is_exactly_zero(score, count):
+    judge_index = np.zeros(count, dtype=np.int64)
+    assert zscore_by_judge(judge_index, np.full(count, score), 1).tolist() == [0.0] * count
+
+
+def test_zscore_of_close_large_scores():
+    scores = np.array([1e6, 1e6 + 1, 1e6 + 2])
+    z = zscore_by_judge(np.zeros(3, dtype=np.int64), scores, 1)
+    assert z.tolist() == pytest.approx([-1.224744871, 0.0, 1.224744871])
+
+
+def test_minmax_of_zero_variance_judge_is_half():
+    scores = np.array([50.0, 50.0, 10.0, 30.0])
+    judge_index = np.array([0, 0, 1, 1])
+    assert minmax_by_judge(judge_index, scores, 2).tolist() == [0.5, 0.5, 0.0, 1.0]
+
+
+@pytest.mark.parametrize("method, expected", [("zscore", 0.0), ("minmax", 0.5)])
+def test_judge_with_a_single_score(method, expected):
+    normalize = zscore_by_judge if method == "zscore" else minmax_by_judge
+    assert normalize(np.array([0]), np.array([42.0]), 1).tolist() == [expected]
+    assert _ranking(method, arrays=_arrays([4], [9], [42])) == [(4, expected)]
+
+
+def test_normalized_scores_stay_finite():
+    arrays = _arrays([1, 2, 3, 1], [1, 1, 1, 2], [70, 70, 70, 20])
+    for method in ("zscore", "minmax"):
+        _, values, _ = team_scores(*arrays, method)
+        assert np.isfinite(values).all()
+
+
+@pytest.mark.parametrize("trim, expected", [(0.0, 26.0), (0.1, 26.0), (0.2, 10.0), (0.4, 10.0)])
+def test_trimmed_mean_drops_extremes(trim, expected):
+    team_index = np.zeros(5, dtype=np.int64)
+    means, counts = trimmed_means(team_index, np.array([100.0, 10.0, 0.0, 10.0, 10.0]), 1, trim)
+    assert means.tolist() == [expected]
+    assert counts.tolist() == [5]
+
+
+@pytest.mark.parametrize("count", range(1, 8))
+def test_trim_near_half_keeps_at_least_one_score(count):
+    # The API accepts trim < 0.5, which never cuts a whole team away
+    team_index = np.zeros(count, dtype=np.int64)
+    scores = np.arange(count, dtype=np.float64)
+    means, _ = trimmed_means(team_index, scores, 1, 0.49)
+    assert np.isfinite(means).all()
+    assert means[0] == pytest.approx(np.median(scores))
+
+
+def test_trimmed_ranking_per_team():
+    arrays = _arrays([1, 1, 1, 1, 1, 2, 2], [1, 2, 3, 4, 5, 1, 2], [0, 10, 10, 10, 100, 30, 20])
+    assert _ranking("trimmed", trim=0.2, arrays=arrays) == [(2, 25.0), (1, 10.0)]
+
+
+@pytest.mark.parametrize("method", ["raw", "zscore", "minmax", "trimmed"])
+def test_empty_round(method):
+    assert rank_teams(*_arrays([], [], []), method, 10) == []
+
+
+@pytest.mark.parametrize("columns", [(None, None, None), ([], [], [])])
+def test_normalized_rankings_of_empty_round(columns):
+    from app.services.srv_team_scores import _normalized_rankings
+
+    assert _normalized_rankings(columns, "zscore", 10, 0.1) == []
+
+
+def test_normalized_rankings_of_aggregated_columns():
+    from app.services.srv_team_scores import _normalized_rankings
+
+    # array_agg columns as they come back from Postgres
+    columns = ([1, 2, 2, 3], [1, 1, 2, 2], [60.0, 40.0, 90.0, 80.0])
+    rows = _normalized_rankings(columns, "minmax", 10, 0.1)
+    assert rows == [
+        {"rank": 1, "team_id": 1, "average_score": 1.0, "judge_count": 1},
+        {"rank": 2, "team_id": 2, "average_score": 0.5, "judge_count": 2},
+        {"rank": 3, "team_id": 3, "average_score": 0.0, "judge_count": 1},
+    ]
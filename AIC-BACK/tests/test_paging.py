@@ -0,0 +1,115 @@
+import base64
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.utils.exception_handler import CustomException
+from app.utils.paging import _seek_filter, decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("value", [12, 3.5, "name", None, Decimal("12.50")])
+def test_cursor_round_trip(value):
+    cursor = encode_cursor("total_score", "desc", value, 42)
+    payload = decode_cursor(cursor, "total_score", "desc")
+    assert payload["id"] == 42
+    assert payload["v"] == (str(value) if isinstance(value, Decimal) else value)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        "",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        _raw_cursor([1, 2]),
+        _raw_cursor({"s": "total_score", "o": "desc", "v": 1}),
+        _raw_cursor({"s": "total_score", "o": "desc", "v": 1, "id": "x"}),
+    ],
+)
+def test_garbage_cursor_is_a_bad_request(cursor):
+    with pytest.raises(CustomException) as error:
+        decode_cursor(cursor, "total_score", "desc")
+    assert error.value.http_code == 400
+
+
+@pytest.mark.parametrize("sort_by, order", [("created_at", "desc"), ("total_score", "asc")])
+def test_cursor_of_another_sort_is_rejected(sort_by, order):
+    cursor = encode_cursor("total_score", "desc", 1, 1)
+    with pytest.raises(CustomException) as error:
+        decode_cursor(cursor, sort_by, order)
+    assert error.value.http_code == 400
+
+
+@pytest.mark.parametrize("value", ["abc", {"a": 1}, [1]])
+def test_tampered_cursor_value_is_a_bad_request(value):
+    from app.models import TeamScores
+
+    cursor = decode_cursor(_raw_cursor({"s": "total_score", "o": "desc", "v": value, "id": 1}), "total_score", "desc")
+    with pytest.raises(CustomException) as error:
+        _seek_filter(TeamScores, "total_score", "desc", cursor)
+    assert error.value.http_code == 400
+
+
+def test_cursor_value_is_coerced_to_the_column_type():
+    from app.models import TeamScores
+
+    cursor = decode_cursor(encode_cursor("total_score", "asc", Decimal("12.50"), 7), "total_score", "asc")
+    clause = _seek_filter(TeamScores, "total_score", "asc", cursor)
+    sql = str(clause.compile(compile_kwargs={"literal_binds": True}))
+    assert "team_scores.total_score > 12.50" in sql
+    assert "team_scores.id > 7" in sql
+
+
+@pytest.fixture(scope="module")
+def teams_with_slogans():
+    """Teams whose slogans tie and are NULL, deleted afterwards"""
+    from app.core.database import SessionLocal
+    from app.models import Teams
+
+    tag = uuid.uuid4().hex[:8]
+    session = SessionLocal()
+    slogans = [None, "a", "a", "b", None, "a", "c", "b", None, "a", "a"]
+    teams = [
+        Teams(team_name=f"team-{tag}-{i}", username=f"team-{tag}-{i}", password_hash="x", slogan=slogan)
+        for i, slogan in enumerate(slogans)
+    ]
+    session.add_all(teams)
+    session.commit()
+    yield [team.id for team in teams]
+
+    session.query(Teams).filter(Teams.id.in_([team.id for team in teams])).delete(synchronize_session=False)
+    session.commit()
+    session.close()
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_cover_ties_and_nulls_once(client, teams_with_slogans, order):
+    from app.core.database import SessionLocal
+    from app.models import Teams
+
+    session = SessionLocal()
+    expected = {id for (id,) in session.query(Teams.id).all()}
+    session.close()
+
+    params = {"sort_by": "slogan", "order": order, "page_size": 3, "total_mode": "none"}
+    seen = []
+    while True:
+        body = client.get("/api/v1/teams", params=params).json()
+        seen += [team["id"] for team in body["data"]]
+        if not body["metadata"]["has_next"]:
+            break
+        params["cursor"] = body["metadata"]["next_cursor"]
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
+
+
+def test_garbage_cursor_is_a_400_response(client):
+    response = client.get("/api/v1/teams", params={"cursor": "garbage", "sort_by": "slogan"})
+    assert response.status_code == 400
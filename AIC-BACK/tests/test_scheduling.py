@@ -0,0 +1,229 @@
+import uuid
+
+import pytest
+
+from app.utils.scheduling import free_intervals, overlapping_pairs, place_slots, timeline
+
+HOUR = 3600
+
+
+def test_free_intervals_of_an_idle_window():
+    assert free_intervals([], 0, 10) == [(0, 10)]
+
+
+def test_free_intervals_between_busy_ones():
+    assert free_intervals([(6, 8), (2, 3)], 0, 10) == [(0, 2), (3, 6), (8, 10)]
+
+
+def test_touching_and_overlapping_busy_intervals_leave_no_empty_gap():
+    assert free_intervals([(2, 4), (4, 6), (5, 7)], 0, 10) == [(0, 2), (7, 10)]
+
+
+def test_busy_intervals_are_clipped_to_the_window():
+    assert free_intervals([(-5, 2), (9, 20), (30, 40), (-9, -1)], 0, 10) == [(2, 9)]
+
+
+def test_busy_intervals_touching_the_window_edges():
+    # [start, end) is half-open: busy time ending at start or starting at
+    # end does not cut the window
+    assert free_intervals([(-5, 0), (10, 15)], 0, 10) == [(0, 10)]
+    assert free_intervals([(0, 3), (7, 10)], 0, 10) == [(3, 7)]
+
+
+def test_fully_busy_window():
+    assert free_intervals([(0, 4), (3, 10)], 0, 10) == []
+
+
+def test_slots_fill_a_location_back_to_back():
+    assert place_slots({"A": [(0, 4 * HOUR)]}, 3, HOUR) == [("A", 0), ("A", HOUR), ("A", 2 * HOUR)]
+
+
+def test_slots_take_the_earliest_start_across_locations():
+    free = {"A": [(0, 2 * HOUR)], "B": [(0, 2 * HOUR)]}
+    # Ties go to the location listed first
+    assert place_slots(free, 4, HOUR) == [("A", 0), ("B", 0), ("A", HOUR), ("B", HOUR)]
+
+
+def test_slots_skip_intervals_that_are_too_short():
+    free = {"A": [(0, HOUR // 2), (HOUR, 3 * HOUR)], "B": [(5 * HOUR, 6 * HOUR)]}
+    assert place_slots(free, 3, HOUR) == [("A", HOUR), ("A", 2 * HOUR), ("B", 5 * HOUR)]
+
+
+def test_gap_between_slots():
+    free = {"A": [(0, 4 * HOUR)]}
+    assert place_slots(free, 5, HOUR, gap=HOUR // 2) == [("A", 0), ("A", 1.5 * HOUR), ("A", 3 * HOUR)]
+
+
+def test_gap_is_not_needed_after_the_last_slot_of_the_window():
+    # The second slot ends exactly at the end of the window
+    free = {"A": [(0, 2.5 * HOUR)]}
+    assert place_slots(free, 5, HOUR, gap=HOUR // 2) == [("A", 0), ("A", 1.5 * HOUR)]
+
+
+def test_gap_counts_from_the_previous_slot_across_a_break():
+    # A break shorter than the gap does not let the next slot start earlier
+    free = {"A": free_intervals([(HOUR, 1.25 * HOUR)], 0, 4 * HOUR)}
+    assert free["A"] == [(0, HOUR), (1.25 * HOUR, 4 * HOUR)]
+    assert place_slots(free, 5, HOUR, gap=HOUR // 2) == [("A", 0), ("A", 1.5 * HOUR), ("A", 3 * HOUR)]
+
+
+def test_breaks_and_round_events_block_every_location():
+    everywhere = [(2 * HOUR, 3 * HOUR)]
+    busy = {"A": [(0, HOUR)], "B": []}
+    free = {location: free_intervals(intervals + everywhere, 0, 4 * HOUR) for location, intervals in busy.items()}
+    assert free == {"A": [(HOUR, 2 * HOUR), (3 * HOUR, 4 * HOUR)], "B": [(0, 2 * HOUR), (3 * HOUR, 4 * HOUR)]}
+    assert place_slots(free, 10, HOUR) == [
+        ("B", 0),
+        ("A", HOUR),
+        ("B", HOUR),
+        ("A", 3 * HOUR),
+        ("B", 3 * HOUR),
+    ]
+
+
+def test_only_the_slots_that_fit_are_returned():
+    free = {"A": [(0, 2 * HOUR)], "B": [(0, HOUR // 2)]}
+    assert place_slots(free, 5, HOUR) == [("A", 0), ("A", HOUR)]
+    assert place_slots({}, 5, HOUR) == []
+    assert place_slots({"A": []}, 5, HOUR) == []
+
+
+
+def test_adjacent_intervals_do_not_overlap():
+    # Half-open: a schedule may start the second the previous one ends
+    intervals = [("A", 1, 0, 10), ("A", 2, 10, 20), ("A", 3, 20, 30)]
+    assert overlapping_pairs(intervals) == []
+
+
+def test_overlapping_intervals_are_paired_earlier_first():
+    intervals = [("A", "late", 5, 15), ("A", "early", 0, 10)]
+    assert overlapping_pairs(intervals) == [("early", "late")]
+
+
+def test_nested_and_chained_overlaps():
+    intervals = [("A", 1, 0, 100), ("A", 2, 10, 20), ("A", 3, 15, 30), ("A", 4, 40, 50), ("A", 5, 100, 110)]
+    assert sorted(overlapping_pairs(intervals)) == [(1, 2), (1, 3), (1, 4), (2, 3)]
+
+
+def test_same_start_overlaps():
+    assert overlapping_pairs([("A", 1, 0, 10), ("A", 2, 0, 5)]) == [(1, 2)]
+
+
+def test_only_intervals_of_the_same_group_conflict():
+    intervals = [("A", 1, 0, 10), ("B", 2, 0, 10), ("A", 3, 5, 15), ("C", 4, 5, 15)]
+    assert overlapping_pairs(intervals) == [(1, 3)]
+
+
+def test_group_change_resets_the_open_intervals():
+    # B's interval starts before A's has ended but is in another group
+    intervals = [("A", 1, 0, 100), ("B", 2, 50, 60), ("B", 3, 55, 70)]
+    assert overlapping_pairs(intervals) == [(2, 3)]
+
+
+def test_batch_rows_against_each_other_and_existing_schedules():
+    # Keys as import_schedules builds them
+    intervals = [
+        ("A", ("row", 0), 0, 60),
+        ("A", ("row", 1), 30, 90),
+        ("A", ("row", 2), 90, 120),
+        ("B", ("row", 3), 0, 60),
+        ("A", ("schedule", 7), 100, 200),
+        ("B", ("schedule", 8), 60, 120),
+    ]
+    assert sorted(overlapping_pairs(intervals)) == [
+        (("row", 0), ("row", 1)),
+        (("row", 2), ("schedule", 7)),
+    ]
+
+
+def test_no_intervals():
+    assert overlapping_pairs([]) == []
+
+
+def test_import_reports_batch_and_existing_conflicts(client):
+    tag = uuid.uuid4().hex[:8]
+    location, start = f"room-{tag}", 2e9
+
+    def row(offset, duration=HOUR):
+        return {"round": f"round-{tag}", "date_time": start + offset, "duration": duration, "location": location}
+
+    existing = client.post("/api/v1/schedules", json=row(0)).json()["data"]["id"]
+    try:
+        response = client.post(
+            "/api/v1/schedules/import",
+            json={"schedules": [row(HOUR // 2), row(2 * HOUR), row(2.5 * HOUR), row(-HOUR)]},
+        )
+        assert response.status_code == 200
+        assert [(result["index"], result["message"]) for result in response.json()["data"]] == [
+            (0, f"Conflicts with schedule {existing} at {location}"),
+            (1, f"Conflicts with row 2 at {location}"),
+            (2, f"Conflicts with row 1 at {location}"),
+        ]
+        listed = client.get(f"/api/v1/schedules/round/round-{tag}").json()["data"]
+        assert [schedule["id"] for schedule in listed] == [existing]
+    finally:
+        client.delete(f"/api/v1/schedules/{existing}")
+
+
+def test_timeline_of_an_idle_window():
+    assert timeline([], 0, 100) == {
+        "busy": [],
+        "free": [{"start": 0, "end": 100}],
+        "busy_seconds": 0,
+        "utilization": 0.0,
+    }
+
+
+def test_timeline_merges_and_clips_busy_intervals():
+    busy = [(90, 120), (10, 20), (15, 30), (30, 40), (-50, 5), (200, 300)]
+    assert timeline(busy, 0, 100) == {
+        "busy": [{"start": 0, "end": 5}, {"start": 10, "end": 40}, {"start": 90, "end": 100}],
+        "free": [{"start": 5, "end": 10}, {"start": 40, "end": 90}],
+        "busy_seconds": 45,
+        "utilization": 45.0,
+    }
+
+
+def test_timeline_ignores_intervals_touching_the_window():
+    result = timeline([(-10, 0), (100, 110)], 0, 100)
+    assert (result["busy"], result["busy_seconds"]) == ([], 0)
+
+
+def test_timeline_of_a_fully_booked_window():
+    result = timeline([(0, 60), (30, 100)], 0, 100)
+    assert result["busy"] == [{"start": 0, "end": 100}]
+    assert result["free"] == []
+    assert result["utilization"] == 100.0
+
+
+def test_timeline_utilization_is_rounded():
+    assert timeline([(0, 1)], 0, 3)["utilization"] == 33.33
+
+
+def test_timeline_accepts_a_generator():
+    # get_timeline streams each location's rows straight from the query
+    busy = ((start, start + 10) for start in (0, 20))
+    assert timeline(busy, 0, 40)["busy_seconds"] == 20
+
+
+@pytest.mark.parametrize("start, end", [(100, 100), (100, 50)])
+def test_empty_timeline_window_is_rejected(client, start, end):
+    # timeline() divides by the window length
+    response = client.get("/api/v1/schedules/timeline", params={"from": start, "to": end})
+    assert response.status_code == 400
+
+def test_generate_reports_how_many_teams_fit(client, teams_and_judges):
+    teams, _ = teams_and_judges
+    tag = uuid.uuid4().hex[:8]
+    response = client.post(
+        f"/api/v1/schedules/generate/round-{tag}",
+        json={
+            "locations": [f"hall-{tag}"],
+            "start": 2e9,
+            "end": 2e9 + 2 * HOUR,
+            "slot_duration": HOUR,
+            "team_ids": teams[:3],
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["message"] == "Only 2 of 3 teams fit in the free time of these locations"
@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from app.utils.score_stats import (
+    distribution,
+    judge_leniency,
+    kendalls_w,
+    pairwise_correlations,
+    round_statistics,
+)
+
+
+def _round(team_ids, judge_ids, totals, bins=4, upper=100):
+    totals = np.asarray(totals, dtype=np.float64)
+    return round_statistics(
+        np.asarray(team_ids, dtype=np.int64),
+        np.asarray(judge_ids, dtype=np.int64),
+        totals,
+        {"creativity": totals / 4},
+        bins,
+        upper,
+    )
+
+
+def test_histogram_bins_include_both_ends_of_the_range():
+    result = distribution(np.array([0.0, 24.9, 25.0, 99.0, 100.0]), 4, 100)
+    assert result["histogram"] == {"edges": [0.0, 25.0, 50.0, 75.0, 100.0], "counts": [2, 1, 0, 2]}
+    assert result["count"] == 5
+
+
+def test_scores_above_the_range_are_counted_but_not_binned():
+    result = distribution(np.array([50.0, 120.0]), 2, 100)
+    assert result["histogram"]["counts"] == [0, 1]
+    assert (result["count"], result["max"]) == (2, 120.0)
+
+
+def test_percentiles_and_summary():
+    result = distribution(np.array([10.0, 20.0, 30.0, 40.0, 50.0]), 5, 100)
+    assert result["percentiles"] == {"p10": 14.0, "p25": 20.0, "p50": 30.0, "p75": 40.0, "p90": 46.0}
+    assert (result["mean"], result["std"], result["min"], result["max"]) == (30.0, 14.1421, 10.0, 50.0)
+
+
+def test_empty_round():
+    result = _round([], [], [])
+    assert result["score_count"] == result["team_count"] == result["judge_count"] == 0
+    assert result["total"]["histogram"]["counts"] == [0, 0, 0, 0]
+    assert result["total"]["mean"] is None
+    assert set(result["total"]["percentiles"].values()) == {None}
+    assert result["criteria"]["creativity"]["count"] == 0
+    assert result["judges"] == []
+    assert result["agreement"] == {
+        "mean_correlation": None,
+        "pairwise": [],
+        "kendalls_w": {"w": None, "teams": 0, "judges": 0},
+    }
+
+
+@pytest.mark.parametrize("columns", [(None,) * 8, ([],) * 8])
+def test_round_statistics_of_empty_aggregated_columns(columns):
+    from app.services.srv_team_scores import _round_statistics
+
+    result = _round_statistics(columns, 10)
+    assert result["score_count"] == 0
+    assert len(result["criteria"]) == 5
+
+
+def test_single_judge():
+    result = _round([1, 2, 3], [7, 7, 7], [60, 70, 80])
+    assert (result["team_count"], result["judge_count"]) == (3, 1)
+    assert result["judges"] == [
+        {"judge_id": 7, "score_count": 3, "mean": 70.0, "std": 8.165, "leniency": 0.0}
+    ]
+    assert result["agreement"] == {
+        "mean_correlation": None,
+        "pairwise": [],
+        "kendalls_w": {"w": None, "teams": 3, "judges": 1},
+    }
+
+
+def test_leniency_is_the_offset_from_the_consensus():
+    matrix = np.array([[60.0, 70.0], [80.0, 90.0], [np.nan, 50.0]])
+    rows = judge_leniency(np.array([1, 2]), matrix)
+    assert [(row["judge_id"], row["score_count"], row["mean"], row["leniency"]) for row in rows] == [
+        (1, 2, 70.0, -5.0),
+        (2, 3, 70.0, 3.3333),
+    ]
+
+
+def test_correlations_of_agreeing_and_opposed_judges():
+    matrix = np.array([[1.0, 10.0, 3.0], [2.0, 20.0, 2.0], [3.0, 30.0, 1.0]])
+    pairs = pairwise_correlations(np.array([4, 5, 6]), matrix)
+    assert [(pair["judge_a"], pair["judge_b"], pair["correlation"]) for pair in pairs] == [
+        (4, 5, 1.0),
+        (4, 6, -1.0),
+        (5, 6, -1.0),
+    ]
+
+
+def test_correlations_need_enough_common_teams():
+    matrix = np.array([[1.0, 2.0], [2.0, 1.0], [3.0, np.nan], [4.0, np.nan]])
+    assert pairwise_correlations(np.array([1, 2]), matrix) == []
+
+
+@pytest.mark.parametrize("score", [70.0, 0.1, 7.77, 23.7])
+def test_correlation_with_a_constant_judge_is_undefined(score):
+    # Division by a zero variance, which rounding must not turn into a number
+    matrix = np.column_stack([np.full(8, score), np.arange(8.0)])
+    pairs = pairwise_correlations(np.array([1, 2]), matrix)
+    assert pairs == [{"judge_a": 1, "judge_b": 2, "common_teams": 8, "correlation": None}]
+
+
+def test_judge_constant_over_the_common_teams_only():
+    matrix = np.array([[50.0, 1.0], [50.0, 2.0], [50.0, 3.0], [90.0, np.nan], [10.0, np.nan]])
+    assert pairwise_correlations(np.array([1, 2]), matrix)[0]["correlation"] is None
+
+
+def test_correlation_of_close_scores():
+    matrix = np.array([[60.3, 60.1], [60.1, 60.2], [60.2, 60.4]])
+    assert pairwise_correlations(np.array([1, 2]), matrix)[0]["correlation"] == -0.3273
+
+
+def test_kendalls_w_of_identical_rankings_is_one():
+    matrix = np.array([[1.0, 10.0, 5.0], [2.0, 20.0, 6.0], [3.0, 30.0, 7.0], [4.0, 40.0, 8.0]])
+    assert kendalls_w(matrix) == {"w": 1.0, "teams": 4, "judges": 3}
+
+
+def test_kendalls_w_of_reversed_rankings_is_zero():
+    matrix = np.array([[1.0, 3.0], [2.0, 2.0], [3.0, 1.0]])
+    assert kendalls_w(matrix)["w"] == 0.0
+
+
+def test_kendalls_w_only_uses_teams_every_judge_scored():
+    matrix = np.array([[1.0, 1.0], [2.0, 2.0], [3.0, np.nan]])
+    assert kendalls_w(matrix) == {"w": 1.0, "teams": 2, "judges": 2}
+
+
+def test_kendalls_w_of_constant_scores_is_undefined():
+    assert kendalls_w(np.full((4, 3), 70.0)) == {"w": None, "teams": 4, "judges": 3}
+
+
+def test_kendalls_w_with_ties():
+    # Judge 2 ties the first two teams: W below 1 but well defined
+    matrix = np.array([[1.0, 5.0], [2.0, 5.0], [3.0, 9.0]])
+    assert kendalls_w(matrix)["w"] == 0.9286
+
+
+def test_constant_round_agreement():
+    result = _round([1, 2, 3, 1, 2, 3], [1, 1, 1, 2, 2, 2], [70] * 6)
+    assert result["agreement"] == {
+        "mean_correlation": None,
+        "pairwise": [{"judge_a": 1, "judge_b": 2, "common_teams": 3, "correlation": None}],
+        "kendalls_w": {"w": None, "teams": 3, "judges": 2},
+    }
+    assert [judge["leniency"] for judge in result["judges"]] == [0.0, 0.0]
+
+
+def test_round_of_known_matrix():
+    result = _round([1, 2, 3, 1, 2, 3], [1, 1, 1, 2, 2, 2], [60, 70, 80, 70, 80, 90])
+    assert (result["score_count"], result["team_count"], result["judge_count"]) == (6, 3, 2)
+    assert result["total"]["histogram"]["counts"] == [0, 0, 3, 3]
+    assert [judge["leniency"] for judge in result["judges"]] == [-5.0, 5.0]
+    assert result["agreement"]["mean_correlation"] == 1.0
+    assert result["agreement"]["kendalls_w"]["w"] == 1.0